@@ -1,3 +1,4 @@
+import os
 import sys
 
 # ایمپورت ماژول‌های پروژه
@@ -12,6 +13,32 @@ from model.pad_model import PadModel
 from presenter.pad_presenter import PadPresenter
 from model.column_model import ColumnModel
 from presenter.column_presenter import ColumnPresenter
+from model.shadow_pins import PIN_STATS
+from model.hw_process import HardwareProcess
+from model.watchdog import SafetyWatchdog
+from model.estop_model import EStopModel
+from presenter.estop_presenter import EStopPresenter
+from presenter.timer_presenter import TimerPresenter
+from model.contact_model import ContactModel
+from model.tachometer import Tachometer
+from model.speed_controller import SpeedController
+from model.encoder import QuadratureEncoder
+from model.column_positioner import ColumnPositioner
+from model.step_generator import StepGenerator
+from presenter.contact_presenter import ContactPresenter
+from model.recipe import RecipeRunner
+from presenter.recipe_presenter import RecipePresenter
+from model.settings_store import SettingsStore
+from presenter.settings_presenter import SettingsPresenter
+from model.camera import CameraProcess
+from model.inspection import InspectionService
+from model.autofocus import AutoFocus
+from model.image_archive import ImageArchive
+from presenter.gallery_presenter import GalleryPresenter
+from presenter.camera_presenter import CameraPresenter
+from model.remote_api import RemoteAPI
+from presenter.remote_presenter import RemotePresenter
+from utils.perf import PERF
 
 # --- تنظیمات سخت‌افزار ---
 PIN_LIGHT_GPIO = 18 #light
@@ -26,47 +53,238 @@ PIN_PAD_CCW = 6
 PIN_COL_PWM = 19
 PIN_COL_DIR = 5
 
+#column quadrature encoder (move-by-um with the Step panel value)
+COLUMN_ENCODER = False
+PIN_ENC_A = 23
+PIN_ENC_B = 24
+ENCODER_COUNTS_PER_UM = 2.0    # شمارش در هر میکرون (دکد x4)
+
+#column stepper driver (PIN_COL_PWM = STEP, PIN_COL_DIR = DIR); فقط در حالت درون‌پروسه‌ای
+COLUMN_STEPPER = False
+STEPPER_STEPS_PER_UM = 1.0
+STEPPER_MAX_RATE = 4000     # step/s
+STEPPER_ACCEL = 20000       # step/s²
+
+#e-stop input (NC mushroom button to GND, internal pull-up; open circuit = stop)
+PIN_ESTOP = 16
+
+#fiber contact sensor (active low)
+PIN_CONTACT = 20
+CONTACT_MAKE_MS = 20        # پنجره دیبانس برقراری تماس
+CONTACT_BREAK_MS = 50       # پنجره دیبانس قطع تماس
+CONTACT_STARTS_TIMER = False    # شروع تایمر معکوس با برقراری تماس
+CONTACT_REQUIRED_FOR_PAD = False  # پد فقط در حالت تماس بچرخد
+
+#pad tachometer / hall sensor
+PIN_TACH = 21
+TACH_PULSES_PER_REV = 2
+# کنترل حلقه بسته دور پد (عدد پنل سرعت = rpm هدف)؛ فقط در حالت درون‌پروسه‌ای
+PAD_CLOSED_LOOP = False
+PAD_PI_RATE_HZ = 50
+PAD_MAX_RPM = 3000          # دور تقریبی در duty=100% (پیش‌خور)
+
+# اجرای کنترل موتورها و نور در پروسه جداگانه (حافظه مشترک)
+# تا مکث‌های UI فرمان‌های توقف/حرکت را عقب نیندازند
+USE_HW_PROCESS = False
+HW_UI_TIMEOUT_S = 2.0       # بدون ضربان UI، پروسه سخت‌افزار بعد از این مدت همه خروجی‌ها را خاموش می‌کند
+
+# Watchdog: توقف ایمن در صورت گیر کردن UI
+WATCHDOG_TIMEOUT_S = 1.0    # حداکثر فاصله مجاز بین ضربان‌های UI
+COLUMN_MAX_HOLD_S = 8.0     # حداکثر زمان حرکت نگه‌داشتنی ستون
+
+# دوربین سطح فیبر: 'synthetic'، مسیر پوشه/فایل تصویر، یا None برای غیرفعال
+# ضبط در پروسه جداگانه و انتقال فریم‌ها از طریق حلقه حافظه مشترک
+CAMERA_SOURCE = "synthetic"
+CAMERA_SIZE = (640, 480)
+CAMERA_FPS = 30
+# بازرسی سطح فیبر (NumPy) در استخر پروسه؛ 0 یعنی غیرفعال
+INSPECTION_WORKERS = 1
+# فوکوس خودکار با حرکت زمان‌دار ستون (موتور سرعت ثابت)؛ با درایور استپر غیرفعال است
+AUTOFOCUS = True
+COLUMN_SPEED_UM_S = 200.0   # سرعت ستون (کالیبراسیون)
+# بایگانی تصاویر سطح فیبر (پیوند به اجرای دستور)؛ None یعنی غیرفعال
+ARCHIVE_PATH = os.path.expanduser("~/.polisher_v2/archive")
+ARCHIVE_FORMAT = "PNG"      # یا "WEBP" (کوچک‌تر، کدگذاری کندتر)
+
+# API محلی HTTP + WebSocket برای پایش و فرمان بدون صفحه نمایش؛ API_PORT=None یعنی غیرفعال
+# API فرمان موتورها را می‌دهد: بدون token فقط روی localhost؛ با token (متغیر محیطی
+# POLISHER_API_TOKEN) روی همه کارت‌های شبکه تا PC کنار خط هم دسترسی داشته باشد
+API_TOKEN = os.environ.get("POLISHER_API_TOKEN") or None
+API_HOST = "0.0.0.0" if API_TOKEN else "127.0.0.1"
+API_PORT = 8765
+API_RATE_HZ = 5.0           # حداکثر نرخ تله‌متری، مستقل از تعداد کلاینت‌ها
+
+# فایل تنظیمات و دستورها (نوشتن اتمیک در پس‌زمینه)
+SETTINGS_PATH = os.path.expanduser("~/.polisher_v2/settings.json")
+
+# مسیر خروجی گزارش کارایی (تأخیر حلقه و زمان هندلرها)؛ None یعنی غیرفعال
+PERF_EXPORT_PATH = None
+
 def main():
     print("Starting Fiber Polisher System V2...")
 
     # 1. ساخت رابط کاربری (View)
     # پنجره ساخته می‌شود اما تا زمان اجرای mainloop نمایش داده نمی‌شود
     app = PolisherView()
+
+    # تنظیمات فقط یک بار خوانده می‌شوند؛ خواندن‌های بعدی از حافظه است
+    settings_store = SettingsStore(SETTINGS_PATH)
+    PERF.sources["settings_store"] = settings_store.stats
     
     # 2. راه‌اندازی سخت‌افزار (Model)
     light_model = None
     lissa_model = None
     pad_model = None
     col_model = None
+    hw_proc = None
+    estop_model = None
+    contact_model = None
+    tach = None
+    encoder = None
+    positioner = None
+    speed_ctrl = None
+    camera = None
+    inspector = None
+    autofocus = None
+    archive = None
 
     try:
-        light_model = LightModel(pin_number=PIN_LIGHT_GPIO)
-        lissa_model = LissaModel(pin_number=PIN_LISSA_GPIO)
-        pad_model = PadModel(pwm_pin = PIN_PAD_PWM, cw_pin = PIN_PAD_CW, ccw_pin = PIN_PAD_CCW)
-        col_model = ColumnModel(en_pin=PIN_COL_PWM, dir_pin=PIN_COL_DIR)
+        if USE_HW_PROCESS:
+            hw_proc = HardwareProcess({
+                "light": PIN_LIGHT_GPIO, "lissa": PIN_LISSA_GPIO,
+                "pad_pwm": PIN_PAD_PWM, "pad_cw": PIN_PAD_CW, "pad_ccw": PIN_PAD_CCW,
+                "col_en": PIN_COL_PWM, "col_dir": PIN_COL_DIR,
+            }, ui_timeout_s=HW_UI_TIMEOUT_S)
+            # پراکسی‌ها همان API مدل‌ها را دارند
+            light_model, lissa_model = hw_proc.light, hw_proc.lissa
+            pad_model, col_model = hw_proc.pad, hw_proc.column
+        else:
+            light_model = LightModel(pin_number=PIN_LIGHT_GPIO)
+            lissa_model = LissaModel(pin_number=PIN_LISSA_GPIO)
+            pad_model = PadModel(pwm_pin = PIN_PAD_PWM, cw_pin = PIN_PAD_CW, ccw_pin = PIN_PAD_CCW)
+            col_model = ColumnModel(en_pin=PIN_COL_PWM, dir_pin=PIN_COL_DIR)
+
+        # توقف اضطراری مستقل از صف رویداد Tk (ترد callback خود gpiozero)
+        estop_model = EStopModel(PIN_ESTOP, pad=pad_model, column=col_model, lissa=lissa_model, light=light_model)
+        if COLUMN_STEPPER and not USE_HW_PROCESS:
+            positioner = StepGenerator(col_model, steps_per_um=STEPPER_STEPS_PER_UM,
+                                       max_rate=STEPPER_MAX_RATE, accel=STEPPER_ACCEL)
+        elif COLUMN_ENCODER:
+            encoder = QuadratureEncoder(PIN_ENC_A, PIN_ENC_B, counts_per_um=ENCODER_COUNTS_PER_UM)
+            positioner = ColumnPositioner(col_model, encoder, timeout_s=COLUMN_MAX_HOLD_S * 0.75)
+        if PAD_CLOSED_LOOP and not USE_HW_PROCESS:
+            tach = Tachometer(PIN_TACH, pulses_per_rev=TACH_PULSES_PER_REV)
+            speed_ctrl = SpeedController(pad_model, tach, rate_hz=PAD_PI_RATE_HZ, max_rpm=PAD_MAX_RPM)
+            speed_ctrl.start()
+            app.speed_unit = "rpm"
+            PERF.sources["pad_speed_pi"] = speed_ctrl.metrics
+        contact_model = ContactModel(PIN_CONTACT, make_window_s=CONTACT_MAKE_MS / 1000.0,
+                                     break_window_s=CONTACT_BREAK_MS / 1000.0)
 
     except Exception as e:
         print(f"HARDWARE ERROR: {e}")
         # در صورت خرابی سخت‌افزار، برنامه را می‌بندیم (یا می‌توانیم فقط خطا بدهیم)
         sys.exit(1)
 
+    # دوربین اختیاری است: خرابی آن برنامه را متوقف نمی‌کند (صفحه No Signal نشان می‌دهد)
+    if CAMERA_SOURCE:
+        try:
+            camera = CameraProcess(CAMERA_SOURCE, *CAMERA_SIZE, fps=CAMERA_FPS)
+            PERF.sources["camera"] = camera.stats
+            if INSPECTION_WORKERS:
+                inspector = InspectionService(camera.ring.name, workers=INSPECTION_WORKERS)
+                PERF.sources["inspection"] = inspector.stats
+            if ARCHIVE_PATH:
+                archive = ImageArchive(ARCHIVE_PATH, fmt=ARCHIVE_FORMAT)
+                PERF.sources["image_archive"] = archive.stats
+            if AUTOFOCUS and not COLUMN_STEPPER:
+                autofocus = AutoFocus(col_model, camera.ring, speed_um_s=COLUMN_SPEED_UM_S, positioner=positioner)
+        except Exception as e:
+            print(f"[CAMERA] disabled: {e}")
+            if camera: camera.close()
+            camera = inspector = autofocus = archive = None
+
     # 3. اتصال مغز متفکر (Presenter)
     # پرزینتر به صورت خودکار رویدادهای دکمه‌ها و اسلایدرها را مدیریت می‌کند
     try:
         p_light = LightPresenter(model=light_model, view=app)
         p_lissa = LissaPresenter(model=lissa_model, view=app)
-        p_pad = PadPresenter(model=pad_model, view=app)
-        p_col = ColumnPresenter(model=col_model, view=app)
+        p_pad = PadPresenter(model=pad_model, view=app, speed_controller=speed_ctrl)
+        p_col = ColumnPresenter(model=col_model, view=app, positioner=positioner)
+        p_estop = EStopPresenter(model=estop_model, view=app)
+        # حرکت موقعیت‌یابی ستون در ترد خودش است؛ لغو آن جدا از قطع خروجی‌ها لازم است
+        if positioner: estop_model.listeners.append(positioner.abort)
+        # پایان تایمر معکوس، پد را متوقف می‌کند
+        p_timer = TimerPresenter(view=app, pad_model=pad_model)
+        # اجرای دستور پولیش (مراحل سرعت/جهت/زمان/لیساژور/نور/ستون)
+        recipe_runner = RecipeRunner(pad_model, lissa=lissa_model, light=light_model, positioner=positioner)
+        # توقف اضطراری دستور را هم لغو می‌کند تا مرحله بعد خروجی‌ها را دوباره روشن نکند
+        estop_model.listeners.append(recipe_runner.abort)
+        # فوکوس خودکار بین حرکت‌ها ستون را دوباره روشن می‌کند؛ باید صریحاً لغو شود
+        if autofocus: estop_model.listeners.append(autofocus.abort)
+        # ستون یک مالک دارد: فوکوس خودکار با دستور، حرکت انکودری یا حرکت دستی/API هم‌زمان اجرا نمی‌شود
+        if autofocus:
+            autofocus.column_free = lambda: (recipe_runner.state not in ("running", "paused")
+                                             and col_model.moving_since is None)
+            recipe_runner.start_allowed = lambda: not autofocus.busy
+            p_col.move_allowed = lambda: not autofocus.busy
+        p_recipe = RecipePresenter(runner=recipe_runner, view=app,
+                                   recipe=settings_store.get_recipe(settings_store.get("recipe")))
+        p_settings = SettingsPresenter(store=settings_store, view=app)
+        p_contact = ContactPresenter(model=contact_model, view=app, timer_presenter=p_timer, pad_presenter=p_pad,
+                                     start_countdown_on_contact=CONTACT_STARTS_TIMER,
+                                     require_contact_for_pad=CONTACT_REQUIRED_FOR_PAD)
+        p_camera = CameraPresenter(camera=camera, view=app, inspector=inspector,
+                                   autofocus=autofocus, archive=archive) if camera else None
+        p_gallery = GalleryPresenter(archive=archive, view=app) if archive else None
+        if archive:
+            # تصویر پایان هر اجرای دستور به همان اجرا پیوند داده می‌شود
+            recipe_runner.listeners.append(lambda event, stage: event == "done" and app.dispatcher.post(
+                lambda: p_camera.archive_frame(run=recipe_runner.run_id, recipe=recipe_runner.recipe_name)))
 
 
         # در اینجا رفرنس پرزینتر را به ویو هم می‌دهیم (اختیاری، برای توسعه‌های آینده)
-        app.set_presenter(light_presenter = p_light, lissa_presenter = p_lissa, pad_presenter = p_pad, column_presenter = p_col)
+        app.set_presenter(light_presenter = p_light, lissa_presenter = p_lissa, pad_presenter = p_pad, column_presenter = p_col,
+                          timer_presenter = p_timer, recipe_presenter = p_recipe, settings_presenter = p_settings,
+                          camera_presenter = p_camera, gallery_presenter = p_gallery)
         print("Presenter linked successfully.")
         
     except KeyError as e:
         print(f"UI Binding Error: Widget {e} not found in View.")
         sys.exit(1)
 
+    # 3.5 نگهبان ایمنی: با ضربان حلقه رویداد تغذیه می‌شود
+    watchdog = SafetyWatchdog(
+        pad=pad_model, column=col_model, lissa=lissa_model,
+        timeout_s=WATCHDOG_TIMEOUT_S, max_hold_s=COLUMN_MAX_HOLD_S,
+    )
+    app.loop_monitor.listeners.append(watchdog.feed)
+    if hw_proc:
+        # ضربان به پروسه سخت‌افزار؛ اگر کل پروسه UI گیر کند یا بمیرد، آنجا خروجی‌ها خاموش می‌شوند
+        app.loop_monitor.listeners.append(hw_proc.heartbeat)
+        hw_proc.listeners.append(lambda: app.ui_state.set(
+            "status_step", text="State: SAFE STOP (hw heartbeat)", bootstyle="inverse-danger"))
+    watchdog.listeners.append(lambda reason, stall_ms: reason == "ui-stall" and recipe_runner.abort())
+    if autofocus: watchdog.listeners.append(lambda reason, stall_ms: autofocus.abort())
+    if positioner: watchdog.listeners.append(lambda reason, stall_ms: positioner.abort())
+    # نمایش توقف ایمن در نوار وضعیت (بعد از بازگشت حلقه Tk)
+    watchdog.listeners.append(lambda reason, stall_ms: app.dispatcher.post(
+        lambda: app.ui_state.set("status_step", text=f"State: SAFE STOP ({reason})", bootstyle="inverse-danger")))
+    watchdog.start()
+
+    # 3.6 API محلی در ترد خودش؛ فرمان‌ها از همان مسیر دکمه‌ها در ترد UI اجرا می‌شوند
+    remote_api = None
+    if API_PORT is not None:
+        try:
+            remote_api = RemoteAPI(API_HOST, API_PORT, rate_hz=API_RATE_HZ, token=API_TOKEN)
+            RemotePresenter(remote_api, app, pad=p_pad, light=p_light, lissa=p_lissa, column=p_col,
+                            timer=p_timer, estop=p_estop)
+            remote_api.start()
+            PERF.sources["remote_api"] = remote_api.stats
+        except RuntimeError as e:
+            print(f"[API] disabled: {e}")
+            remote_api = None
+
     # 4. اجرای حلقه اصلی برنامه
     print("Showing GUI...")
     try:
@@ -77,10 +295,50 @@ def main():
     finally:
         # 5. تمیزکاری و خروج ایمن (Cleanup)
         print("Cleaning up resources...")
+        if remote_api:
+            remote_api.close()  # قبل از بقیه تا فرمان جدیدی نرسد
+            print(remote_api.report())
+        watchdog.close()
+        recipe_runner.abort()
+        settings_store.close()
+        print(settings_store.report())
+        if recipe_runner.state != "idle": print(recipe_runner.report())
+        print(app.dispatcher.latency.format(f"UI dispatch latency (max depth {app.dispatcher.max_depth})"))
+        if estop_model:
+            print(estop_model.report())
+            estop_model.close()
+        if camera:
+            if p_camera:
+                p_camera.close()
+                print(p_camera.report())
+            if autofocus: print(autofocus.report())
+            if archive:
+                archive.close()
+                print(archive.report())
+            if inspector:
+                inspector.close()  # کارگرها قبل از آزاد شدن حلقه فریم بسته شوند
+                print(inspector.report())
+            camera.close()
+        if contact_model:
+            print(contact_model.report())
+            contact_model.close()
+        if speed_ctrl:
+            print(speed_ctrl.report())
+            speed_ctrl.close()
+        if tach: tach.close()
+        if positioner:
+            positioner.abort()
+            print(positioner.report())
+        if encoder: encoder.close()
         if col_model: col_model.close()
-        if pad_model: pad_model.close()
+        if pad_model:
+            if hasattr(pad_model, "ramp"): print(pad_model.ramp.jitter.format("Pad ramp jitter"))
+            pad_model.close()
         if light_model: light_model.close()
         if lissa_model: lissa_model.close()
+        if hw_proc: hw_proc.close()
+        if PERF_EXPORT_PATH: print(f"Performance report saved: {PERF.export(PERF_EXPORT_PATH)}")
+        print(PIN_STATS.report())
         print("System shutdown complete. Goodbye!")
 
 if __name__ == "__main__":
@@ -0,0 +1,419 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from utils.stats import LatencyStats
+from .inspection import focus_score
+
+
+class _Aborted(Exception):
+    pass
+
+
+def frame_metric(data, width, height, downscale=4, roi=0.6):
+    """
+    امتیاز فوکوس سریع یک فریم RGB: کانال سبز، ناحیه مرکزی و میانگین بلوک‌های
+    downscale×downscale (کاهش نویز و حجم محاسبه) و سپس واریانس لاپلاسین.
+    """
+    rgb = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+    ch, cw = int(height * roi) // downscale * downscale, int(width * roi) // downscale * downscale
+    y0, x0 = (height - ch) // 2, (width - cw) // 2
+    green = rgb[y0:y0 + ch, x0:x0 + cw, 1].astype(np.float32)
+    small = green.reshape(ch // downscale, downscale, cw // downscale, downscale).mean(axis=(1, 3))
+    return focus_score(small)
+
+
+class AutoFocus:
+    """
+    فوکوس خودکار با حرکت ستون و امتیاز فوکوس جریانی فریم‌های دوربین.
+    1) جاروب درشت: ستون با سرعت ثابت حرکت می‌کند و هر فریم جدید یک نمونه
+       (موقعیت لحظه ضبط، امتیاز هموار شده) می‌دهد؛ به محض عبور از قله توقف
+       (اگر امتیاز از ابتدا افت کند، جهت برعکس می‌شود).
+    2) جستجوی ریز: سه نقطه اطراف بهترین موقعیت با حرکت‌های کوتاه زمان‌دار،
+       برازش سهمی و نصف کردن گام تا min_step_um.
+    با انکودر (positioner) موقعیت از positioner.position_um خوانده می‌شود و حرکت‌ها
+    روی هدف انکودر متوقف می‌شوند؛ بدون آن از زمان حرکت و سرعت ستون محاسبه می‌شود
+    و نسبت به نقطه شروع است.
+    """
+
+    def __init__(self, column, ring, speed_um_s=200.0, range_um=400.0, downscale=4, roi=0.6,
+                 drop_ratio=0.3, smoothing=0.5, min_step_um=2.0, settle_s=0.05, frame_timeout_s=0.5,
+                 positioner=None):
+        """
+        :param ring: FrameRing دوربین
+        :param speed_um_s: سرعت ثابت ستون (کالیبراسیون)
+        :param range_um: حداکثر مسیر جاروب درشت در هر جهت
+        :param drop_ratio: افت نسبی امتیاز نسبت به قله برای تشخیص عبور از آن
+        :param smoothing: وزن فریم جدید در میانگین نمایی امتیاز جاروب درشت
+        :param positioner: ColumnPositioner با انکودر (اختیاری) برای خواندن موقعیت واقعی
+        """
+        self.column = column
+        self.ring = ring
+        self.speed = speed_um_s
+        self.range_um = range_um
+        self.downscale = downscale
+        self.roi = roi
+        self.drop_ratio = drop_ratio
+        self.smoothing = smoothing
+        self.min_step_um = min_step_um
+        self.settle_s = settle_s
+        self.frame_timeout_s = frame_timeout_s
+        self.positioner = positioner
+
+        self.position_um = 0.0
+        self.busy = False
+        # شرط اختیاری شروع: تابعی که False یعنی ستون در اختیار کار دیگری است (دستور، حرکت دستی)
+        self.column_free = None
+        self.metric_ms = LatencyStats(maxlen=500)
+        # نتیجه هر اجرا: duration_s, offset_um, score, coarse_frames, fine_evals
+        self.history = deque(maxlen=50)
+
+        self._abort = threading.Event()
+        self._thread = None
+
+    # ---------- API ----------
+
+    def run(self, on_done=None):
+        """
+        شروع فوکوس؛ بلافاصله برمی‌گردد.
+        :param on_done: تابع (result یا None اگر لغو شد) در ترد فوکوس
+        """
+        if self.busy:
+            return False
+        if self.positioner is not None and self.positioner.busy:
+            return False
+        if self.column_free and not self.column_free():
+            return False
+        self.busy = True
+        self._abort.clear()
+        self._thread = threading.Thread(target=self._run, args=(on_done,), name="autofocus", daemon=True)
+        self._thread.start()
+        return True
+
+    def abort(self):
+        self._abort.set()
+        self.column.stop()
+
+    def _run(self, on_done):
+        result = None
+        t0 = time.monotonic()
+        self.position_um = self._measured(self.position_um)
+        start = self.position_um
+        try:
+            peak, coarse_frames = self._coarse()
+            best, score, evals = self._fine(peak)
+            self._move_to(best)
+            result = {"duration_s": time.monotonic() - t0, "offset_um": self.position_um - start,
+                      "score": score, "coarse_frames": coarse_frames, "fine_evals": evals}
+            self.history.append(result)
+        except _Aborted:
+            pass
+        finally:
+            self.column.stop()
+            self.busy = False
+            if on_done:
+                on_done(result)
+
+    # ---------- حرکت ستون ----------
+
+    def _measured(self, estimate):
+        """موقعیت فعلی: از انکودر اگر هست، وگرنه تخمین زمانی داده شده"""
+        return self.positioner.position_um if self.positioner is not None else estimate
+
+    def _start_motion(self, direction):
+        if direction > 0:
+            self.column.move_up()
+        else:
+            self.column.move_down()
+        return time.monotonic()
+
+    def _check(self):
+        # توقف از مسیر دیگر (توقف اضطراری، watchdog) یا لغو
+        if self._abort.is_set() or self.column.moving_since is None:
+            raise _Aborted()
+
+    def _move_to(self, target):
+        """حرکت زمان‌دار به موقعیت هدف (sleep تا نزدیک deadline و سپس انتظار فعال کوتاه)"""
+        delta = target - self.position_um
+        if abs(delta) < self.min_step_um / 4.0:
+            return
+        direction = 1 if delta > 0 else -1
+        t_start = self._start_motion(direction)
+        deadline = t_start + abs(delta) / self.speed
+        if self.positioner is not None:
+            deadline += 0.5 * abs(delta) / self.speed   # حد زمانی؛ توقف با رسیدن انکودر به هدف
+        while True:
+            self._check()
+            if self.positioner is not None and (target - self.positioner.position_um) * direction <= 0:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if remaining > 0.002:
+                time.sleep(min(remaining - 0.001, 0.01 if self.positioner is None else 0.002))
+        self.column.stop()
+        self.position_um = self._measured(self.position_um + direction * self.speed * (time.monotonic() - t_start))
+
+    # ---------- فریم‌ها ----------
+
+    def _next_frame(self, last_id, not_before_ns=0):
+        """انتظار برای فریم جدیدتر از last_id (و ضبط شده بعد از not_before_ns): (id, t_ns, score)"""
+        deadline = time.monotonic() + self.frame_timeout_s
+        while time.monotonic() < deadline:
+            if self._abort.is_set():
+                raise _Aborted()
+            frame_id = self.ring.latest_id()
+            if frame_id != last_id:
+                got = self.ring.read_copy(frame_id)
+                if got is not None and got[2] >= not_before_ns:
+                    t0 = time.perf_counter()
+                    score = frame_metric(got[1], self.ring.width, self.ring.height, self.downscale, self.roi)
+                    self.metric_ms.add((time.perf_counter() - t0) * 1000.0)
+                    return frame_id, got[2], score
+            time.sleep(0.002)
+        print("[AF] no camera frames")
+        raise _Aborted()
+
+    # ---------- جاروب درشت ----------
+
+    def _coarse(self):
+        direction = 1
+        origin = self.position_um
+        pos0 = origin
+        t_move = self._start_motion(direction)
+        last_id = self.ring.latest_id()
+        smooth = None
+        best_score, best_pos = -1.0, origin
+        first_score = None
+        reversed_once = False
+        frames = 0
+        try:
+            while True:
+                self._check()
+                last_id, t_ns, score = self._next_frame(last_id, not_before_ns=int(t_move * 1e9))
+                frames += 1
+                # موقعیت در لحظه ضبط فریم (با انکودر فقط تأخیر پردازش فریم تخمین زده می‌شود)
+                if self.positioner is not None:
+                    pos = self.positioner.position_um - direction * self.speed * max(0.0, time.monotonic() - t_ns / 1e9)
+                else:
+                    pos = pos0 + direction * self.speed * max(0.0, t_ns / 1e9 - t_move)
+                smooth = score if smooth is None else smooth + self.smoothing * (score - smooth)
+                if first_score is None:
+                    first_score = smooth
+                if smooth > best_score:
+                    best_score, best_pos = smooth, pos
+
+                dropped = smooth < best_score * (1.0 - self.drop_ratio)
+                if dropped and best_score > first_score * 1.05:
+                    break  # از قله عبور کرد
+                out_of_range = (pos - origin) * direction > self.range_um
+                if (dropped or out_of_range) and not reversed_once:
+                    # امتیاز از شروع افت کرده یا در این جهت قله‌ای نبود: جستجو در جهت دیگر
+                    self.column.stop()
+                    self.position_um = self._measured(pos0 + direction * self.speed * (time.monotonic() - t_move))
+                    direction, pos0, reversed_once = -direction, self.position_um, True
+                    smooth = None
+                    t_move = self._start_motion(direction)
+                    continue
+                if out_of_range:
+                    print("[AF] focus peak not found within range")
+                    break
+        finally:
+            self.column.stop()
+            self.position_um = self._measured(pos0 + direction * self.speed * (time.monotonic() - t_move))
+        return best_pos, frames
+
+    # ---------- جستجوی ریز ----------
+
+    def _evaluate(self, pos, frames=2):
+        """حرکت به pos، انتظار برای آرام شدن و میانگین امتیاز چند فریم ضبط شده بعد از توقف"""
+        self._move_to(pos)
+        time.sleep(self.settle_s)
+        not_before = time.monotonic_ns()
+        last_id = self.ring.latest_id()
+        total = 0.0
+        for _ in range(frames):
+            last_id, _, score = self._next_frame(last_id, not_before_ns=not_before)
+            total += score
+        return total / frames
+
+    def _fine(self, center):
+        # گام اولیه: مسیر دو فریم جاروب درشت (تأخیر میانگین نمایی + فاصله نمونه‌ها)
+        fps = self.ring.header()["capture_fps"] or 30.0
+        step = max(2.0 * self.min_step_um, 2.0 * self.speed / fps)
+        evals = 0
+        score = 0.0
+        while step >= self.min_step_um:
+            # ترتیب ارزیابی از موقعیت فعلی (که معمولاً بعد از قله است) برای کوتاه‌ترین مسیر
+            points = sorted((center - step, center, center + step), key=lambda p: abs(p - self.position_um))
+            scores = {p: self._evaluate(p) for p in points}
+            evals += 3
+            s_minus, s0, s_plus = scores[center - step], scores[center], scores[center + step]
+            denom = s_minus - 2.0 * s0 + s_plus
+            if denom < 0:
+                offset = step * (s_minus - s_plus) / (2.0 * denom)
+                offset = max(-step, min(step, offset))
+            else:
+                offset = step if s_plus > s_minus else -step
+            center += offset
+            score = max(scores.values())
+            step /= 2.0
+        return center, score, evals
+
+    def report(self):
+        if not self.history:
+            return "Auto-focus: 0 runs"
+        durations = [r["duration_s"] for r in self.history]
+        return (f"Auto-focus: {len(self.history)} runs, mean {sum(durations) / len(durations):.2f} s, "
+                f"max {max(durations):.2f} s\n" + self.metric_ms.format("  focus metric"))
+
+
+# ==========================================
+# شبیه‌سازی ستون و دوربین
+# ==========================================
+
+class SimulatedColumn:
+    """ستون با سرعت ثابت (همان API ColumnModel) که موقعیت واقعی را از زمان حرکت محاسبه می‌کند"""
+
+    def __init__(self, speed_um_s=200.0, start_um=0.0):
+        self.speed = speed_um_s
+        self.moving_since = None
+        self._pos = start_um
+        self._dir = 0
+        self._t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def position_at(self, t):
+        with self._lock:
+            return self._pos + self._dir * self.speed * max(0.0, t - self._t)
+
+    def _set(self, direction):
+        now = time.monotonic()
+        with self._lock:
+            self._pos += self._dir * self.speed * max(0.0, now - self._t)
+            self._dir, self._t = direction, now
+
+    def move_up(self):
+        self._set(+1)
+        if self.moving_since is None: self.moving_since = time.monotonic()
+
+    def move_down(self):
+        self._set(-1)
+        if self.moving_since is None: self.moving_since = time.monotonic()
+
+    def stop(self):
+        self._set(0)
+        self.moving_since = None
+
+    def close(self):
+        pass
+
+
+class SimulatedEncoder:
+    """جایگزین ColumnPositioner برای شبیه‌سازی: موقعیت واقعی ستون شبیه‌سازی شده"""
+
+    def __init__(self, column):
+        self.column = column
+        self.busy = False
+
+    @property
+    def position_um(self):
+        return self.column.position_at(time.monotonic())
+
+
+class SimulatedCamera:
+    """
+    دوربین شبیه‌سازی شده که در یک ترد فریم‌ها را در FrameRing می‌نویسد.
+    میزان تاری از فاصله موقعیت واقعی ستون (در لحظه ضبط) تا صفحه فوکوس
+    به دست می‌آید و بین سطوح تاری از پیش ساخته شده درون‌یابی می‌شود.
+    """
+
+    def __init__(self, column, focus_um=0.0, depth_um=10.0, fps=30, size=(320, 240), levels=24, noise=2.0, seed=0):
+        from .camera import FrameRing
+        from .inspection import synthetic_endface
+        self.column = column
+        self.focus_um = focus_um
+        self.depth_um = depth_um
+        self.fps = fps
+        self.noise = noise
+        self.ring = FrameRing(size[0], size[1], slots=4, create=True)
+        rng = np.random.default_rng(seed)
+        self.stack = [synthetic_endface(size, np.random.default_rng(seed), scratches=2, blur=k, noise=0.0)
+                      .astype(np.float32) for k in range(levels)]
+        self._rng = rng
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sim-camera", daemon=True)
+        self._thread.start()
+
+    def frame_at(self, t):
+        level = min(len(self.stack) - 1.001, abs(self.column.position_at(t) - self.focus_um) / self.depth_um)
+        k = int(level)
+        a = level - k
+        img = (1.0 - a) * self.stack[k] + a * self.stack[k + 1]
+        img += self._rng.normal(0.0, self.noise, img.shape[:2])[:, :, None]
+        return np.clip(img, 0, 255).astype(np.uint8)
+
+    def _run(self):
+        period = 1.0 / self.fps
+        deadline = time.monotonic()
+        frames, window = 0, time.monotonic()
+        while not self._stop.is_set():
+            t = time.monotonic()
+            self.ring.write(self.frame_at(t).reshape(-1), t_ns=int(t * 1e9))
+            frames += 1
+            if t - window >= 1.0:
+                self.ring.publish_stats(frames / (t - window), 0)
+                frames, window = 0, t
+            deadline += period
+            self._stop.wait(max(0.0, deadline - time.monotonic()))
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self.ring.close(unlink=True)
+
+
+def simulate(runs=5, speed_um_s=200.0, start_range_um=150.0, seed=1, speed_error=1.0, encoder=False):
+    """
+    اجرای چند فوکوس خودکار از موقعیت‌های شروع تصادفی روی ستون و دوربین شبیه‌سازی شده.
+    تکرارپذیری = پراکندگی موقعیت نهایی نسبت به صفحه فوکوس واقعی.
+    :param speed_error: نسبت سرعت واقعی ستون به سرعت کالیبره شده
+    :param encoder: خواندن موقعیت از انکودر شبیه‌سازی شده به جای زمان حرکت
+    """
+    rng = np.random.default_rng(seed)
+    column = SimulatedColumn(speed_um_s * speed_error)
+    camera = SimulatedCamera(column, focus_um=0.0)
+    errors = []
+    try:
+        for i in range(runs):
+            start = float(rng.uniform(-start_range_um, start_range_um))
+            column._pos = start
+            af = AutoFocus(column, camera.ring, speed_um_s=speed_um_s,
+                           positioner=SimulatedEncoder(column) if encoder else None)
+            done = threading.Event()
+            out = {}
+            af.run(on_done=lambda r: (out.update(result=r), done.set()))
+            done.wait(30.0)
+            result = out.get("result")
+            if result is None:
+                print(f"run {i}: aborted")
+                continue
+            final = column.position_at(time.monotonic())
+            errors.append(final)
+            print(f"run {i}: start {start:+7.1f} um -> {final:+6.2f} um in {result['duration_s']:.2f} s "
+                  f"({result['coarse_frames']} coarse frames, {result['fine_evals']} fine evals)")
+        print(af.metric_ms.format("focus metric per frame") + f" (frame period {1000.0 / camera.fps:.1f} ms)")
+    finally:
+        camera.close()
+    if errors:
+        arr = np.array(errors)
+        print(f"repeatability: mean {arr.mean():+.2f} um, std {arr.std():.2f} um, max |err| {np.abs(arr).max():.2f} um")
+    return errors
+
+
+if __name__ == "__main__":
+    simulate()
+    print("column 15% slower than calibrated, with encoder:")
+    simulate(speed_error=0.85, encoder=True)
@@ -0,0 +1,384 @@
+import math
+import multiprocessing as mp
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+from utils.stats import LatencyStats
+
+# ==========================================
+# چیدمان حلقه فریم روی حافظه مشترک
+# ==========================================
+# سربرگ: latest_id, width, height, slots, _, capture_fps, heartbeat_ns, overruns
+HEADER_FMT = "<Q I I I I d Q Q"
+HEADER_SIZE = 64
+# سربرگ هر خانه (seqlock مستقل): seq (فرد یعنی در حال نوشتن), frame_id, t_ns
+SLOT_FMT = "<Q Q Q"
+SLOT_HDR_SIZE = 32
+CHANNELS = 3  # RGB فشرده؛ همان چیدمانی که Pillow و numpy مستقیم می‌خوانند
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".gif", ".webp")
+
+
+class FrameRing:
+    """
+    حلقه N خانه‌ای فریم روی SharedMemory.
+    یک نویسنده (پروسه ضبط) و هر تعداد خواننده بدون قفل. هر خانه seqlock
+    خودش را دارد تا خواننده بتواند بفهمد فریم هنگام خواندن بازنویسی شده یا نه.
+    """
+
+    def __init__(self, width, height, slots=4, name=None, create=False):
+        self.width = width
+        self.height = height
+        self.slots = slots
+        self.frame_size = width * height * CHANNELS
+        self.slot_size = SLOT_HDR_SIZE + self.frame_size
+        size = HEADER_SIZE + slots * self.slot_size
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        self.name = self.shm.name
+        if create:
+            self.shm.buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+            struct.pack_into(HEADER_FMT, self.shm.buf, 0, 0, width, height, slots, 0, 0.0, 0, 0)
+            for i in range(slots):
+                struct.pack_into(SLOT_FMT, self.shm.buf, self._slot_offset(i), 0, 0, 0)
+
+    @classmethod
+    def attach(cls, name):
+        """اتصال به حلقه موجود (ابعاد از سربرگ خوانده می‌شود)"""
+        probe = shared_memory.SharedMemory(name=name)
+        try:
+            _, width, height, slots = struct.unpack_from(HEADER_FMT, probe.buf, 0)[:4]
+        finally:
+            probe.close()
+        return cls(width, height, slots, name=name)
+
+    def _slot_offset(self, index):
+        return HEADER_SIZE + index * self.slot_size
+
+    # ---------- نویسنده ----------
+
+    def write(self, frame, t_ns=None):
+        """کپی یک فریم RGB (bytes-like) در خانه بعدی؛ شماره فریم را برمی‌گرداند"""
+        buf = self.shm.buf
+        frame_id = struct.unpack_from("<Q", buf, 0)[0] + 1
+        off = self._slot_offset(frame_id % self.slots)
+        seq = struct.unpack_from("<Q", buf, off)[0]
+        struct.pack_into("<Q", buf, off, seq + 1)  # فرد: در حال نوشتن
+        data = off + SLOT_HDR_SIZE
+        buf[data:data + self.frame_size] = frame
+        struct.pack_into(SLOT_FMT, buf, off, seq + 2, frame_id, t_ns or time.monotonic_ns())
+        struct.pack_into("<Q", buf, 0, frame_id)  # آخرین فریم کامل
+        return frame_id
+
+    def publish_stats(self, capture_fps, overruns):
+        struct.pack_into("<d Q Q", self.shm.buf, 24, capture_fps, time.monotonic_ns(), overruns)
+
+    # ---------- خواننده ----------
+
+    def latest_id(self):
+        return struct.unpack_from("<Q", self.shm.buf, 0)[0]
+
+    def header(self):
+        latest, width, height, slots, _, fps, heartbeat_ns, overruns = struct.unpack_from(HEADER_FMT, self.shm.buf, 0)
+        return {"latest_id": latest, "width": width, "height": height, "slots": slots,
+                "capture_fps": fps, "heartbeat_ns": heartbeat_ns, "overruns": overruns}
+
+    def acquire(self, frame_id):
+        """
+        نمای بدون کپی از داده فریم: (memoryview, seq, t_ns) یا None اگر خانه
+        در حال نوشتن است یا فریم دیگری در آن نشسته. پس از کپی/استفاده باید
+        با still_valid بررسی شود.
+        """
+        off = self._slot_offset(frame_id % self.slots)
+        seq, slot_id, t_ns = struct.unpack_from(SLOT_FMT, self.shm.buf, off)
+        if seq & 1 or slot_id != frame_id:
+            return None
+        data = off + SLOT_HDR_SIZE
+        return self.shm.buf[data:data + self.frame_size], seq, t_ns
+
+    def still_valid(self, frame_id, seq):
+        """True اگر خانه از زمان acquire بازنویسی نشده باشد (فریم پاره نیست)"""
+        return struct.unpack_from("<Q", self.shm.buf, self._slot_offset(frame_id % self.slots))[0] == seq
+
+    def read_copy(self, frame_id=None):
+        """کپی سازگار یک فریم (پیش‌فرض آخرین): (frame_id, bytes, t_ns) یا None"""
+        frame_id = frame_id or self.latest_id()
+        if not frame_id:
+            return None
+        got = self.acquire(frame_id)
+        if got is None:
+            return None
+        view, seq, t_ns = got
+        try:
+            data = bytes(view)
+        finally:
+            view.release()
+        return (frame_id, data, t_ns) if self.still_valid(frame_id, seq) else None
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# ==========================================
+# منابع تصویر (فقط در پروسه ضبط اجرا می‌شوند)
+# ==========================================
+
+class SyntheticSource:
+    """
+    تصویر مصنوعی سطح فیبر: غلاف خاکستری، هسته روشن، یک خراش چرخان و یک ذره
+    گرد و غبار متحرک. برای آزمایش بدون دوربین.
+    """
+
+    def __init__(self, width, height):
+        from PIL import Image, ImageDraw
+        self._draw = ImageDraw.Draw
+        self.size = (width, height)
+        self.center = (width / 2.0, height / 2.0)
+        self.r_clad = min(width, height) * 0.35
+        self.r_core = self.r_clad * 0.07
+        self.base = Image.new("RGB", self.size, (8, 8, 12))
+        draw = ImageDraw.Draw(self.base)
+        draw.ellipse(self._box(self.center, self.r_clad), fill=(90, 90, 100))
+        draw.ellipse(self._box(self.center, self.r_core), fill=(230, 230, 210))
+        self.count = 0
+
+    @staticmethod
+    def _box(center, r):
+        return (center[0] - r, center[1] - r, center[0] + r, center[1] + r)
+
+    def read(self):
+        self.count += 1
+        t = self.count / 30.0
+        im = self.base.copy()
+        draw = self._draw(im)
+        cx, cy = self.center
+        a = t * 0.5
+        dx, dy = math.cos(a) * self.r_clad * 0.8, math.sin(a) * self.r_clad * 0.8
+        draw.line((cx - dx, cy - dy, cx + dx, cy + dy), fill=(40, 40, 48), width=2)
+        px = cx + math.cos(t * 1.3) * self.r_clad * 0.5
+        py = cy + math.sin(t * 0.7) * self.r_clad * 0.5
+        draw.ellipse(self._box((px, py), 6), fill=(20, 18, 10))
+        draw.text((10, 10), f"SYNTHETIC #{self.count}", fill=(200, 200, 200))
+        return im.tobytes()
+
+    def close(self):
+        pass
+
+
+class FileSource:
+    """
+    پخش پشت سر هم تصاویر یک پوشه یا یک فایل چندفریمی (GIF/TIFF/WebP) به صورت حلقه.
+    ابعاد متفاوت به ابعاد حلقه تغییر اندازه داده می‌شوند. یک تصویر ثابت فقط یک بار دکد می‌شود.
+    """
+
+    def __init__(self, path, width, height):
+        from PIL import Image
+        self._image = Image
+        self.size = (width, height)
+        if os.path.isdir(path):
+            self.files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTS))
+        else:
+            self.files = [path]
+        if not self.files:
+            raise FileNotFoundError(f"no images in {path}")
+        self._index = 0
+        self._frames = None   # فایل چندفریمی باز
+        self._cached = None   # تنها فریم یک تصویر ثابت
+
+    def _convert(self, im):
+        im = im.convert("RGB")
+        if im.size != self.size:
+            im = im.resize(self.size, self._image.BILINEAR)
+        return im.tobytes()
+
+    def read(self):
+        if self._cached is not None:
+            return self._cached
+        if self._frames is not None:
+            try:
+                self._frames.seek(self._frames.tell() + 1)
+                return self._convert(self._frames)
+            except EOFError:
+                self._frames.close()
+                self._frames = None
+
+        path = self.files[self._index]
+        self._index = (self._index + 1) % len(self.files)
+        im = self._image.open(path)
+        if getattr(im, "n_frames", 1) > 1:
+            self._frames = im
+            return self._convert(im)
+        data = self._convert(im)
+        im.close()
+        if len(self.files) == 1:
+            self._cached = data
+        return data
+
+    def close(self):
+        if self._frames is not None:
+            self._frames.close()
+
+
+def make_source(spec, width, height):
+    """'synthetic' یا مسیر پوشه/فایل تصویر"""
+    if spec == "synthetic":
+        return SyntheticSource(width, height)
+    return FileSource(spec, width, height)
+
+
+# ==========================================
+# پروسه ضبط
+# ==========================================
+
+def _capture_main(ring_name, source_spec, fps, stop):
+    """خواندن فریم از منبع با نرخ ثابت و نوشتن در حلقه (deadline مطلق)"""
+    ring = FrameRing.attach(ring_name)
+    source = make_source(source_spec, ring.width, ring.height)
+    period = 1.0 / fps
+    overruns = 0
+    window_start = time.monotonic()
+    window_frames = 0
+    capture_fps = 0.0
+    ring.publish_stats(0.0, 0)
+    try:
+        deadline = time.monotonic()
+        while not stop.is_set():
+            ring.write(source.read())
+            window_frames += 1
+
+            now = time.monotonic()
+            if now - window_start >= 1.0:
+                capture_fps = window_frames / (now - window_start)
+                window_start, window_frames = now, 0
+            ring.publish_stats(capture_fps, overruns)
+
+            deadline += period
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                stop.wait(remaining)
+            else:
+                # منبع از نرخ هدف عقب افتاده؛ جبران نکردن فریم‌های از دست رفته
+                overruns += 1
+                deadline = time.monotonic()
+    finally:
+        source.close()
+        ring.close()
+
+
+# ==========================================
+# سمت UI
+# ==========================================
+
+class CameraProcess:
+    """
+    راه‌اندازی پروسه ضبط و حلقه فریم مشترک.
+    UI فقط ring را می‌خواند؛ دکد و تبدیل منبع هیچ‌وقت روی ترد Tk اجرا نمی‌شود.
+    """
+    # ضربان قدیمی‌تر از این یعنی دوربین قطع است
+    STALE_S = 1.0
+
+    def __init__(self, source="synthetic", width=640, height=480, fps=30, slots=4, start=True):
+        self.source = source
+        self.fps = fps
+        self.ring = FrameRing(width, height, slots, create=True)
+        self._ctx = mp.get_context("spawn")
+        self._stop = self._ctx.Event()
+        self._proc = None
+        if start:
+            self.start()
+
+    @property
+    def size(self):
+        return self.ring.width, self.ring.height
+
+    def start(self, timeout=10.0):
+        self._proc = self._ctx.Process(
+            target=_capture_main,
+            args=(self.ring.name, self.source, self.fps, self._stop),
+            name="polisher-camera", daemon=True,
+        )
+        self._proc.start()
+        deadline = time.monotonic() + timeout
+        while self.ring.header()["heartbeat_ns"] == 0:
+            if not self._proc.is_alive():
+                raise RuntimeError("camera process exited during startup")
+            if time.monotonic() > deadline:
+                raise RuntimeError("camera process did not start")
+            time.sleep(0.01)
+        print(f" Camera process started (pid={self._proc.pid}, source={self.source})")
+
+    def has_signal(self):
+        hb = self.ring.header()["heartbeat_ns"]
+        return hb != 0 and (time.monotonic_ns() - hb) < self.STALE_S * 1e9
+
+    def stats(self):
+        h = self.ring.header()
+        return {"frames": h["latest_id"], "capture_fps": h["capture_fps"], "overruns": h["overruns"],
+                "signal": self.has_signal()}
+
+    def is_alive(self):
+        return self._proc is not None and self._proc.is_alive()
+
+    def close(self):
+        if self._proc is not None:
+            self._stop.set()
+            self._proc.join(timeout=3.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+            self._proc = None
+        self.ring.close(unlink=True)
+
+
+# ==========================================
+# سنجش مسیر نمایش بدون Tk
+# ==========================================
+
+def measure_display(source="synthetic", seconds=3.0, display_hz=30, size=(640, 480), capture_fps=30):
+    """
+    همان کاری که CameraPresenter در هر تیک انجام می‌دهد (آخرین فریم -> Image)
+    با نرخ نمایش؛ هزینه تبدیل، فریم‌های رد شده و پاره شمارش می‌شود.
+    """
+    from PIL import Image
+    cam = CameraProcess(source, size[0], size[1], fps=capture_fps)
+    convert = LatencyStats()
+    shown = dropped = torn = 0
+    last = 0
+    try:
+        period = 1.0 / display_hz
+        deadline = time.monotonic()
+        end = deadline + seconds
+        while time.monotonic() < end:
+            fid = cam.ring.latest_id()
+            if fid and fid != last:
+                got = cam.ring.acquire(fid)
+                if got is not None:
+                    view, seq, _ = got
+                    t0 = time.perf_counter()
+                    im = Image.frombuffer("RGB", size, view, "raw", "RGB", 0, 1)
+                    view.release()
+                    if cam.ring.still_valid(fid, seq):
+                        convert.add((time.perf_counter() - t0) * 1000.0)
+                        if last:
+                            dropped += max(0, fid - last - 1)
+                        shown += 1
+                        last = fid
+                    else:
+                        torn += 1
+                    del im
+            deadline += period
+            time.sleep(max(0.0, deadline - time.monotonic()))
+        st = cam.stats()
+    finally:
+        cam.close()
+    print(f"captured {st['frames']} frames ({st['capture_fps']:.1f} fps, {st['overruns']} overruns), "
+          f"shown {shown}, dropped {dropped}, torn {torn}")
+    print(convert.format("ring -> Image"))
+    return convert
+
+
+if __name__ == "__main__":
+    import sys
+    measure_display(sys.argv[1] if len(sys.argv) > 1 else "synthetic")
@@ -1,5 +1,9 @@
+import time
+
 from gpiozero import DigitalOutputDevice
 
+from .shadow_pins import ShadowPin
+
 class ColumnModel:
     def __init__(self, en_pin, dir_pin):
         """
@@ -9,27 +13,43 @@ class ColumnModel:
         """
         self.en_pin = en_pin
         self.dir_pin = dir_pin
+        # زمان شروع حرکت فعلی (برای محدودیت زمان نگه‌داشتن در Watchdog)
+        self.moving_since = None
+        # جهت حرکت فعلی: +1 بالا، -1 پایین، 0 ایستاده
+        self.direction = 0
+        # قفل توقف اضطراری (تابعی که False یعنی روشن کردن خروجی ممنوع است)
+        self.interlock = None
 
         # تعریف درایورها به صورت دیجیتال (بدون PWM)
-        self.motor_enable = DigitalOutputDevice(self.en_pin)
-        self.motor_dir = DigitalOutputDevice(self.dir_pin)
-        
+        self.motor_enable = ShadowPin(DigitalOutputDevice(self.en_pin), name=f"col_en:{self.en_pin}")
+        self.motor_dir = ShadowPin(DigitalOutputDevice(self.dir_pin), name=f"col_dir:{self.dir_pin}")
+
         print(f" Column Motor initialized (DIGITAL): EN={en_pin}, DIR={dir_pin}")
 
     def move_up(self):
         """حرکت به بالا"""
+        if self.interlock and not self.interlock():
+            return
         self.motor_dir.on()      # جهت بالا (مثلاً ۱)
         self.motor_enable.on()   # روشن کردن موتور (سرعت ثابت)
+        self.direction = 1
+        if self.moving_since is None: self.moving_since = time.monotonic()
 
     def move_down(self):
         """حرکت به پایین"""
+        if self.interlock and not self.interlock():
+            return
         self.motor_dir.off()     # جهت پایین (مثلاً ۰)
         self.motor_enable.on()   # روشن کردن موتور
+        self.direction = -1
+        if self.moving_since is None: self.moving_since = time.monotonic()
 
     def stop(self):
         """توقف کامل"""
         self.motor_enable.off()  # خاموش کردن
+        self.direction = 0
+        self.moving_since = None
 
     def close(self):
         self.motor_enable.close()
-        self.motor_dir.close()
\ No newline at end of file
+        self.motor_dir.close()
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import deque
+
+
+class ColumnPositioner:
+    """
+    حرکت ستون به اندازه مشخص (µm) با بازخورد انکودر.
+    ترد حرکت شمارنده را با نرخ بالا می‌خواند و موتور را کمی قبل از هدف خاموش
+    می‌کند؛ فاصله ترمز از میانگین overshoot حرکت‌های قبلی (لغزش بعد از خاموش شدن)
+    یاد گرفته می‌شود و برای هر جهت جداگانه نگه داشته می‌شود.
+    """
+
+    def __init__(self, column, encoder, poll_hz=2000, settle_s=0.05, timeout_s=6.0,
+                 brake_gain=0.5, up_is_positive=True):
+        """
+        :param settle_s: مدت بدون تغییر شمارنده برای پایان حرکت
+        :param brake_gain: وزن هر اندازه‌گیری جدید در میانگین overshoot (EMA)
+        :param timeout_s: حداکثر زمان حرکت (کمتر از محدودیت نگه‌داشتن Watchdog)
+        """
+        self.column = column
+        self.encoder = encoder
+        self.poll_s = 1.0 / poll_hz
+        self.settle_s = settle_s
+        self.timeout_s = timeout_s
+        self.brake_gain = brake_gain
+        self.up_is_positive = up_is_positive
+
+        self.brake_counts = {+1: 0.0, -1: 0.0}   # فاصله ترمز یاد گرفته شده (شمارش)
+        self.history = deque(maxlen=100)          # (requested_um, final_error_um, overshoot_counts, duration_s)
+        self.busy = False
+
+        self._abort = threading.Event()
+        self._thread = None
+
+    @property
+    def position_um(self):
+        return self.encoder.position_um
+
+    def move_by(self, um, on_done=None):
+        """
+        شروع حرکت نسبی؛ بلافاصله برمی‌گردد.
+        :param on_done: تابع (final_error_um) که در پایان در ترد حرکت صدا زده می‌شود
+        """
+        if self.busy:
+            return False
+        interlock = getattr(self.column, "interlock", None)
+        if interlock and not interlock():
+            return False
+        counts = int(round(um * self.encoder.counts_per_um))
+        if counts == 0:
+            return False
+        self.busy = True
+        self._abort.clear()
+        self._thread = threading.Thread(target=self._run, args=(um, counts, on_done),
+                                        name="column-move", daemon=True)
+        self._thread.start()
+        return True
+
+    def abort(self):
+        self._abort.set()
+        self.column.stop()
+
+    def _run(self, um, counts, on_done):
+        direction = 1 if counts > 0 else -1
+        start = self.encoder.position
+        target = start + counts
+        t0 = time.monotonic()
+        error_um = None
+        try:
+            if (direction > 0) == self.up_is_positive:
+                self.column.move_up()
+            else:
+                self.column.move_down()
+
+            brake_at = target - direction * self.brake_counts[direction]
+            while (brake_at - self.encoder.position) * direction > 0:
+                # توقف از مسیر دیگر (STOP، توقف اضطراری، watchdog) یا لغو
+                if self._abort.is_set() or self.column.moving_since is None:
+                    return
+                if time.monotonic() - t0 > self.timeout_s:
+                    print("[COLUMN] Move timeout; encoder not counting?")
+                    return
+                time.sleep(self.poll_s)
+
+            self.column.stop()
+            stop_pos = self.encoder.position
+            final = self._settle()
+
+            # یادگیری فاصله ترمز از لغزش واقعی
+            overshoot = (final - stop_pos) * direction
+            old = self.brake_counts[direction]
+            self.brake_counts[direction] = max(0.0, old + self.brake_gain * (overshoot - old))
+
+            error_um = (final - target) / self.encoder.counts_per_um
+            self.history.append((um, error_um, overshoot, time.monotonic() - t0))
+        finally:
+            self.column.stop()
+            self.busy = False
+            if on_done:
+                on_done(error_um)
+
+    def _settle(self):
+        """انتظار تا ثابت شدن شمارنده"""
+        last = self.encoder.position
+        still_since = time.monotonic()
+        while time.monotonic() - still_since < self.settle_s:
+            time.sleep(self.poll_s)
+            pos = self.encoder.position
+            if pos != last:
+                last = pos
+                still_since = time.monotonic()
+        return last
+
+    def report(self):
+        if not self.history:
+            return "Column moves: 0"
+        errors = [abs(e) for _, e, _, _ in self.history]
+        return (f"Column moves: {len(self.history)} mean |error|={sum(errors) / len(errors):.2f} um "
+                f"max={max(errors):.2f} um brake(up/down)={self.brake_counts[+1]:.1f}/{self.brake_counts[-1]:.1f} counts")
@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import deque
+
+from gpiozero import DigitalInputDevice
+
+
+class Debouncer:
+    """
+    دیبانس نرم‌افزاری با پنجره‌های جداگانه برای برقراری و قطع تماس.
+    سطح خام باید به اندازه پنجره ثابت بماند تا پذیرفته شود؛ پالس‌های کوتاه‌تر
+    (لرزش فیبر، نویز) نادیده گرفته می‌شوند. زمان‌ها از بیرون داده می‌شوند تا
+    همین کلاس برای بازپخش لبه‌های ضبط شده هم قابل استفاده باشد.
+    """
+
+    def __init__(self, make_window_s=0.02, break_window_s=0.05, initial=False):
+        self.make_window_s = make_window_s    # تماس باید این مدت پایدار باشد
+        self.break_window_s = break_window_s  # قطع تماس باید این مدت پایدار باشد
+        self.state = initial
+        self._raw = initial
+        self._raw_since = 0.0
+        self.rejected = 0   # تغییرات خامی که قبل از پایان پنجره برگشتند
+
+    def edge(self, level, t):
+        """ثبت لبه خام در زمان t"""
+        level = bool(level)
+        if level == self._raw:
+            return
+        if self._raw != self.state:
+            self.rejected += 1   # تغییر قبلی هنوز پذیرفته نشده بود
+        self._raw = level
+        self._raw_since = t
+
+    def deadline(self):
+        """زمان پذیرش تغییر معلق (None اگر تغییری در انتظار نیست)"""
+        if self._raw == self.state:
+            return None
+        window = self.make_window_s if self._raw else self.break_window_s
+        return self._raw_since + window
+
+    def poll(self, t):
+        """اگر تغییر معلق پایدار مانده باشد پذیرفته می‌شود؛ True یعنی وضعیت عوض شد"""
+        due = self.deadline()
+        if due is not None and t >= due:
+            self.state = self._raw
+            return True
+        return False
+
+
+class ContactModel:
+    """
+    سنسور تماس فیبر با پد.
+    لبه‌ها در ترد callback خود gpiozero با زمان monotonic ثبت می‌شوند (بافر حلقوی)
+    و یک ترد سبک فقط وقتی تغییری در انتظار است بیدار می‌شود تا پس از پایان
+    پنجره دیبانس وضعیت را بپذیرد. listeners فقط روی تغییر واقعی صدا زده می‌شوند.
+    """
+
+    def __init__(self, pin, pull_up=True, make_window_s=0.02, break_window_s=0.05,
+                 history=256, clock=time.monotonic):
+        """
+        :param pin: پین ورودی سنسور (پیش‌فرض: فعال‌پایین با pull-up)
+        :param history: طول بافر حلقوی لبه‌های خام
+        """
+        self.pin = pin
+        self.clock = clock
+        self.edges = deque(maxlen=history)   # (t, level) لبه‌های خام
+        self.changes = deque(maxlen=history)  # (t, state) تغییرات پذیرفته شده
+        self.edge_count = 0
+        # توابع (is_touching, t) که در ترد دیبانس صدا زده می‌شوند؛ نباید مسدود کنند
+        self.listeners = []
+
+        self.sensor = DigitalInputDevice(pin, pull_up=pull_up)
+        self.debouncer = Debouncer(make_window_s, break_window_s, initial=self.sensor.is_active)
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+        self.sensor.when_activated = lambda: self._on_edge(True)
+        self.sensor.when_deactivated = lambda: self._on_edge(False)
+        self._thread = threading.Thread(target=self._run, name="contact-debounce", daemon=True)
+        self._thread.start()
+
+    @property
+    def is_touching(self):
+        return self.debouncer.state
+
+    def _on_edge(self, level):
+        """در ترد gpiozero اجرا می‌شود"""
+        t = self.clock()
+        with self._lock:
+            self.edges.append((t, level))
+            self.edge_count += 1
+            self.debouncer.edge(level, t)
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                due = self.debouncer.deadline()
+            timeout = None if due is None else max(0.0, due - self.clock())
+            if timeout is None or timeout > 0:
+                self._wake.wait(timeout)
+                self._wake.clear()
+                continue
+            with self._lock:
+                changed = self.debouncer.poll(self.clock())
+                state = self.debouncer.state
+            if changed:
+                t = self.clock()
+                self.changes.append((t, state))
+                for listener in self.listeners:
+                    listener(state, t)
+
+    def report(self):
+        return (f"Contact: {self.edge_count} raw edges, {len(self.changes)} accepted changes, "
+                f"{self.debouncer.rejected} rejected as bounce")
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=1.0)
+        self.sensor.close()
+
+
+def replay(edges, make_window_s=0.02, break_window_s=0.05, initial=False):
+    """
+    بازپخش قطعی یک دنباله لبه ضبط شده [(t, level), ...] روی Debouncer.
+    خروجی: لیست تغییرات پذیرفته شده [(t_accept, state), ...]
+    """
+    deb = Debouncer(make_window_s, break_window_s, initial=initial)
+    accepted = []
+    for t, level in edges:
+        # پذیرش تغییر معلق قبل از رسیدن لبه بعدی
+        due = deb.deadline()
+        if due is not None and due <= t and deb.poll(due):
+            accepted.append((due, deb.state))
+        deb.edge(level, t)
+    due = deb.deadline()
+    if due is not None and deb.poll(due):
+        accepted.append((due, deb.state))
+    return accepted
+
+
+def replay_on_mock_pin(edges, pin=21, make_window_s=0.02, break_window_s=0.05, settle_s=0.2):
+    """
+    بازپخش بلادرنگ لبه‌های ضبط شده روی پین MockFactory از مسیر کامل gpiozero.
+    level=True یعنی تماس (پین فعال‌پایین به زمین کشیده می‌شود).
+    خروجی: (تغییرات پذیرفته شده مدل، نتیجه replay قطعی برای مقایسه)
+    """
+    from gpiozero import Device
+
+    model = ContactModel(pin, make_window_s=make_window_s, break_window_s=break_window_s)
+    mock = Device.pin_factory.pin(pin)
+    try:
+        t0 = time.monotonic()
+        for t, level in edges:
+            delay = t0 + t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            if level:
+                mock.drive_low()
+            else:
+                mock.drive_high()
+        time.sleep(settle_s)
+        observed = [(t - t0, state) for t, state in model.changes]
+    finally:
+        model.close()
+    return observed, replay(edges, make_window_s, break_window_s)
+
+
+# دنباله‌های نمونه ضبط شده: لرزش هنگام نشستن فیبر و جدا شدن آن
+RECORDED_TOUCHDOWN = [
+    (0.000, True), (0.002, False), (0.004, True), (0.005, False), (0.009, True),   # لرزش برقراری
+    (0.300, False), (0.310, True),                                                  # قطع کوتاه (نویز)
+    (0.600, False), (0.603, True), (0.606, False),                                  # جدا شدن واقعی
+]
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("GPIOZERO_PIN_FACTORY", "mock")
+    observed, expected = replay_on_mock_pin(RECORDED_TOUCHDOWN)
+    print("expected:", [(round(t, 3), s) for t, s in expected])
+    print("observed:", [(round(t, 3), s) for t, s in observed])
+    print("states match:", [s for _, s in observed] == [s for _, s in expected])
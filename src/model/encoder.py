@@ -0,0 +1,71 @@
+from functools import partial
+
+from gpiozero import DigitalInputDevice
+
+# جدول گذار کوادراتور: (حالت قبلی << 2 | حالت جدید) -> تغییر شمارنده
+# حالت = (A << 1) | B ؛ گذارهای نامعتبر (تغییر هم‌زمان دو کانال) صفر هستند
+_QUAD_TABLE = (
+    0, -1, +1, 0,
+    +1, 0, 0, -1,
+    -1, 0, 0, +1,
+    0, +1, -1, 0,
+)
+_INVALID = frozenset({0b0011, 0b0110, 0b1001, 0b1100})
+
+
+class QuadratureEncoder:
+    """
+    خواندن انکودر کوادراتور ستون (دکد x4).
+    هر لبه با سطح خود همان لبه (نه مقدار لحظه‌ای پین‌ها) وضعیت را به‌روز می‌کند:
+    وقتی callback ها از لبه‌ها عقب بیفتند، خواندن .value چند گذار را در یک گذار
+    نامعتبر خلاصه می‌کرد و شمارش گم می‌شد؛ رویدادهای صف شده lgpio سطح و ترتیب
+    هر لبه را نگه می‌دارند. در مسیر callback نه شیئی ساخته می‌شود نه قفلی گرفته می‌شود
+    (همه callback ها در یک ترد gpiozero به ترتیب اجرا می‌شوند).
+    گذار نامعتبر فقط وقتی رخ می‌دهد که خود درایور لبه‌ای را از دست بدهد و در missed شمرده می‌شود.
+    """
+
+    def __init__(self, pin_a, pin_b, counts_per_um=1.0, pull_up=True):
+        """
+        :param counts_per_um: شمارش در هر میکرون (پس از دکد x4)
+        """
+        self.counts_per_um = counts_per_um
+        self.count = 0      # شمارنده خام (فقط ترد callback آن را تغییر می‌دهد)
+        self._offset = 0    # مبدأ صفر (از ترد‌های دیگر)
+        self.edges = 0
+        self.missed = 0
+
+        self._a = DigitalInputDevice(pin_a, pull_up=pull_up)
+        self._b = DigitalInputDevice(pin_b, pull_up=pull_up)
+        self._state = (self._a.value << 1) | self._b.value
+
+        # activated/deactivated هر کدام سطح لبه‌ای را که باعث رویداد شده مشخص می‌کنند
+        for dev, bit in ((self._a, 0b10), (self._b, 0b01)):
+            dev.when_activated = partial(self._on_edge, bit, bit)
+            dev.when_deactivated = partial(self._on_edge, bit, 0)
+
+    def _on_edge(self, bit, level):
+        """در ترد gpiozero اجرا می‌شود؛ bit کانال لبه و level سطح جدید آن"""
+        state = (self._state & ~bit) | level
+        key = (self._state << 2) | state
+        self.count += _QUAD_TABLE[key]
+        if key in _INVALID:
+            self.missed += 1
+        self._state = state
+        self.edges += 1
+
+    @property
+    def position(self):
+        """موقعیت نسبت به مبدأ (شمارش)"""
+        return self.count - self._offset
+
+    @property
+    def position_um(self):
+        return self.position / self.counts_per_um
+
+    def zero(self):
+        """صفر کردن موقعیت فعلی"""
+        self._offset = self.count
+
+    def close(self):
+        self._a.close()
+        self._b.close()
@@ -0,0 +1,175 @@
+import threading
+import time
+
+from gpiozero import Button
+
+from utils.stats import LatencyStats
+
+
+class EStopModel:
+    """
+    ورودی توقف اضطراری.
+    لبه ورودی توسط ترد callback خود gpiozero پردازش می‌شود (نه صف رویداد Tk)
+    و همه خروجی‌ها بلافاصله قطع می‌شوند. UI فقط بعداً و به صورت غیرهم‌زمان باخبر می‌شود.
+    تا زمان reset، قفل (interlock) روی مدل‌ها هر فرمان روشن کردن خروجی را رد می‌کند
+    (مثلاً after معلق اسلایدر نور یا مرحله بعد دستور).
+    """
+
+    def __init__(self, pin, pad=None, column=None, lissa=None, light=None, pull_up=True, normally_closed=True,
+                 bounce_time=None):
+        """
+        :param pin: پین ورودی کلید قارچی
+        :param normally_closed: کنتاکت NC بین پین و زمین با pull-up: در حالت عادی پین LOW است و
+            فشردن کلید (یا قطع سیم) مدار را باز می‌کند و پین HIGH می‌شود = توقف (fail-safe).
+            False برای کنتاکت NO (فشردن = اتصال به زمین).
+        """
+        self.pin = pin
+        self.pad = pad
+        self.column = column
+        self.lissa = lissa
+        self.light = light
+        self.normally_closed = normally_closed
+
+        self.tripped = False
+        self.trip_count = 0
+        self.trip_event = threading.Event()  # برای اطلاع‌رسانی به UI
+        # توابعی که بعد از قطع خروجی‌ها (در ترد gpiozero) صدا زده می‌شوند؛ نباید مسدود کنند
+        self.listeners = []
+        self._lock = threading.Lock()
+
+        # تأخیر لبه تا callback و callback تا قطع کامل خروجی‌ها (ms)
+        self.edge_latency = LatencyStats()
+        self.cut_latency = LatencyStats()
+
+        for output in (pad, column, lissa, light):
+            if output is not None:
+                output.interlock = self.outputs_allowed
+
+        # Button «فعال» یعنی مدار به زمین بسته است
+        self.button = Button(pin, pull_up=pull_up, bounce_time=bounce_time)
+        if normally_closed:
+            self.button.when_released = self._on_press   # باز شدن مدار NC
+        else:
+            self.button.when_pressed = self._on_press
+
+        # اگر در لحظه راه‌اندازی کلید فشرده (یا سیم قطع) است، از ابتدا در حالت توقف باشیم
+        if self.is_pressed:
+            self._on_press()
+
+    @property
+    def is_pressed(self):
+        """کلید فشرده است یا (در NC) مدار قطع است"""
+        closed = self.button.is_pressed
+        return not closed if self.normally_closed else closed
+
+    def outputs_allowed(self):
+        """interlock مدل‌ها: در حالت توقف هیچ خروجی‌ای روشن نمی‌شود"""
+        return not self.tripped
+
+    def _on_press(self):
+        """در ترد gpiozero اجرا می‌شود"""
+        t_cb = time.perf_counter()
+
+        # زمان لبه از شمارنده ticks کارخانه پین (در صورت وجود)
+        factory = self.button.pin_factory
+        edge_ticks = getattr(self.button, "_last_changed", None)
+        if edge_ticks is not None:
+            self.edge_latency.add(factory.ticks_diff(factory.ticks(), edge_ticks) * 1000.0)
+
+        # اول قفل، بعد قطع: فرمانی که هم‌زمان برسد دیگر خروجی را روشن نمی‌کند
+        with self._lock:
+            self.tripped = True
+            self.trip_count += 1
+        self.cut_outputs()
+        self.cut_latency.add((time.perf_counter() - t_cb) * 1000.0)
+        self.trip_event.set()
+        for listener in self.listeners:
+            listener()
+
+    def cut_outputs(self):
+        """قطع همه خروجی‌ها؛ خطای یکی مانع قطع بقیه نمی‌شود"""
+        actions = []
+        if self.pad is not None: actions.append(("pad", self.pad.stop_rotation))
+        if self.column is not None: actions.append(("column", self.column.stop))
+        if self.lissa is not None: actions.append(("lissa", lambda: self.lissa.set_state(False)))
+        if self.light is not None: actions.append(("light", lambda: self.light.set_brightness(0)))
+        for name, action in actions:
+            try:
+                action()
+            except Exception as e:
+                print(f"[E-STOP] failed to cut {name}: {e}")
+
+    def reset(self):
+        """آزاد کردن قفل؛ فقط وقتی کلید رها شده باشد"""
+        if self.is_pressed:
+            return False
+        with self._lock:
+            self.tripped = False
+        self.trip_event.clear()
+        return True
+
+    def report(self):
+        return "\n".join([
+            f"E-STOP trips: {self.trip_count}",
+            self.edge_latency.format("  edge -> callback"),
+            self.cut_latency.format("  callback -> outputs cut"),
+        ])
+
+    def close(self):
+        self.button.close()
+
+
+def measure_latency(samples=200, load_threads=2):
+    """
+    سنجش تأخیر لبه تا قطع خروجی روی پین‌های شبیه‌سازی، هم‌زمان با بار سنگین
+    (شبیه بازترسیم UI) روی چند ترد دیگر.
+    """
+    from gpiozero import Device
+    from model.pad_model import PadModel
+    from model.column_model import ColumnModel
+    from model.lissa_model import LissaModel
+    from model.light_model import LightModel
+    from model.hw_process import _synthetic_ui_load
+
+    pad = PadModel(12, 13, 6)
+    column = ColumnModel(19, 5)
+    lissa = LissaModel(26)
+    light = LightModel(18)
+    estop = EStopModel(16, pad=pad, column=column, lissa=lissa, light=light)
+    pin = Device.pin_factory.pin(16)
+    # pull-up پین شبیه‌سازی را HIGH (مدار باز) می‌کند؛ کنتاکت NC را می‌بندیم و ریست می‌کنیم
+    pin.drive_low()
+    estop.reset()
+    estop.trip_count = 0
+
+    stop = threading.Event()
+    loaders = [threading.Thread(target=_synthetic_ui_load, args=(stop,), daemon=True) for _ in range(load_threads)]
+    for t in loaders:
+        t.start()
+    total = LatencyStats()
+    try:
+        for _ in range(samples):
+            pad.set_speed(50); light.set_brightness(80); lissa.set_state(True); column.move_up()
+            time.sleep(0.005)
+            t0 = time.perf_counter()
+            pin.drive_high()   # فشردن کلید: کنتاکت NC باز می‌شود
+            while not estop.tripped:
+                time.sleep(0)
+            total.add((time.perf_counter() - t0) * 1000.0)
+            pin.drive_low()
+            estop.reset()
+    finally:
+        stop.set()
+        for t in loaders:
+            t.join()
+        estop.close(); pad.close(); column.close(); lissa.close(); light.close()
+    return total, estop
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("GPIOZERO_PIN_FACTORY", "mock")
+    os.environ.setdefault("GPIOZERO_MOCK_PIN_CLASS", "mockpwmpin")
+    total, estop = measure_latency()
+    print(total.format("edge -> all outputs cut (under load)"))
+    print(estop.report())
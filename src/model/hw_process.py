@@ -0,0 +1,468 @@
+import multiprocessing as mp
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from utils.stats import LatencyStats
+
+# ==========================================
+# چیدمان ثابت بلوک‌های حافظه مشترک
+# ==========================================
+# بلوک فرمان (UI -> پروسه سخت‌افزار). فیلد اول seq است (seqlock: فرد یعنی در حال نوشتن)
+#   seq, pad_speed(%), pad_ccw, pad_stop_gen, brightness, lissa_on, column_cmd, sent_ns, ui_heartbeat_ns
+CONTROL_FMT = "<I f B I B B b Q Q"
+CONTROL_FIELDS = ("pad_speed", "pad_ccw", "pad_stop_gen", "brightness", "lissa_on", "column_cmd", "sent_ns",
+                  "ui_heartbeat_ns")
+
+# بلوک وضعیت (پروسه سخت‌افزار -> UI)
+#   seq, ack_seq, applied_ns, last_write_seq, last_write_ns, heartbeat_ns, pad_duty, safe_offs
+STATUS_FMT = "<I I Q I Q Q f I"
+STATUS_FIELDS = ("ack_seq", "applied_ns", "last_write_seq", "last_write_ns", "heartbeat_ns", "pad_duty",
+                 "safe_offs")
+
+COLUMN_STOP, COLUMN_UP, COLUMN_DOWN = 0, 1, -1
+
+
+class SeqBlock:
+    """
+    یک ساختار با چیدمان ثابت روی SharedMemory با محافظت seqlock.
+    فقط یک نویسنده (با قفل محلی) و هر تعداد خواننده بدون قفل.
+    """
+
+    def __init__(self, fmt, fields, name=None, create=False):
+        self.fmt = fmt
+        self.fields = fields
+        self.size = struct.calcsize(fmt)
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=self.size)
+        self.name = self.shm.name
+        self._seq = 0
+        self._lock = threading.Lock()
+        if create:
+            self.shm.buf[:self.size] = bytes(self.size)
+
+    def write(self, values):
+        """values: tuple به ترتیب fields"""
+        with self._lock:
+            self._seq += 1  # فرد: در حال نوشتن
+            struct.pack_into("<I", self.shm.buf, 0, self._seq)
+            struct.pack_into(self.fmt, self.shm.buf, 0, self._seq, *values)
+            self._seq += 1  # زوج: پایدار
+            struct.pack_into("<I", self.shm.buf, 0, self._seq)
+            return self._seq
+
+    def read(self, spins=100, timeout_s=0.05):
+        """
+        خواندن یک نسخه سازگار: (seq, dict)
+        اگر نویسنده وسط نوشتن از CPU کنار گذاشته شده باشد، بعد از spins دور با sleep(0)
+        CPU را رها می‌کنیم؛ نویسنده‌ای که مرده (seq فرد برای همیشه) بعد از timeout_s
+        TimeoutError می‌دهد.
+        """
+        deadline = None
+        attempt = 0
+        while True:
+            s1 = struct.unpack_from("<I", self.shm.buf, 0)[0]
+            if not s1 & 1:
+                raw = struct.unpack_from(self.fmt, self.shm.buf, 0)
+                s2 = struct.unpack_from("<I", self.shm.buf, 0)[0]
+                if s1 == s2 == raw[0]:
+                    return s1, dict(zip(self.fields, raw[1:]))
+            attempt += 1
+            if attempt >= spins:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + timeout_s
+                elif now > deadline:
+                    raise TimeoutError(f"seqlock {self.name}: writer stalled")
+                time.sleep(0)
+
+    def close(self, unlink=False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# ==========================================
+# پروسه سخت‌افزار
+# ==========================================
+
+def _worker_main(control_name, status_name, wake, stop, pins, ui_timeout_s=1.0):
+    """
+    حلقه پروسه کنترل: فرمان‌ها را از حافظه مشترک خوانده و به مدل‌ها اعمال می‌کند.
+    اگر ضربان UI بیشتر از ui_timeout_s کهنه شود (پروسه UI گیر کرده یا مرده) همه
+    خروجی‌ها خاموش می‌شوند و تا فرمان بعدی خاموش می‌مانند.
+    """
+    from model.pad_model import PadModel
+    from model.light_model import LightModel
+    from model.lissa_model import LissaModel
+    from model.column_model import ColumnModel
+    from model.shadow_pins import PIN_STATS
+
+    control = SeqBlock(CONTROL_FMT, CONTROL_FIELDS, name=control_name)
+    status = SeqBlock(STATUS_FMT, STATUS_FIELDS, name=status_name)
+
+    light = LightModel(pin_number=pins["light"])
+    lissa = LissaModel(pin_number=pins["lissa"])
+    pad = PadModel(pwm_pin=pins["pad_pwm"], cw_pin=pins["pad_cw"], ccw_pin=pins["pad_ccw"])
+    column = ColumnModel(en_pin=pins["col_en"], dir_pin=pins["col_dir"])
+
+    state = {"ack_seq": 0, "applied_ns": 0, "last_write_seq": 0, "last_write_ns": 0, "safe_offs": 0}
+    state_lock = threading.Lock()
+
+    def publish():
+        with state_lock:
+            status.write((state["ack_seq"], state["applied_ns"], state["last_write_seq"],
+                          state["last_write_ns"], time.monotonic_ns(), pad.ramp.duty, state["safe_offs"]))
+
+    def on_pin_write(_name):
+        # اولین تغییر واقعی پین پس از هر فرمان (برای سنجش تأخیر دکمه تا پین)
+        with state_lock:
+            if state["last_write_seq"] != state["ack_seq"]:
+                state["last_write_seq"] = state["ack_seq"]
+                state["last_write_ns"] = time.monotonic_ns()
+                changed = True
+            else:
+                changed = False
+        if changed:
+            publish()
+
+    PIN_STATS.listener = on_pin_write
+
+    last = {"pad_speed": 0.0, "pad_ccw": 0, "pad_stop_gen": 0, "brightness": 0, "lissa_on": 0, "column_cmd": 0}
+    seen = 0
+    last_sent_ns = 0
+    ui_heartbeat_ns = time.monotonic_ns()
+    ui_timeout_ns = int(ui_timeout_s * 1e9)
+    safe_off = False
+    try:
+        while not stop.is_set():
+            wake.wait(0.1)
+            wake.clear()
+            try:
+                seq, cmd = control.read()
+            except TimeoutError:
+                seq = seen   # نویسنده UI وسط نوشتن مانده؛ ضربان کهنه می‌شود
+            if seq != seen:
+                seen = seq
+                # ضربانی که قبل از راه‌اندازی پروسه نوشته شده نباید فوراً کهنه حساب شود
+                ui_heartbeat_ns = max(ui_heartbeat_ns, cmd["ui_heartbeat_ns"])
+                with state_lock:
+                    state["ack_seq"] = seq
+
+                if cmd["pad_stop_gen"] != last["pad_stop_gen"]:
+                    pad.stop_rotation()
+                if bool(cmd["pad_ccw"]) != bool(last["pad_ccw"]):
+                    pad.set_direction(bool(cmd["pad_ccw"]))
+                if cmd["pad_speed"] != last["pad_speed"]:
+                    pad.set_speed(cmd["pad_speed"])
+                if cmd["brightness"] != last["brightness"]:
+                    light.set_brightness(cmd["brightness"])
+                if cmd["lissa_on"] != last["lissa_on"]:
+                    lissa.set_state(bool(cmd["lissa_on"]))
+                if cmd["column_cmd"] != last["column_cmd"]:
+                    if cmd["column_cmd"] == COLUMN_UP: column.move_up()
+                    elif cmd["column_cmd"] == COLUMN_DOWN: column.move_down()
+                    else: column.stop()
+                last.update({k: cmd[k] for k in last})
+
+                if cmd["sent_ns"] != last_sent_ns:   # فرمان واقعی، نه فقط ضربان
+                    last_sent_ns = cmd["sent_ns"]
+                    with state_lock:
+                        state["applied_ns"] = time.monotonic_ns()
+
+            stale_ns = time.monotonic_ns() - ui_heartbeat_ns
+            if stale_ns <= ui_timeout_ns:
+                safe_off = False
+            elif not safe_off:
+                safe_off = True
+                print(f"[HW] UI heartbeat stale for {stale_ns / 1e6:.0f} ms -> all outputs off")
+                # هر خروجی جداگانه؛ خطای یکی نباید مانع خاموش شدن بقیه شود
+                for action in (pad.stop_rotation, column.stop, lambda: lissa.set_state(False),
+                               lambda: light.set_brightness(0)):
+                    try:
+                        action()
+                    except Exception as e:
+                        print(f"[HW] safe-off failed: {e}")
+                # فرمان‌های قبلی دوباره اعمال نشوند؛ فقط تغییر بعدی UI
+                last.update(pad_speed=0.0, brightness=0, lissa_on=0, column_cmd=COLUMN_STOP)
+                with state_lock:
+                    state["safe_offs"] += 1
+            publish()
+    finally:
+        PIN_STATS.listener = None
+        column.close()
+        pad.close()
+        light.close()
+        lissa.close()
+        control.close()
+        status.close()
+
+
+# ==========================================
+# سمت UI
+# ==========================================
+
+class HardwareProcess:
+    """
+    راه‌اندازی پروسه کنترل سخت‌افزار و ارسال فرمان از طریق حافظه مشترک.
+    پراکسی‌های pad/light/lissa/column همان API مدل‌ها را دارند تا Presenter ها تغییری نکنند.
+    UI باید heartbeat() را دوره‌ای صدا بزند (هر send هم ضربان حساب می‌شود)؛ در غیر این
+    صورت پروسه سخت‌افزار پس از ui_timeout_s همه خروجی‌ها را خاموش می‌کند.
+    """
+
+    def __init__(self, pins, start=True, ui_timeout_s=1.0):
+        """
+        :param pins: دیکشنری light, lissa, pad_pwm, pad_cw, pad_ccw, col_en, col_dir
+        :param ui_timeout_s: حداکثر عمر ضربان UI پیش از خاموش کردن خروجی‌ها در پروسه سخت‌افزار
+        """
+        self.pins = dict(pins)
+        self.ui_timeout_s = ui_timeout_s
+        self.control = SeqBlock(CONTROL_FMT, CONTROL_FIELDS, create=True)
+        self.status = SeqBlock(STATUS_FMT, STATUS_FIELDS, create=True)
+
+        self._ctx = mp.get_context("spawn")  # پروسه تمیز، بدون کپی Tk
+        self._wake = self._ctx.Event()
+        self._stop = self._ctx.Event()
+        self._proc = None
+
+        self._cmd = {"pad_speed": 0.0, "pad_ccw": 0, "pad_stop_gen": 0, "brightness": 0,
+                     "lissa_on": 0, "column_cmd": COLUMN_STOP, "sent_ns": 0, "ui_heartbeat_ns": 0}
+        self._cmd_lock = threading.Lock()
+        self.last_sent_ns = 0
+        self.latency = LatencyStats()
+        self.safe_offs = 0
+        # توابعی که بعد از خاموشی خودکار پروسه سخت‌افزار در ترد UI صدا زده می‌شوند
+        self.listeners = []
+
+        self.pad = PadProxy(self)
+        self.light = LightProxy(self)
+        self.lissa = LissaProxy(self)
+        self.column = ColumnProxy(self)
+
+        if start:
+            self.start()
+
+    def start(self, timeout=10.0):
+        self.heartbeat()
+        self._proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self.control.name, self.status.name, self._wake, self._stop, self.pins, self.ui_timeout_s),
+            name="polisher-hw", daemon=True,
+        )
+        self._proc.start()
+        # انتظار برای اولین ضربان (پروسه آماده است)
+        deadline = time.monotonic() + timeout
+        while self.read_status()["heartbeat_ns"] == 0:
+            if not self._proc.is_alive():
+                raise RuntimeError("hardware process exited during startup")
+            if time.monotonic() > deadline:
+                raise RuntimeError("hardware process did not start")
+            time.sleep(0.01)
+        print(f" Hardware process started (pid={self._proc.pid})")
+
+    def send(self, **changes):
+        """به‌روزرسانی فیلدها و بیدار کردن پروسه؛ seq فرمان را برمی‌گرداند"""
+        with self._cmd_lock:
+            self._cmd.update(changes)
+            self._cmd["sent_ns"] = self._cmd["ui_heartbeat_ns"] = self.last_sent_ns = time.monotonic_ns()
+            seq = self.control.write(tuple(self._cmd[f] for f in CONTROL_FIELDS))
+        self._wake.set()
+        return seq
+
+    def heartbeat(self):
+        """ضربان UI (از ترد Tk)؛ اگر پروسه در این فاصله خروجی‌ها را خاموش کرده، پراکسی‌ها هم‌گام می‌شوند"""
+        with self._cmd_lock:
+            self._cmd["ui_heartbeat_ns"] = time.monotonic_ns()
+            self.control.write(tuple(self._cmd[f] for f in CONTROL_FIELDS))
+        if self._proc is None:
+            return
+        safe_offs = self.read_status()["safe_offs"]
+        if safe_offs != self.safe_offs:
+            self.safe_offs = safe_offs
+            self._after_safe_off()
+
+    def _after_safe_off(self):
+        """بلوک فرمان و پراکسی‌ها وضعیت واقعی (خاموش) را نشان دهند تا چیزی دوباره روشن نشود"""
+        print("[HW] Outputs were switched off by the hardware process (stale UI heartbeat)")
+        self.pad.current_speed = 0
+        self.light.current_brightness = 0
+        self.lissa.is_on = False
+        self.column.direction = 0
+        self.column.moving_since = None
+        self.send(pad_speed=0.0, brightness=0, lissa_on=0, column_cmd=COLUMN_STOP)
+        for listener in self.listeners:
+            listener()
+
+    def read_status(self):
+        return self.status.read()[1]
+
+    def wait_ack(self, seq, timeout=1.0):
+        """انتظار تا پروسه فرمان seq را اعمال کند"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            st = self.read_status()
+            if st["ack_seq"] >= seq and st["applied_ns"]:
+                return st
+            time.sleep(0.0005)
+        return None
+
+    def is_alive(self):
+        return self._proc is not None and self._proc.is_alive()
+
+    def close(self):
+        if self._proc is not None:
+            self._stop.set()
+            self._wake.set()
+            self._proc.join(timeout=3.0)
+            if self._proc.is_alive():
+                self._proc.terminate()
+            self._proc = None
+        self.control.close(unlink=True)
+        self.status.close(unlink=True)
+
+
+class PadProxy:
+    def __init__(self, hw):
+        self.hw = hw
+        self.current_speed = 0
+        self.is_ccw = False
+        self._stop_gen = 0
+        self.interlock = None
+
+    def set_speed(self, percent):
+        if percent < 0: percent = 0
+        if percent > 100: percent = 100
+        if percent > 0 and self.interlock and not self.interlock():
+            return
+        self.current_speed = percent
+        self.hw.send(pad_speed=float(percent))
+
+    def set_direction(self, ccw: bool):
+        self.is_ccw = ccw
+        self.hw.send(pad_ccw=int(bool(ccw)))
+
+    def stop_rotation(self):
+        self.current_speed = 0
+        self._stop_gen += 1
+        self.hw.send(pad_speed=0.0, pad_stop_gen=self._stop_gen)
+
+    def close(self):
+        pass
+
+
+class LightProxy:
+    def __init__(self, hw):
+        self.hw = hw
+        self.current_brightness = 0
+        self.interlock = None
+
+    def set_brightness(self, brightness):
+        brightness = max(0, min(100, int(brightness)))
+        if brightness > 0 and self.interlock and not self.interlock():
+            return
+        self.current_brightness = brightness
+        self.hw.send(brightness=brightness)
+
+    def close(self):
+        pass
+
+
+class LissaProxy:
+    def __init__(self, hw):
+        self.hw = hw
+        self.is_on = False
+        self.interlock = None
+
+    def set_state(self, is_on: bool):
+        if is_on and self.interlock and not self.interlock():
+            return
+        self.is_on = bool(is_on)
+        self.hw.send(lissa_on=int(self.is_on))
+
+    def close(self):
+        pass
+
+
+class ColumnProxy:
+    def __init__(self, hw):
+        self.hw = hw
+        self.moving_since = None
+        self.direction = 0
+        self.interlock = None
+
+    def move_up(self):
+        if self.interlock and not self.interlock():
+            return
+        self.hw.send(column_cmd=COLUMN_UP)
+        self.direction = 1
+        if self.moving_since is None: self.moving_since = time.monotonic()
+
+    def move_down(self):
+        if self.interlock and not self.interlock():
+            return
+        self.hw.send(column_cmd=COLUMN_DOWN)
+        self.direction = -1
+        if self.moving_since is None: self.moving_since = time.monotonic()
+
+    def stop(self):
+        self.hw.send(column_cmd=COLUMN_STOP)
+        self.direction = 0
+        self.moving_since = None
+
+    def close(self):
+        pass
+
+
+# ==========================================
+# سنجش تأخیر دکمه تا پین تحت بار UI
+# ==========================================
+
+def _synthetic_ui_load(stop, busy_ms=30):
+    """شبیه‌سازی بار UI: محاسبه سنگین پیوسته + زباله برای GC"""
+    while not stop.is_set():
+        t_end = time.perf_counter() + busy_ms / 1000.0
+        junk = []
+        while time.perf_counter() < t_end:
+            junk.append([0] * 64)
+        del junk
+
+
+def measure_latency(pins, samples=100, load_threads=2):
+    """
+    تأخیر از لحظه فشردن دکمه (ارسال فرمان) تا اولین تغییر پین در پروسه سخت‌افزار.
+    هم‌زمان چند ترد بار مصنوعی روی پروسه UI اجرا می‌شود.
+    """
+    hw = HardwareProcess(pins)
+    stop = threading.Event()
+    loaders = [threading.Thread(target=_synthetic_ui_load, args=(stop,), daemon=True) for _ in range(load_threads)]
+    for t in loaders:
+        t.start()
+    try:
+        for i in range(samples):
+            # تناوب بین دو فرمان که حتماً پین را تغییر می‌دهند
+            seq = hw.send(brightness=50 if i % 2 == 0 else 0)
+            sent_ns = hw.last_sent_ns
+            deadline = time.monotonic() + 1.0
+            while time.monotonic() < deadline:
+                st = hw.read_status()
+                if st["last_write_seq"] >= seq:
+                    hw.latency.add((st["last_write_ns"] - sent_ns) / 1e6)
+                    break
+                time.sleep(0.0002)
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        for t in loaders:
+            t.join()
+        hw.close()
+    return hw.latency
+
+
+if __name__ == "__main__":
+    import os
+    # بدون سخت‌افزار: پین‌های شبیه‌سازی gpiozero (در پروسه فرزند هم به ارث می‌رسد)
+    os.environ.setdefault("GPIOZERO_PIN_FACTORY", "mock")
+    os.environ.setdefault("GPIOZERO_MOCK_PIN_CLASS", "mockpwmpin")
+    default_pins = {"light": 18, "lissa": 26, "pad_pwm": 12, "pad_cw": 13, "pad_ccw": 6, "col_en": 19, "col_dir": 5}
+    stats = measure_latency(default_pins)
+    print(stats.format("button -> pin latency (under UI load)"))
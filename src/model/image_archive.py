@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from PIL import Image
+
+from utils.stats import LatencyStats
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    thumb TEXT NOT NULL,
+    width INTEGER, height INTEGER, bytes INTEGER, created REAL
+);
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    hash TEXT NOT NULL REFERENCES images(hash),
+    t REAL NOT NULL,
+    run TEXT, recipe TEXT, verdict TEXT, focus REAL, meta TEXT
+);
+CREATE INDEX IF NOT EXISTS captures_run ON captures(run);
+CREATE INDEX IF NOT EXISTS captures_hash ON captures(hash);
+"""
+
+# پسوند فایل برای هر فرمت Pillow
+EXTENSIONS = {"PNG": ".png", "WEBP": ".webp"}
+
+
+class ImageArchive:
+    """
+    بایگانی تصاویر سطح فیبر روی دیسک محلی.
+    submit هرگز UI را معطل نمی‌کند: فریم خام در صف محدود گذاشته می‌شود (اگر پر
+    باشد رد می‌شود) و ترد پس‌زمینه آن را هش می‌کند، تصویر تکراری را فقط به
+    اجرای جدید پیوند می‌دهد، و در غیر این صورت تصویر کامل (PNG/WebP) و تصویر
+    کوچک را با نام هش محتوا می‌نویسد و در نمایه SQLite ثبت می‌کند.
+    خواندن‌های UI (صفحه نمایه و تصاویر کوچک) هم با read در یک ترد خواننده جدا
+    اجرا می‌شوند تا I/O کارت SD نه حلقه Tk را معطل کند و نه پشت کدگذاری بماند.
+    """
+
+    def __init__(self, root, fmt="PNG", thumb_size=(160, 120), queue_size=8):
+        """
+        :param fmt: 'PNG' (بدون اتلاف) یا 'WEBP' (lossless، فایل کوچک‌تر و کندتر)
+        :param queue_size: حداکثر فریم در انتظار؛ بیشتر از آن رد می‌شود
+        """
+        self.root = root
+        self.fmt = fmt.upper()
+        if self.fmt not in EXTENSIONS:
+            raise ValueError(f"unsupported archive format {fmt!r} (use one of {', '.join(EXTENSIONS)})")
+        self.thumb_size = thumb_size
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "thumbs"), exist_ok=True)
+        self.db_path = os.path.join(root, "index.sqlite3")
+
+        db = sqlite3.connect(self.db_path)
+        db.execute("PRAGMA journal_mode=WAL")  # خواندن UI هم‌زمان با نوشتن کارگر
+        db.executescript(SCHEMA)
+        # تعداد کل ثبت‌ها یک بار خوانده و بعد در ترد کارگر نگه داشته می‌شود
+        self.total = db.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+        db.close()
+        self._local = threading.local()
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._reads = queue.Queue()
+        # توابع (row) پس از ثبت هر تصویر، در ترد کارگر
+        self.listeners = []
+
+        # آمار
+        self.submitted = 0
+        self.rejected = 0       # صف پر بود
+        self.stored = 0
+        self.deduplicated = 0
+        self.failures = 0
+        self.bytes_written = 0
+        self.encode_ms = LatencyStats(maxlen=500)
+        self.lookup_ms = LatencyStats(maxlen=500)
+
+        self._thread = threading.Thread(target=self._run, name="image-archive", daemon=True)
+        self._thread.start()
+        self._reader = threading.Thread(target=self._run_reads, name="image-archive-read", daemon=True)
+        self._reader.start()
+
+    # ---------- اتصال پایگاه داده (یکی برای هر ترد) ----------
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.db_path)
+            db.row_factory = sqlite3.Row
+        return db
+
+    # ---------- سمت UI ----------
+
+    def submit(self, data, size, **meta):
+        """
+        ثبت یک فریم RGB خام (bytes) با ابعاد size؛ بلافاصله برمی‌گردد.
+        meta: run, recipe, verdict, focus و هر کلید دیگر (به صورت JSON ذخیره می‌شود)
+        """
+        self.submitted += 1
+        try:
+            self._queue.put_nowait((bytes(data), tuple(size), time.time(), meta))
+        except queue.Full:
+            self.rejected += 1
+            return False
+        return True
+
+    def read(self, func, *args, on_done=None):
+        """
+        اجرای func(*args) در ترد خواننده (پرس‌وجوی نمایه، باز کردن تصویر کوچک)؛ بلافاصله برمی‌گردد.
+        :param on_done: تابع (result) در ترد خواننده؛ برای UI باید از dispatcher عبور کند
+        """
+        self._reads.put((func, args, on_done))
+
+    def page(self, before_id=None, limit=12):
+        """
+        یک صفحه از ثبت‌ها، جدیدترین اول (فقط نمایه؛ هیچ تصویری خوانده نمی‌شود).
+        صفحه‌بندی با کلید (id < before_id) تا هزینه صفحه‌های قدیمی مثل صفحه اول بماند.
+        """
+        t0 = time.perf_counter()
+        rows = self._db().execute(
+            "SELECT c.id, c.hash, c.t, c.run, c.recipe, c.verdict, c.focus, c.meta, i.path, i.thumb "
+            "FROM captures c JOIN images i ON i.hash = c.hash WHERE c.id < ? ORDER BY c.id DESC LIMIT ?",
+            (before_id if before_id is not None else 2 ** 63 - 1, limit),
+        ).fetchall()
+        self.lookup_ms.add((time.perf_counter() - t0) * 1000.0)
+        return [dict(r) for r in rows]
+
+    def lookup(self, digest):
+        row = self._db().execute("SELECT * FROM images WHERE hash = ?", (digest,)).fetchone()
+        return dict(row) if row else None
+
+    def run_captures(self, run):
+        rows = self._db().execute("SELECT * FROM captures WHERE run = ? ORDER BY id", (run,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def abspath(self, relpath):
+        return os.path.join(self.root, relpath)
+
+    def load_thumb(self, relpath):
+        """باز کردن و دکد کامل یک تصویر کوچک (برای ترد خواننده)"""
+        with Image.open(self.abspath(relpath)) as im:
+            im.load()
+            return im.copy()
+
+    def flush(self, timeout=5.0):
+        """انتظار تا پردازش همه فریم‌های صف"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._reads.put(None)
+        self._thread.join(timeout=2.0)
+        self._reader.join(timeout=2.0)
+
+    # ---------- ترد کارگر ----------
+
+    def _run(self):
+        db = self._db()
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                row = self._store(db, *item)
+            except Exception as e:
+                # هر خطایی (مثلاً meta غیر JSON) فقط همین فریم را رد می‌کند، نه ترد کارگر را؛
+                # ردیف images نیمه‌کاره همراه تراکنش برمی‌گردد
+                db.rollback()
+                self.failures += 1
+                print(f"[ARCHIVE] store failed: {type(e).__name__}: {e}")
+                continue
+            finally:
+                self._queue.task_done()
+            self.total += 1
+            for listener in self.listeners:
+                try:
+                    listener(row)
+                except Exception as e:
+                    print(f"[ARCHIVE] listener failed: {type(e).__name__}: {e}")
+
+    def _run_reads(self):
+        while True:
+            item = self._reads.get()
+            if item is None:
+                return
+            func, args, on_done = item
+            try:
+                result = func(*args)
+            except Exception as e:
+                print(f"[ARCHIVE] read failed: {type(e).__name__}: {e}")
+                continue
+            if on_done:
+                on_done(result)
+
+    def _store(self, db, data, size, t, meta):
+        digest = hashlib.blake2b(data + repr(size).encode(), digest_size=16).hexdigest()
+        image = db.execute("SELECT path, thumb FROM images WHERE hash = ?", (digest,)).fetchone()
+        written = 0
+        if image is not None:
+            path, thumb = image
+        else:
+            t0 = time.perf_counter()
+            im = Image.frombytes("RGB", size, data)
+            sub = digest[:2]
+            path = os.path.join("objects", sub, digest + EXTENSIONS[self.fmt])
+            thumb = os.path.join("thumbs", sub, digest + ".jpg")
+            options = {"lossless": True, "method": 0} if self.fmt == "WEBP" else {"compress_level": 1}
+            written = self._write(path, im, self.fmt, **options)
+            small = im.copy()
+            small.thumbnail(self.thumb_size, Image.BILINEAR)
+            written += self._write(thumb, small, "JPEG", quality=80)
+            self.encode_ms.add((time.perf_counter() - t0) * 1000.0)
+            db.execute("INSERT INTO images VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       (digest, path, thumb, size[0], size[1], written, t))
+
+        extra = {k: v for k, v in meta.items() if k not in ("run", "recipe", "verdict", "focus")}
+        cur = db.execute(
+            "INSERT INTO captures (hash, t, run, recipe, verdict, focus, meta) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (digest, t, meta.get("run"), meta.get("recipe"), meta.get("verdict"), meta.get("focus"),
+             json.dumps(extra) if extra else None),
+        )
+        db.commit()
+        # آمار فقط بعد از commit (ثبت ناموفق برگشت داده می‌شود و شمرده نمی‌شود)
+        if image is not None:
+            self.deduplicated += 1
+        else:
+            self.stored += 1
+            self.bytes_written += written
+        return {"id": cur.lastrowid, "hash": digest, "t": t, "path": path, "thumb": thumb, **meta}
+
+    def _write(self, relpath, im, fmt, **options):
+        """نوشتن اتمیک (فایل موقت + rename)؛ اندازه فایل را برمی‌گرداند"""
+        full = self.abspath(relpath)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        tmp = full + ".tmp"
+        im.save(tmp, fmt, **options)
+        os.replace(tmp, full)
+        return os.path.getsize(full)
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "failures": self.failures,
+            "bytes_written": self.bytes_written,
+            "encode": self.encode_ms.summary(),
+            "lookup": self.lookup_ms.summary(),
+        }
+
+    def report(self):
+        return (f"Image archive: {self.submitted} submitted, {self.stored} stored, "
+                f"{self.deduplicated} duplicates, {self.rejected} rejected (queue full), "
+                f"{self.failures} failures, {self.bytes_written / 1e6:.1f} MB\n"
+                + self.encode_ms.format("  encode") + "\n" + self.lookup_ms.format("  page lookup"))
+
+
+# ==========================================
+# سنجش
+# ==========================================
+
+def benchmark(frames=30, size=(640, 480), index_rows=20000):
+    """توان کدگذاری PNG/WebP، اثر حذف تکراری‌ها و زمان جستجوی نمایه بزرگ"""
+    import random
+    import shutil
+    import tempfile
+    import numpy as np
+    from .inspection import synthetic_endface
+
+    images = [synthetic_endface(size, np.random.default_rng(i), scratches=i % 3).tobytes() for i in range(frames // 2)]
+    workload = images + images[: frames - len(images)]  # نیمی تکراری
+    tmp = tempfile.mkdtemp(prefix="archive-bench-")
+    try:
+        for fmt in ("PNG", "WEBP"):
+            archive = ImageArchive(os.path.join(tmp, fmt), fmt=fmt, queue_size=len(workload))
+            t0 = time.perf_counter()
+            for i, data in enumerate(workload):
+                archive.submit(data, size, run=f"bench-{i % 5}", verdict="PASS")
+            archive.flush(timeout=120.0)
+            elapsed = time.perf_counter() - t0
+            print(f"{fmt}: {len(workload) / elapsed:.1f} frames/s ({archive.stored} encoded, "
+                  f"{archive.deduplicated} deduplicated), {archive.bytes_written / max(1, archive.stored) / 1e3:.0f} kB/image")
+            print(archive.encode_ms.format(f"  {fmt} encode + thumbnail"))
+            archive.close()
+
+        # نمایه بزرگ: درج مستقیم ردیف‌ها و سنجش صفحه‌بندی و جستجوی هش
+        archive = ImageArchive(os.path.join(tmp, "index"))
+        db = archive._db()
+        hashes = [f"{i:032x}" for i in range(index_rows)]
+        db.executemany("INSERT INTO images VALUES (?, ?, ?, 640, 480, 0, 0)",
+                       [(h, f"objects/{h}.png", f"thumbs/{h}.jpg") for h in hashes])
+        db.executemany("INSERT INTO captures (hash, t, run) VALUES (?, ?, ?)",
+                       [(h, float(i), f"run-{i // 10}") for i, h in enumerate(hashes)])
+        db.commit()
+        archive.lookup_ms.reset()
+        hash_ms = LatencyStats()
+        for _ in range(200):
+            archive.page(before_id=random.randrange(12, index_rows), limit=12)
+            t0 = time.perf_counter()
+            archive.lookup(random.choice(hashes))
+            hash_ms.add((time.perf_counter() - t0) * 1000.0)
+        print(archive.lookup_ms.format(f"page of 12 ({index_rows} rows)"))
+        print(hash_ms.format("hash lookup"))
+        archive.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    benchmark()
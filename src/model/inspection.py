@@ -0,0 +1,378 @@
+import multiprocessing as mp
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.stats import LatencyStats
+
+# قطر غلاف فیبر تک‌حالته (مقیاس um/px از شعاع غلاف یافته شده به دست می‌آید)
+CLADDING_UM = 125.0
+
+# نواحی بازرسی (شعاع، um) به سبک IEC 61300-3-35 برای فیبر SM
+ZONES = (
+    ("A", 0.0, 12.5),      # هسته
+    ("B", 12.5, 57.5),     # غلاف
+    ("C", 57.5, 67.5),     # چسب
+    ("D", 67.5, 125.0),    # ناحیه تماس
+)
+DEFECT_CLASSES = ("scratch", "pit", "contamination")
+
+# حداکثر مساحت مجاز عیب (um²) در هر ناحیه؛ None یعنی بدون محدودیت
+ZONE_LIMITS = {
+    "A": {"scratch": 0.0, "pit": 0.0, "contamination": 0.0},
+    "B": {"scratch": 10.0, "pit": 5.0, "contamination": 5.0},
+    "C": {"scratch": None, "pit": None, "contamination": None},
+    "D": {"scratch": None, "pit": None, "contamination": 200.0},
+}
+
+OVERLAY_CELL = 16   # اندازه خانه‌های شبکه نشانگر عیب روی تصویر (px)
+MAX_CELLS = 300
+
+
+# ==========================================
+# عملگرهای برداری
+# ==========================================
+
+def to_gray(rgb):
+    """RGB uint8 (H, W, 3) -> float32 (H, W)"""
+    return rgb.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def box_mean(img, k):
+    """میانگین پنجره k×k (k فرد) با تصویر انتگرالی؛ هزینه مستقل از k"""
+    r = k // 2
+    p = np.pad(img.astype(np.float64, copy=False), ((r + 1, r), (r + 1, r)), mode="edge")
+    ii = p.cumsum(0).cumsum(1)
+    s = ii[k:, k:] - ii[:-k, k:] - ii[k:, :-k] + ii[:-k, :-k]
+    return s / (k * k)
+
+
+def focus_score(gray):
+    """واریانس لاپلاسین (بزرگ‌تر = تیزتر)"""
+    lap = (4.0 * gray[1:-1, 1:-1] - gray[:-2, 1:-1] - gray[2:, 1:-1]
+           - gray[1:-1, :-2] - gray[1:-1, 2:])
+    return float(lap.var())
+
+
+def otsu_threshold(values):
+    """آستانه Otsu روی مقادیر 0..255"""
+    hist = np.bincount(np.clip(values, 0, 255).astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    total = hist.sum()
+    if total == 0:
+        return 128.0
+    levels = np.arange(256)
+    w0 = hist.cumsum()
+    m0 = (hist * levels).cumsum()
+    w1 = total - w0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        between = (m0[-1] * w0 - m0 * total) ** 2 / (w0 * w1)
+    between[~np.isfinite(between)] = 0.0
+    return float(np.argmax(between))
+
+
+def _disc(mask):
+    """مرکز و شعاع معادل (از مساحت) یک ماسک؛ None اگر خالی باشد"""
+    area = int(mask.sum())
+    if area < 20:
+        return None
+    ys, xs = np.nonzero(mask)
+    return float(xs.mean()), float(ys.mean()), float(np.sqrt(area / np.pi))
+
+
+def locate_fiber(gray):
+    """
+    یافتن غلاف (روشن در برابر زمینه) و هسته (روشن‌تر داخل غلاف).
+    خروجی: dict با cx, cy, r_clad, core_cx, core_cy, r_core یا None
+    """
+    clad = _disc(gray > otsu_threshold(gray))
+    if clad is None:
+        return None
+    cx, cy, r_clad = clad
+    h, w = gray.shape
+    yy, xx = np.ogrid[:h, :w]
+    inner = (xx - cx) ** 2 + (yy - cy) ** 2 < (0.2 * r_clad) ** 2
+    core = _disc(inner & (gray > otsu_threshold(gray[inner])))
+    if core is None or core[2] > 0.15 * r_clad:
+        core = (cx, cy, 0.0)
+    return {"cx": cx, "cy": cy, "r_clad": r_clad, "core_cx": core[0], "core_cy": core[1], "r_core": core[2]}
+
+
+def classify_defects(residual, valid, threshold):
+    """
+    ماسک‌های عیب از انحراف نسبت به پروفایل شعاعی:
+    خراش = نقاط تیره باریک، حفره = لکه تیره فشرده، آلودگی = ذره روشن یا لکه تیره بزرگ
+    """
+    dark = (residual < -threshold) & valid
+    bright = (residual > threshold) & valid
+    dense_small = box_mean(dark, 5) >= 0.6
+    dense_large = box_mean(dark | bright, 15) >= 0.5
+    contamination = bright | (dark & dense_large)
+    pit = dark & ~contamination & (box_mean(dense_small, 5) > 0)
+    scratch = dark & ~contamination & ~pit
+    return {"scratch": scratch, "pit": pit, "contamination": contamination}
+
+
+def defect_cells(masks, cell=OVERLAY_CELL, limit=MAX_CELLS):
+    """خانه‌های شبکه که عیب دارند (برای نمایش): لیست (x, y, cell, class)"""
+    cells = []
+    for cls in DEFECT_CLASSES:  # آلودگی آخر؛ روی بقیه نمایش داده می‌شود
+        m = masks[cls]
+        h, w = (m.shape[0] // cell) * cell, (m.shape[1] // cell) * cell
+        hit = m[:h, :w].reshape(h // cell, cell, w // cell, cell).any(axis=(1, 3))
+        for gy, gx in zip(*np.nonzero(hit)):
+            cells.append((int(gx) * cell, int(gy) * cell, cell, cls))
+    return cells[-limit:]
+
+
+def analyze(rgb, zone_limits=ZONE_LIMITS):
+    """
+    بازرسی کامل یک فریم RGB (H, W, 3): امتیاز فوکوس، دایره هسته/غلاف،
+    مساحت عیب به تفکیک ناحیه و نوع، و نتیجه قبول/رد.
+    """
+    t0 = time.perf_counter()
+    gray = to_gray(rgb)
+    result = {"focus": focus_score(gray), "found": False, "passed": False, "failures": [], "cells": []}
+    fiber = locate_fiber(gray)
+    if fiber is None:
+        result["failures"].append("no fiber")
+        result["ms"] = (time.perf_counter() - t0) * 1000.0
+        return result
+
+    cx, cy, r_clad = fiber["cx"], fiber["cy"], fiber["r_clad"]
+    um_per_px = (CLADDING_UM / 2.0) / r_clad
+    h, w = gray.shape
+    yy, xx = np.ogrid[:h, :w]
+    d = np.sqrt((xx - cx) ** 2 + (yy - cy) ** 2)
+
+    # زمینه = میانگین هر حلقه شعاعی؛ لبه‌های دایره‌ای خود به خود حذف می‌شوند
+    ring = d.astype(np.int32)
+    counts = np.bincount(ring.ravel())
+    profile = np.bincount(ring.ravel(), weights=gray.ravel()) / np.maximum(counts, 1)
+    residual = gray - profile[ring]
+
+    radius_um = d * um_per_px
+    valid = radius_um < ZONES[-1][2]
+    # نوار باریک روی لبه هسته و غلاف (خطای زیرپیکسلی مرکز)
+    valid &= np.abs(d - r_clad) > 2.0
+    if fiber["r_core"]:
+        valid &= np.abs(d - fiber["r_core"]) > 2.0
+    sigma = 1.4826 * float(np.median(np.abs(residual[valid]))) if valid.any() else 0.0
+    threshold = max(12.0, 5.0 * sigma)
+    masks = classify_defects(residual, valid, threshold)
+
+    edges = np.array([z[2] for z in ZONES[:-1]])
+    zone_idx = np.digitize(radius_um, edges)
+    px_area = um_per_px ** 2
+    zones = {}
+    for cls, mask in masks.items():
+        areas = np.bincount(zone_idx[mask], minlength=len(ZONES)) * px_area
+        for (name, _, _), area in zip(ZONES, areas):
+            zones.setdefault(name, {})[cls] = float(area)
+            limit = zone_limits.get(name, {}).get(cls)
+            if limit is not None and area > limit:
+                result["failures"].append(f"{name}: {cls} {area:.0f} um²")
+
+    result.update(
+        found=True,
+        passed=not result["failures"],
+        um_per_px=um_per_px,
+        zones=zones,
+        cells=defect_cells(masks),
+        concentricity_um=float(np.hypot(fiber["core_cx"] - cx, fiber["core_cy"] - cy) * um_per_px),
+        **fiber,
+    )
+    result["ms"] = (time.perf_counter() - t0) * 1000.0
+    return result
+
+
+# ==========================================
+# اجرای موازی در پروسه‌های جداگانه
+# ==========================================
+
+_RING = None
+
+
+def _worker_init(ring_name):
+    """هر پروسه کارگر یک بار به حلقه فریم دوربین متصل می‌شود"""
+    global _RING
+    from model.camera import FrameRing
+    _RING = FrameRing.attach(ring_name)
+
+
+def _inspect_frame(frame_id):
+    """خواندن فریم از حافظه مشترک (بدون pickle تصویر) و بازرسی آن؛ None اگر فریم بازنویسی شده باشد"""
+    got = _RING.read_copy(frame_id)
+    if got is None:
+        return None
+    _, data, _ = got
+    rgb = np.frombuffer(data, dtype=np.uint8).reshape(_RING.height, _RING.width, 3)
+    result = analyze(rgb)
+    result["frame_id"] = frame_id
+    return result
+
+
+class InspectionService:
+    """
+    بازرسی فریم‌های دوربین در یک استخر پروسه.
+    فقط شماره فریم ارسال می‌شود و کارگرها تصویر را خودشان از حلقه مشترک می‌خوانند.
+    حداکثر یک کار در حال اجرا برای هر کارگر: اگر همه مشغول باشند درخواست رد می‌شود
+    تا صف هیچ‌وقت رشد نکند. نتیجه‌ها در ترد استخر به listeners داده می‌شوند.
+    """
+
+    def __init__(self, ring_name, workers=1):
+        self.workers = workers
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp.get_context("spawn"),
+            initializer=_worker_init, initargs=(ring_name,),
+        )
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._submitted_at = {}
+        # توابع (result) در ترد استخر
+        self.listeners = []
+
+        self.submitted = 0
+        self.completed = 0
+        self.skipped = 0     # همه کارگرها مشغول بودند
+        self.stale = 0       # فریم قبل از خواندن بازنویسی شد
+        self.passed = 0
+        self.analysis = LatencyStats(maxlen=500)    # زمان محاسبه در کارگر
+        self.roundtrip = LatencyStats(maxlen=500)   # ارسال تا دریافت نتیجه
+
+    @property
+    def busy(self):
+        return self._inflight >= self.workers
+
+    def submit(self, frame_id):
+        with self._lock:
+            if self._inflight >= self.workers:
+                self.skipped += 1
+                return False
+            self._inflight += 1
+            self.submitted += 1
+        t0 = time.perf_counter()
+        future = self._pool.submit(_inspect_frame, frame_id)
+        future.add_done_callback(lambda f: self._on_done(f, t0))
+        return True
+
+    def _on_done(self, future, t0):
+        with self._lock:
+            self._inflight -= 1
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"[INSPECT] worker failed: {e}")
+            return
+        if result is None:
+            self.stale += 1
+            return
+        self.completed += 1
+        self.passed += bool(result["passed"])
+        self.analysis.add(result["ms"])
+        self.roundtrip.add((time.perf_counter() - t0) * 1000.0)
+        for listener in self.listeners:
+            listener(result)
+
+    def close(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "stale": self.stale,
+            "passed": self.passed,
+            "analysis": self.analysis.summary(),
+            "roundtrip": self.roundtrip.summary(),
+        }
+
+    def report(self):
+        return (f"Inspection: {self.completed} frames ({self.passed} pass), "
+                f"{self.skipped} skipped (busy), {self.stale} stale\n"
+                + self.analysis.format("  analysis") + "\n"
+                + self.roundtrip.format("  round trip"))
+
+
+# ==========================================
+# تصاویر مصنوعی و سنجش
+# ==========================================
+
+def synthetic_endface(size=(640, 480), rng=None, scratches=0, pits=0, particles=0, blur=0, noise=3.0):
+    """
+    تصویر مصنوعی سطح فیبر (RGB uint8) با عیوب قرار داده شده در ناحیه B.
+    blur: تعداد گذر میانگین 3×3 (شبیه خارج از فوکوس)
+    """
+    rng = rng or np.random.default_rng(0)
+    w, h = size
+    cx, cy = w / 2.0 + rng.uniform(-10, 10), h / 2.0 + rng.uniform(-10, 10)
+    r_clad = min(w, h) * 0.35
+    r_core = r_clad * 0.07
+    yy, xx = np.mgrid[:h, :w].astype(np.float32)
+    d = np.sqrt((xx - cx) ** 2 + (yy - cy) ** 2)
+    img = np.full((h, w), 10.0, dtype=np.float32)
+    img[d < r_clad] = 110.0
+    img[d < r_core] = 220.0
+
+    r_b = r_clad * np.array([0.3, 0.85])  # بازه شعاعی ناحیه B
+    for _ in range(scratches):
+        a, r0 = rng.uniform(0, np.pi), rng.uniform(*r_b)
+        ox, oy = cx + r0 * np.cos(a + 1.2), cy + r0 * np.sin(a + 1.2)
+        # فاصله عمودی از خط و طول محدود
+        along = (xx - ox) * np.cos(a) + (yy - oy) * np.sin(a)
+        across = -(xx - ox) * np.sin(a) + (yy - oy) * np.cos(a)
+        img[(np.abs(across) < 1.0) & (np.abs(along) < r_clad * 0.25) & (d < r_clad * 0.9)] -= 60.0
+    for _ in range(pits):
+        a, r0 = rng.uniform(0, 2 * np.pi), rng.uniform(*r_b)
+        px, py = cx + r0 * np.cos(a), cy + r0 * np.sin(a)
+        img[(xx - px) ** 2 + (yy - py) ** 2 < rng.uniform(3, 5) ** 2] -= 70.0
+    for _ in range(particles):
+        a, r0 = rng.uniform(0, 2 * np.pi), rng.uniform(*r_b)
+        px, py = cx + r0 * np.cos(a), cy + r0 * np.sin(a)
+        img[(xx - px) ** 2 + (yy - py) ** 2 < rng.uniform(5, 9) ** 2] += 90.0
+
+    for _ in range(blur):
+        img = box_mean(img, 3).astype(np.float32)
+    img += rng.normal(0.0, noise, img.shape).astype(np.float32)
+    gray = np.clip(img, 0, 255).astype(np.uint8)
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+
+def benchmark(n=20, size=(640, 480), workers=2):
+    """زمان تحلیل هر فریم، درستی قبول/رد و توان عملیاتی استخر روی تصاویر مصنوعی"""
+    rng = np.random.default_rng(1)
+    cases = []
+    for i in range(n):
+        kind = i % 4  # سالم / خراش / حفره / آلودگی
+        img = synthetic_endface(size, rng, scratches=int(kind == 1), pits=int(kind == 2), particles=int(kind == 3))
+        cases.append((kind == 0, img))
+
+    stats = LatencyStats()
+    correct = 0
+    for expected_pass, img in cases:
+        t0 = time.perf_counter()
+        res = analyze(img)
+        stats.add((time.perf_counter() - t0) * 1000.0)
+        correct += res["passed"] == expected_pass
+    print(stats.format(f"analyze {size[0]}x{size[1]}"))
+    print(f"verdicts: {correct}/{n} correct")
+
+    sharp = focus_score(to_gray(cases[0][1]))
+    blurred = focus_score(to_gray(synthetic_endface(size, rng, blur=3)))
+    print(f"focus score: sharp {sharp:.1f}, blurred {blurred:.1f}")
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        list(pool.map(analyze, [cases[0][1]] * workers))  # گرم کردن
+        t0 = time.perf_counter()
+        list(pool.map(analyze, [img for _, img in cases]))
+        elapsed = time.perf_counter() - t0
+    print(f"process pool ({workers} workers): {n / elapsed:.1f} frames/s")
+    return stats
+
+
+if __name__ == "__main__":
+    benchmark()
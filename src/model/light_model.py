@@ -1,18 +1,33 @@
-from gpiozero import PWMOutputDevice
+from .shadow_pins import ShadowPin
+from .pwm_backend import make_pwm_output
+
+def build_gamma_lut(gamma=2.2, steps=100):
+    """جدول از پیش محاسبه شده: موقعیت اسلایدر (0..steps) -> duty cycle ادراکی"""
+    return tuple(round((i / steps) ** gamma, 4) for i in range(steps + 1))
 
 class LightModel:
-    def __init__(self, pin_number):
+    GAMMA = 2.2
+
+    def __init__(self, pin_number, gamma=GAMMA):
         self.pin=pin_number
-        self.current_brightness = 0 
-        self.led=PWMOutputDevice(self.pin,frequency=1000)
+        self.current_brightness = 0
+        # قفل توقف اضطراری (تابعی که False یعنی روشن کردن خروجی ممنوع است)
+        self.interlock = None
+        # نگاشت خطی brightness/100 بیشتر دامنه اسلایدر را هدر می‌دهد؛ از جدول گاما استفاده می‌کنیم
+        self.duty_lut = build_gamma_lut(gamma)
+        # رجیستر سایه: نوشتن تکراری روی PWM حذف می‌شود
+        self.led=ShadowPin(make_pwm_output(self.pin,frequency=1000), name=f"light:{self.pin}")
 
     def set_brightness(self, brightness):
-        """set brightness from 0 to 100 and convert to duty cycle"""
+        """set brightness from 0 to 100 and convert to perceptual duty cycle"""
+        brightness = int(brightness)
         if brightness < 0 : brightness = 0
         if brightness > 100 : brightness = 100
+        if brightness > 0 and self.interlock and not self.interlock():
+            return
         self.current_brightness = brightness
-        self.led.value = float(brightness / 100.0)
+        self.led.value = self.duty_lut[brightness]
 
     def close(self):
         """Cleanup the hardware resources"""
-        self.led.close()
\ No newline at end of file
+        self.led.close()
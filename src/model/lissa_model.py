@@ -1,13 +1,20 @@
-from gpiozero import PWMOutputDevice
+from .shadow_pins import ShadowPin
+from .pwm_backend import make_pwm_output
 
 class LissaModel:
     def __init__(self, pin_number):
         """Lissa spins at duty cycle 0.5 speed"""
         self.pin = pin_number
         self.FIXED_SPEED = 0.5
-        self.motor = PWMOutputDevice(self.pin, frequency=1000)
+        self.is_on = False
+        # قفل توقف اضطراری (تابعی که False یعنی روشن کردن خروجی ممنوع است)
+        self.interlock = None
+        self.motor = ShadowPin(make_pwm_output(self.pin, frequency=1000), name=f"lissa:{self.pin}")
 
     def set_state(self, is_on: bool):
+        if is_on and self.interlock and not self.interlock():
+            return
+        self.is_on = bool(is_on)
         if is_on:
             self.motor.value = self.FIXED_SPEED
         else:
@@ -1,34 +1,66 @@
-from gpiozero import PWMOutputDevice, DigitalOutputDevice
+from gpiozero import DigitalOutputDevice
+
+from .shadow_pins import ShadowPin
+from .pwm_backend import make_pwm_output
+from .ramp_engine import RampEngine
 
 class PadModel:
-    def __init__(self, pwm_pin, cw_pin, ccw_pin):
+    # پروفایل شتاب پیش‌فرض (قابل تنظیم برای Pi 5)
+    RAMP_RATE_HZ = 200      # نرخ به‌روزرسانی duty
+    RAMP_ACCEL = 2.0        # تغییر duty در ثانیه (0 تا 100% در نیم ثانیه)
+    RAMP_DEAD_TIME_MS = 150 # مکث بین توقف و تغییر جهت
+    RAMP_SHAPE = "scurve"   # یا "trapezoid"
+
+    def __init__(self, pwm_pin, cw_pin, ccw_pin, ramp_rate_hz=RAMP_RATE_HZ, ramp_accel=RAMP_ACCEL,
+                 dead_time_ms=RAMP_DEAD_TIME_MS, ramp_shape=RAMP_SHAPE):
         self.pwm_pin = pwm_pin
         self.cw_pin = cw_pin
         self.ccw_pin = ccw_pin
         self.current_speed = 0
         self.is_ccw = False
-        self.motor = PWMOutputDevice(self.pwm_pin, frequency=1000)
-        self.cw_motor = DigitalOutputDevice(self.cw_pin)
-        self.ccw_motor = DigitalOutputDevice(self.ccw_pin)
+        # قفل توقف اضطراری (تابعی که False یعنی روشن کردن خروجی ممنوع است)
+        self.interlock = None
+        # همه خروجی‌ها پشت رجیستر سایه هستند تا نوشتن تکراری به GPIO نرسد
+        self.motor = ShadowPin(make_pwm_output(self.pwm_pin, frequency=1000), name=f"pad_pwm:{self.pwm_pin}")
+        self.cw_motor = ShadowPin(DigitalOutputDevice(self.cw_pin), name=f"pad_cw:{self.cw_pin}")
+        self.ccw_motor = ShadowPin(DigitalOutputDevice(self.ccw_pin), name=f"pad_ccw:{self.ccw_pin}")
+
+        # موتور شتاب‌دهی در ترد جداگانه (حلقه Tk را بلاک نمی‌کند)
+        self.ramp = RampEngine(
+            self._write_duty, self._write_direction,
+            rate_hz=ramp_rate_hz, accel=ramp_accel,
+            dead_time_ms=dead_time_ms, shape=ramp_shape,
+        )
 
     def set_speed(self, percent):
         if percent < 0: percent = 0
         if percent > 100: percent = 100
-        
+        if percent > 0 and self.interlock and not self.interlock():
+            return
+
         self.current_speed = percent
-        self.motor.value = percent / 100.0
+        self.ramp.request(percent / 100.0, self.is_ccw)
 
-        if percent > 0:
-            self._apply_direction()
-        else:
-            self.stop_rotation()
-        
     def set_direction(self, ccw : bool):
         self.is_ccw = ccw
-        if self.current_speed > 0: self._apply_direction()
+        # تغییر جهت در حال چرخش توسط موتور رمپ ترتیب‌بندی می‌شود
+        if self.current_speed > 0: self.ramp.request(self.current_speed / 100.0, ccw)
 
-    def _apply_direction(self):
-        if self.is_ccw :
+    def apply_duty(self, duty):
+        """اصلاح duty توسط کنترلر دور (فقط وقتی پد در حال چرخش و رمپ تمام شده است)"""
+        if duty > 0 and self.interlock and not self.interlock():
+            return False
+        return self.ramp.hold(max(0.0, min(1.0, duty)))
+
+    def _write_duty(self, duty):
+        self.motor.value = duty
+
+    def _write_direction(self, ccw):
+        """نوشتن پین‌های جهت (None یعنی هر دو خاموش)"""
+        if ccw is None:
+            self.cw_motor.off()
+            self.ccw_motor.off()
+        elif ccw :
             self.cw_motor.off()
             self.ccw_motor.on()
         else:
@@ -36,11 +68,12 @@ class PadModel:
             self.ccw_motor.off()
 
     def stop_rotation(self):
-        self.cw_motor.off()
-        self.ccw_motor.off()
-        self.motor.value = 0
+        """توقف فوری (بدون رمپ)"""
+        self.current_speed = 0
+        self.ramp.halt()
 
     def close(self):
+        self.ramp.close()
         self.motor.close()
         self.cw_motor.close()
-        self.ccw_motor.close()
\ No newline at end of file
+        self.ccw_motor.close()
@@ -0,0 +1,222 @@
+import os
+import stat
+import subprocess
+import time
+
+from gpiozero import PWMOutputDevice
+
+# مسیر پیش‌فرض رابط pwmchip لینوکس
+SYSFS_PWM_ROOT = "/sys/class/pwm"
+
+# کانال‌های PWM سخت‌افزاری هر پین روی Raspberry Pi 5 (RP1, dtoverlay=pwm-2chan / pwm-4chan)
+HW_PWM_CHANNELS = {12: 0, 13: 1, 18: 2, 19: 3}
+
+# گره device-tree کنترلر PWM0 در RP1 که پین‌های بالا به آن mux می‌شوند.
+# شماره pwmchip به کرنل و overlay ها بستگی دارد، پس چیپ از روی این گره پیدا می‌شود
+RP1_PWM0_NODE = "pwm@98000"
+RP1_PWM0_DEVICE_SUFFIX = "98000.pwm"
+
+
+def find_pwm_chip(root=SYSFS_PWM_ROOT, node=RP1_PWM0_NODE, min_channels=4):
+    """پیدا کردن pwmchip متعلق به کنترلر node با تعداد کانال کافی (یا None)"""
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return None
+    for name in names:
+        if not name.startswith("pwmchip"):
+            continue
+        chip = os.path.join(root, name)
+        device = os.path.join(chip, "device")
+        of_node = os.path.basename(os.path.realpath(os.path.join(device, "of_node")))
+        if of_node != node and not (node == RP1_PWM0_NODE and
+                                    os.path.realpath(device).endswith(RP1_PWM0_DEVICE_SUFFIX)):
+            continue
+        try:
+            with open(os.path.join(chip, "npwm")) as f:
+                if int(f.read().strip()) >= min_channels:
+                    return chip
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+def read_pin_function(pin):
+    """
+    تابع فعلی پین از pinctrl (مثلاً "PWM0_CHAN2")؛ None اگر قابل خواندن نباشد.
+    خروجی pinctrl: "18: a3    pd | lo // GPIO18 = PWM0_CHAN2"
+    """
+    try:
+        out = subprocess.run(["pinctrl", "get", str(pin)], capture_output=True, text=True,
+                             timeout=1.0, check=True).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    _, sep, func = out.partition("=")
+    if not sep:
+        return None
+    return func.strip() or None
+
+
+class SysfsPWM:
+    """
+    خروجی PWM سخت‌افزاری از طریق /sys/class/pwm.
+    رابط آن مثل PWMOutputDevice است (value بین 0 و 1 و close) تا مدل‌ها تغییری نبینند.
+    هیچ مصرف CPU و لرزشی ندارد چون شکل موج توسط SoC ساخته می‌شود.
+    """
+
+    def __init__(self, pin, chip_path, channel, frequency=1000, export_timeout=1.0):
+        self.pin = pin
+        self.chip_path = chip_path
+        self.channel = channel
+        self.frequency = frequency
+        self.period_ns = int(round(1e9 / frequency))
+        self.path = os.path.join(chip_path, f"pwm{channel}")
+        self._value = 0.0
+        self._duty_fd = None
+
+        if not os.path.isdir(self.path):
+            self._write_file(os.path.join(chip_path, "export"), channel)
+            # ساخت پوشه کانال و مجوزهای udev کمی زمان می‌برد
+            deadline = time.monotonic() + export_timeout
+            while not os.path.isdir(self.path):
+                if time.monotonic() > deadline:
+                    raise OSError(f"PWM channel {channel} not exported under {chip_path}")
+                time.sleep(0.01)
+
+        # ترتیب مهم است: duty نباید از period بزرگتر باشد
+        self._write_file(os.path.join(self.path, "duty_cycle"), 0)
+        self._write_file(os.path.join(self.path, "period"), self.period_ns)
+        self._write_file(os.path.join(self.path, "enable"), 1)
+
+        # فایل duty باز نگه داشته می‌شود تا هر نوشتن فقط یک syscall باشد
+        self._duty_fd = os.open(os.path.join(self.path, "duty_cycle"), os.O_WRONLY)
+        # attribute واقعی sysfs هر نوشتن را کامل جایگزین می‌کند؛ فایل معمولی (درخت جعلی تست)
+        # باید کوتاه شود وگرنه عدد کوتاه‌تر ته عدد قبلی را باقی می‌گذارد
+        self._truncate = stat.S_ISREG(os.fstat(self._duty_fd).st_mode)
+
+    @staticmethod
+    def _write_file(path, value):
+        with open(path, "w") as f:
+            f.write(str(value))
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        value = min(1.0, max(0.0, float(value)))
+        data = str(int(round(value * self.period_ns))).encode()
+        os.pwrite(self._duty_fd, data, 0)
+        if self._truncate:
+            os.ftruncate(self._duty_fd, len(data))
+        self._value = value
+
+    def read_duty(self):
+        """خواندن duty واقعی از sysfs (برای سنجش دقت)"""
+        with open(os.path.join(self.path, "duty_cycle")) as f:
+            return int(f.read().strip()) / self.period_ns
+
+    def on(self):
+        self.value = 1
+
+    def off(self):
+        self.value = 0
+
+    def close(self):
+        if self._duty_fd is None:
+            return
+        try:
+            self.value = 0
+            os.close(self._duty_fd)
+            self._write_file(os.path.join(self.path, "enable"), 0)
+            self._write_file(os.path.join(self.chip_path, "unexport"), self.channel)
+        except OSError:
+            pass
+        self._duty_fd = None
+
+
+def hardware_channel(pin, sysfs_root=SYSFS_PWM_ROOT, pin_function=read_pin_function):
+    """
+    (chip_path, channel) اگر پین واقعاً به کانال PWM0 سخت‌افزاری mux شده باشد، وگرنه None.
+    بدون این بررسی ممکن است duty روی کانالی نوشته شود که هیچ پینی را نمی‌راند.
+    """
+    channel = HW_PWM_CHANNELS.get(pin)
+    if channel is None:
+        return None
+    chip = find_pwm_chip(sysfs_root)
+    if not chip:
+        return None
+    func = pin_function(pin)
+    if func != f"PWM0_CHAN{channel}":
+        print(f" PWM GPIO{pin}: pin function is {func or 'unknown'}, not PWM0_CHAN{channel}")
+        return None
+    return chip, channel
+
+
+def make_pwm_output(pin, frequency=1000, sysfs_root=SYSFS_PWM_ROOT, prefer_hardware=True,
+                    pin_function=read_pin_function):
+    """
+    ساخت خروجی PWM: اگر پین به کانال سخت‌افزاری mux شده باشد از sysfs استفاده می‌شود،
+    در غیر این صورت (یا در صورت خطا) PWM نرم‌افزاری gpiozero.
+    :param pin_function: تابع (pin) -> نام تابع فعلی پین (برای تست قابل جایگزینی)
+    """
+    hw = hardware_channel(pin, sysfs_root, pin_function) if prefer_hardware else None
+    if hw:
+        chip, channel = hw
+        try:
+            dev = SysfsPWM(pin, chip, channel, frequency=frequency)
+            print(f" PWM GPIO{pin}: hardware ({os.path.basename(chip)}/pwm{channel})")
+            return dev
+        except OSError as e:
+            print(f" PWM GPIO{pin}: hardware unavailable ({e}), using software PWM")
+    return PWMOutputDevice(pin, frequency=frequency)
+
+
+def benchmark(pin, frequency=1000, duration=2.0, sysfs_root=SYSFS_PWM_ROOT, pin_function=read_pin_function):
+    """
+    مقایسه مصرف CPU و دقت duty بین PWM سخت‌افزاری و نرم‌افزاری روی یک پین.
+    در طول duration ثانیه duty بین چند مقدار جابه‌جا می‌شود.
+    دقت duty فقط برای sysfs قابل خواندن است؛ PWM نرم‌افزاری شکل موج را در ترد
+    خودش می‌سازد و چیزی جز مقدار نوشته شده برای خواندن ندارد (None).
+    """
+    duties = [i / 20 for i in range(21)]
+    backends = [("software", lambda: PWMOutputDevice(pin, frequency=frequency))]
+    hw = hardware_channel(pin, sysfs_root, pin_function)
+    if hw:
+        backends.insert(0, ("hardware", lambda: SysfsPWM(pin, *hw, frequency=frequency)))
+
+    results = {}
+    for name, factory in backends:
+        dev = factory()
+        errors = []
+        cpu0 = time.process_time()
+        t0 = time.monotonic()
+        i = 0
+        while time.monotonic() - t0 < duration:
+            target = duties[i % len(duties)]
+            dev.value = target
+            if hasattr(dev, "read_duty"):
+                errors.append(abs(dev.read_duty() - target))
+            i += 1
+            time.sleep(0.05)
+        wall = time.monotonic() - t0
+        cpu = time.process_time() - cpu0
+        dev.close()
+        results[name] = {
+            "cpu_percent": 100.0 * cpu / wall,
+            "max_duty_error": max(errors) if errors else None,
+            "mean_duty_error": sum(errors) / len(errors) if errors else None,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+    bench_pin = int(sys.argv[1]) if len(sys.argv) > 1 else 18
+    for backend, res in benchmark(bench_pin).items():
+        if res["max_duty_error"] is None:
+            accuracy = "duty error n/a"
+        else:
+            accuracy = f"duty error max={res['max_duty_error']:.4f} mean={res['mean_duty_error']:.4f}"
+        print(f"{backend:9s} cpu={res['cpu_percent']:.2f}% {accuracy}")
@@ -0,0 +1,205 @@
+import math
+import threading
+import time
+from functools import lru_cache
+
+from utils.stats import LatencyStats
+
+
+@lru_cache(maxsize=64)
+def unit_profile(shape, steps):
+    """
+    جدول نرمال شده (0..1) یک رمپ با steps گام.
+    trapezoid: شتاب ثابت (رمپ خطی duty)
+    scurve: شتاب نرم در ابتدا و انتها (smoothstep)
+    """
+    if steps <= 0:
+        return (1.0,)
+    table = []
+    for i in range(1, steps + 1):
+        x = i / steps
+        if shape == "scurve":
+            x = x * x * (3 - 2 * x)
+        table.append(x)
+    return tuple(table)
+
+
+def ramp_table(start, end, accel, rate_hz, shape="scurve"):
+    """
+    جدول duty از start تا end (هر دو 0..1).
+    :param accel: حداکثر تغییر duty در ثانیه (مثلاً 2.0 یعنی 0->100% در 0.5 ثانیه)
+    """
+    span = abs(end - start)
+    if span == 0:
+        return ()
+    duration = span / accel
+    if shape == "scurve":
+        duration *= 1.5  # شیب بیشینه smoothstep برابر 1.5 است
+    steps = max(1, int(math.ceil(duration * rate_hz)))
+    return tuple(start + (end - start) * u for u in unit_profile(shape, steps))
+
+
+class RampEngine:
+    """
+    موتور شتاب‌دهی پد در ترد مستقل.
+    درخواست‌ها (سرعت/جهت) بلافاصله برمی‌گردند و ترد با زمان‌بندی مبتنی بر
+    deadline جدول duty را اجرا می‌کند. تغییر جهت در حال چرخش به ترتیب انجام می‌شود:
+    کاهش تا صفر، زمان مرده، تغییر جهت، افزایش تا هدف.
+    """
+
+    def __init__(self, write_duty, write_direction, rate_hz=200, accel=2.0,
+                 dead_time_ms=150, shape="scurve"):
+        """
+        :param write_duty: تابع نوشتن duty (0..1)
+        :param write_direction: تابع نوشتن جهت (True=CCW, False=CW, None=هر دو خاموش)
+        """
+        self.write_duty = write_duty
+        self.write_direction = write_direction
+        self.rate_hz = rate_hz
+        self.accel = accel
+        self.dead_time = dead_time_ms / 1000.0
+        self.shape = shape
+
+        self.duty = 0.0       # duty اعمال شده فعلی
+        self.ccw = None       # جهت اعمال شده فعلی (None یعنی آزاد)
+        self.jitter = LatencyStats()  # تأخیر واقعی نسبت به برنامه (ms)
+
+        self._target = (0.0, False)
+        self._gen = 0
+        self._idle = True
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="pad-ramp", daemon=True)
+        self._thread.start()
+
+    # ---------- API (از ترد UI) ----------
+
+    def request(self, duty, ccw):
+        """تنظیم هدف جدید؛ رمپ جاری قطع و از duty فعلی دوباره برنامه‌ریزی می‌شود"""
+        with self._cond:
+            self._target = (float(duty), bool(ccw))
+            self._gen += 1
+            self._idle = False
+            self._cond.notify()
+
+    def halt(self):
+        """توقف فوری بدون رمپ (ایمنی)"""
+        with self._cond:
+            self._target = (0.0, self._target[1])
+            self._gen += 1
+            self._cond.notify()
+        with self._io_lock:
+            self.write_direction(None)
+            self.write_duty(0)
+            self.duty = 0.0
+            self.ccw = None
+
+    def hold(self, duty):
+        """
+        نوشتن مستقیم duty بدون رمپ (برای حلقه بسته سرعت).
+        فقط وقتی رمپی در جریان نیست و جهت درگیر است انجام می‌شود؛ در غیر این صورت False.
+        """
+        with self._cond:
+            if not self._idle:
+                return False
+            gen = self._gen
+        with self._io_lock:
+            if self._changed(gen) or self.ccw is None:
+                return False
+            self.write_duty(duty)
+            self.duty = duty
+        return True
+
+    def is_idle(self):
+        with self._cond:
+            return self._idle
+
+    def wait_idle(self, timeout=None):
+        """انتظار تا پایان اجرای هدف فعلی (برای تست و خاموش کردن)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._idle:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        with self._cond:
+            self._running = False
+            self._gen += 1
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    # ---------- ترد موتور ----------
+
+    def _run(self):
+        seen = 0
+        while True:
+            with self._cond:
+                while self._running and self._gen == seen:
+                    self._idle = True
+                    self._cond.notify_all()
+                    self._cond.wait()
+                if not self._running:
+                    return
+                seen = self._gen
+                self._idle = False
+                duty, ccw = self._target
+            self._execute(seen, duty, ccw)
+
+    def _changed(self, gen):
+        return self._gen != gen or not self._running
+
+    def _execute(self, gen, duty, ccw):
+        if duty > 0 and self.ccw is not None and self.ccw != ccw and self.duty > 0:
+            # تغییر جهت در حال چرخش: اول توقف نرم
+            if not self._ramp(gen, 0.0):
+                return
+            if self._sleep_until(gen, time.monotonic() + self.dead_time):
+                return
+
+        if duty > 0 and self.ccw != ccw:
+            with self._io_lock:
+                if self._changed(gen):
+                    return
+                self.write_direction(ccw)
+                self.ccw = ccw
+
+        if not self._ramp(gen, duty):
+            return
+
+        if duty == 0 and self.ccw is not None:
+            with self._io_lock:
+                if self._changed(gen):
+                    return
+                self.write_direction(None)
+                self.ccw = None
+
+    def _sleep_until(self, gen, deadline):
+        """خواب تا deadline؛ اگر درخواست جدید برسد True برمی‌گرداند"""
+        with self._cond:
+            while not self._changed(gen):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _ramp(self, gen, target):
+        table = ramp_table(self.duty, target, self.accel, self.rate_hz, self.shape)
+        period = 1.0 / self.rate_hz
+        t0 = time.monotonic()
+        for i, value in enumerate(table):
+            deadline = t0 + i * period
+            if self._sleep_until(gen, deadline):
+                return False
+            self.jitter.add((time.monotonic() - deadline) * 1000.0)
+            with self._io_lock:
+                if self._changed(gen):
+                    return False
+                self.write_duty(value)
+                self.duty = value
+        return True
@@ -0,0 +1,270 @@
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+# هر مرحله دستور پولیش؛ مقادیر پیش‌فرض برای فیلدهای حذف شده
+STAGE_DEFAULTS = {
+    "name": "stage",
+    "speed": 0,           # درصد سرعت پد
+    "ccw": False,
+    "duration_s": 0.0,
+    "lissa": False,
+    "light": 0,           # روشنایی 0..100
+    "column_um": 0,       # حرکت نسبی ستون در شروع مرحله (+ بالا)
+}
+
+DEFAULT_RECIPE = {
+    "name": "APC standard",
+    "stages": [
+        {"name": "coarse", "speed": 40, "duration_s": 60, "lissa": True, "light": 60, "column_um": -100},
+        {"name": "medium", "speed": 30, "ccw": True, "duration_s": 45, "lissa": True, "light": 60},
+        {"name": "fine", "speed": 20, "duration_s": 30, "lissa": True, "light": 80},
+        {"name": "clean", "speed": 10, "duration_s": 10, "light": 80, "column_um": 100},
+    ],
+}
+
+# یک فرمان در خط زمانی: زمان نسبی، شماره مرحله، نام عملگر، آرگومان
+Command = namedtuple("Command", "t stage action arg")
+
+
+def compile_recipe(recipe):
+    """
+    تبدیل دستور به خط زمانی مرتب از فرمان‌ها.
+    خروجی: (commands, stages) که stages لیست مراحل کامل شده با زمان شروع برنامه‌ریزی شده است
+    """
+    commands = []
+    stages = []
+    t = 0.0
+    for i, raw in enumerate(recipe.get("stages", ())):
+        stage = {**STAGE_DEFAULTS, **raw}
+        duration = float(stage["duration_s"])
+        if duration < 0:
+            raise ValueError(f"stage {i} ({stage['name']}): negative duration")
+        stage["planned_start"] = t
+        stages.append(stage)
+
+        commands.append(Command(t, i, "stage_start", None))
+        commands.append(Command(t, i, "light", int(stage["light"])))
+        commands.append(Command(t, i, "lissa", bool(stage["lissa"])))
+        if stage["column_um"]:
+            commands.append(Command(t, i, "column", float(stage["column_um"])))
+        commands.append(Command(t, i, "pad", (int(stage["speed"]), bool(stage["ccw"]))))
+        t += duration
+        commands.append(Command(t, i, "stage_end", None))
+
+    commands.append(Command(t, len(stages) - 1, "finish", None))
+    return commands, stages
+
+
+class RecipeRunner:
+    """
+    اجرای خط زمانی دستور در یک ترد زمان‌بند.
+    هر فرمان در deadline مطلق (t0 + زمان نسبی + مدت توقف‌ها) اجرا می‌شود، پس
+    تأخیر یک فرمان به مراحل بعدی منتقل نمی‌شود. توقف موقت پد و لیساژور را
+    خاموش می‌کند و ادامه، وضعیت مرحله جاری را دوباره اعمال می‌کند.
+    """
+
+    def __init__(self, pad, lissa=None, light=None, positioner=None):
+        """
+        :param positioner: ColumnPositioner یا StepGenerator برای column_um (اختیاری)
+        """
+        self.pad = pad
+        self.lissa = lissa
+        self.light = light
+        self.positioner = positioner
+        # شرط اختیاری شروع: تابعی که False یعنی اجرا مجاز نیست (مثلاً فوکوس خودکار ستون را گرفته)
+        self.start_allowed = None
+
+        self.state = "idle"      # idle / running / paused / done / aborted
+        self.recipe_name = None
+        self.run_id = None       # شناسه اجرای جاری (برای پیوند تصاویر بایگانی)
+        self.stages = []
+        self.current = -1
+        # زمان‌بندی هر مرحله: planned_s, actual_s, start_late_ms
+        self.timings = []
+        # توابع (event, stage_index) در ترد زمان‌بند: stage_start / stage_end / paused / resumed / done / aborted
+        self.listeners = []
+
+        self._cond = threading.Condition()
+        # فرمان‌ها و توقف/ادامه هم‌زمان اجرا نشوند (مثلاً روشن شدن پد بعد از توقف موقت)
+        self._exec_lock = threading.Lock()
+        self._start = None
+        self._paused_at = None
+        self._paused_total = 0.0
+        self._thread = None
+
+    # ---------- API ----------
+
+    def run(self, recipe):
+        if self.state in ("running", "paused"):
+            return False
+        if self.start_allowed and not self.start_allowed():
+            return False
+        commands, stages = compile_recipe(recipe)
+        self.recipe_name = recipe.get("name")
+        # زمان برای خوانایی، پسوند تصادفی برای یکتایی (دو اجرا در یک ثانیه یا بعد از راه‌اندازی مجدد)
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.stages = stages
+        self.timings = [None] * len(stages)
+        self.current = -1
+        self._paused_at = None
+        self._paused_total = 0.0
+        self.state = "running"
+        self._start = time.monotonic()
+        self._thread = threading.Thread(target=self._run, args=(commands,), name="recipe", daemon=True)
+        self._thread.start()
+        return True
+
+    def pause(self):
+        with self._exec_lock:
+            with self._cond:
+                if self.state != "running":
+                    return False
+                self.state = "paused"
+                self._paused_at = time.monotonic()
+                self._cond.notify_all()
+            self._safe_stop()
+        self._notify("paused")
+        return True
+
+    def resume(self):
+        with self._exec_lock:
+            with self._cond:
+                if self.state != "paused":
+                    return False
+                self._paused_total += time.monotonic() - self._paused_at
+                self._paused_at = None
+                self.state = "running"
+                self._cond.notify_all()
+            if 0 <= self.current < len(self.stages):
+                self._apply_stage(self.stages[self.current])
+        self._notify("resumed")
+        return True
+
+    def abort(self):
+        with self._exec_lock:
+            with self._cond:
+                if self.state not in ("running", "paused"):
+                    return False
+                self.state = "aborted"
+                self._cond.notify_all()
+            self._safe_stop()
+        return True
+
+    def remaining_s(self):
+        """زمان باقیمانده مرحله جاری (برای نمایش)"""
+        with self._cond:
+            if not (0 <= self.current < len(self.stages)) or self._start is None:
+                return 0.0
+            stage = self.stages[self.current]
+            end = self._start + stage["planned_start"] + float(stage["duration_s"]) + self._paused_total
+            now = self._paused_at if self._paused_at is not None else time.monotonic()
+        return max(0.0, end - now)
+
+    # ---------- ترد زمان‌بند ----------
+
+    def _run(self, commands):
+        stage_started = {}
+        try:
+            for cmd in commands:
+                while True:
+                    if not self._wait_until(cmd.t):
+                        return
+                    with self._exec_lock:
+                        # بین پایان انتظار و گرفتن قفل ممکن است توقف موقت شده باشد
+                        if self.state == "running":
+                            self._dispatch(cmd, stage_started)
+                            break
+        finally:
+            if self.state == "aborted":
+                self._notify("aborted")
+
+    def _dispatch(self, cmd, stage_started):
+        if cmd.action == "stage_start":
+            self.current = cmd.stage
+            now = time.monotonic()
+            stage_started[cmd.stage] = (now, self._paused_total)
+            late_ms = (now - self._deadline(cmd.t)) * 1000.0
+            self.timings[cmd.stage] = {"planned_s": float(self.stages[cmd.stage]["duration_s"]),
+                                       "actual_s": None, "start_late_ms": late_ms}
+            self._notify("stage_start")
+        elif cmd.action == "stage_end":
+            t_start, paused_before = stage_started[cmd.stage]
+            # مدت واقعی بدون زمان توقف موقت
+            actual = time.monotonic() - t_start - (self._paused_total - paused_before)
+            self.timings[cmd.stage]["actual_s"] = actual
+            self._notify("stage_end")
+        elif cmd.action == "finish":
+            self._safe_stop()
+            self.state = "done"
+            self._notify("done")
+        else:
+            self._execute(cmd.action, cmd.arg)
+
+    def _deadline(self, t):
+        return self._start + t + self._paused_total
+
+    def _wait_until(self, t):
+        """انتظار تا deadline فرمان (با احتساب توقف‌ها)؛ False یعنی لغو شد"""
+        with self._cond:
+            while True:
+                if self.state == "aborted":
+                    return False
+                if self.state == "paused":
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline(t) - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._cond.wait(remaining)
+
+    def _execute(self, action, arg):
+        try:
+            if action == "light" and self.light is not None:
+                self.light.set_brightness(arg)
+            elif action == "lissa" and self.lissa is not None:
+                self.lissa.set_state(arg)
+            elif action == "pad":
+                speed, ccw = arg
+                self.pad.set_direction(ccw)
+                if speed > 0:
+                    self.pad.set_speed(speed)
+                else:
+                    self.pad.stop_rotation()
+            elif action == "column":
+                if self.positioner is None:
+                    print("[RECIPE] column_um ignored: no column positioner configured")
+                elif not self.positioner.move_by(arg):
+                    print("[RECIPE] column move skipped (busy)")
+        except Exception as e:
+            print(f"[RECIPE] {action} failed: {e}")
+
+    def _apply_stage(self, stage):
+        self._execute("light", int(stage["light"]))
+        self._execute("lissa", bool(stage["lissa"]))
+        self._execute("pad", (int(stage["speed"]), bool(stage["ccw"])))
+
+    def _safe_stop(self):
+        """پد و لیساژور خاموش (نور دست نمی‌خورد)"""
+        for name, action in (("pad", self.pad.stop_rotation),
+                             ("lissa", lambda: self.lissa and self.lissa.set_state(False))):
+            try:
+                action()
+            except Exception as e:
+                print(f"[RECIPE] failed to stop {name}: {e}")
+
+    def _notify(self, event):
+        for listener in self.listeners:
+            listener(event, self.current)
+
+    def report(self):
+        lines = [f"Recipe '{self.recipe_name}': {self.state}"]
+        for stage, timing in zip(self.stages, self.timings):
+            if timing is None:
+                continue
+            actual = timing["actual_s"]
+            drift = "" if actual is None else f" actual={actual:.3f}s ({(actual - timing['planned_s']) * 1000:+.1f} ms)"
+            lines.append(f"  {stage['name']}: planned={timing['planned_s']:.3f}s{drift} "
+                         f"start late {timing['start_late_ms']:.2f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,729 @@
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from utils.stats import LatencyStats
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+MAX_HEADER = 8192
+MAX_BODY = 65536
+MAX_MESSAGE = 65536
+# بافر ارسال کوچک برای هر کلاینت WebSocket: کلاینت کند زود «پر» می‌شود و به جای
+# انباشتن فریم‌های کهنه در بافر سیستم‌عامل، فریم‌های میانی‌اش ادغام می‌شوند
+SEND_BUFFER = 16384
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+                409: "Conflict", 413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class CommandError(Exception):
+    """خطای فرمان با کد HTTP (مثلاً 409 وقتی توقف اضطراری فعال است)"""
+
+    def __init__(self, message, status=409):
+        super().__init__(message)
+        self.status = status
+
+
+# ==========================================
+# فریم‌های WebSocket (RFC 6455)
+# ==========================================
+
+def ws_accept_key(key):
+    return base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+
+
+def ws_encode(opcode, payload, mask=False):
+    """یک فریم کامل (FIN)؛ فریم سرور بدون ماسک، فریم کلاینت با ماسک"""
+    n = len(payload)
+    head = bytes([0x80 | opcode])
+    mbit = 0x80 if mask else 0
+    if n < 126:
+        head += bytes([mbit | n])
+    elif n < 65536:
+        head += bytes([mbit | 126]) + struct.pack("!H", n)
+    else:
+        head += bytes([mbit | 127]) + struct.pack("!Q", n)
+    if not mask:
+        return head + payload
+    key = os.urandom(4)
+    return head + key + _apply_mask(payload, key)
+
+
+def _apply_mask(payload, key):
+    # XOR کل پیام به صورت یک عدد صحیح بزرگ (بدون حلقه پایتونی روی بایت‌ها)
+    n = len(payload)
+    if not n:
+        return b""
+    repeated = (key * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(n, "big")
+
+
+async def ws_read_frame(reader, require_mask):
+    """خواندن یک فریم: (fin, opcode, payload)"""
+    b0, b1 = await reader.readexactly(2)
+    masked = b1 & 0x80
+    if require_mask and not masked:
+        raise ValueError("unmasked client frame")
+    n = b1 & 0x7F
+    if n == 126:
+        n = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif n == 127:
+        n = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if n > MAX_MESSAGE:
+        raise ValueError("frame too large")
+    key = await reader.readexactly(4) if masked else None
+    payload = await reader.readexactly(n)
+    if key:
+        payload = _apply_mask(payload, key)
+    return bool(b0 & 0x80), b0 & 0x0F, payload
+
+
+async def ws_read_message(reader, writer, require_mask=True, on_frame=None):
+    """
+    یک پیام کامل (به هم چسباندن فریم‌های ادامه)؛ ping با pong پاسخ داده می‌شود.
+    None یعنی اتصال بسته شد.
+    :param on_frame: تابع بدون آرگومان برای هر فریم دریافتی (حتی ping)؛ نشانه زنده بودن کلاینت
+    """
+    parts, opcode = [], None
+    while True:
+        fin, op, payload = await ws_read_frame(reader, require_mask)
+        if on_frame:
+            on_frame()
+        if op == OP_CLOSE:
+            return None
+        if op == OP_PING:
+            writer.write(ws_encode(OP_PONG, payload, mask=not require_mask))
+            continue
+        if op == OP_PONG:
+            continue
+        if op != OP_CONT:
+            opcode, parts = op, []
+        parts.append(payload)
+        if sum(len(p) for p in parts) > MAX_MESSAGE:
+            raise ValueError("message too large")
+        if fin:
+            return opcode, b"".join(parts)
+
+
+# ==========================================
+# سرور
+# ==========================================
+
+class _Client:
+    """یک کلاینت WebSocket: فقط آخرین تله‌متری نگه داشته می‌شود (خانه تک‌مقداری)"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.wake = asyncio.Event()
+        self.telemetry = None   # فریم آماده ارسال؛ فریم جدید جایگزین فریم ارسال نشده می‌شود
+        self.replies = []       # پاسخ فرمان‌ها؛ همه ارسال می‌شوند
+        self.sent = 0
+        self.armed = {}         # فرمان توقف -> args برای عملگرهایی که این کلاینت روشن کرده
+        self.last_rx = time.monotonic()
+
+
+class RemoteAPI:
+    """
+    API محلی HTTP + WebSocket برای پایش و فرمان بدون صفحه نمایش.
+    حلقه asyncio در ترد خودش اجرا می‌شود و هیچ‌وقت مستقیماً به Tk دست نمی‌زند:
+    - تله‌متری: snapshot (فقط خواندن ویژگی‌های مدل‌ها) با نرخ ثابت rate_hz یک بار
+      ساخته و یک بار کدگذاری می‌شود، فقط در صورت تغییر (یا هر keepalive_s) فرستاده
+      می‌شود و فریم یکسان به همه کلاینت‌ها می‌رود. کلاینت کند فریم‌های میانی را از
+      دست می‌دهد (جایگزینی) و صف پشت سرش جمع نمی‌شود؛ پس تعداد کلاینت‌ها هیچ باری
+      روی حلقه UI نمی‌گذارد.
+    - فرمان‌ها: commands[name](**args) با post (در برنامه: view.dispatcher.post)
+      در ترد UI اجرا می‌شود، یعنی دقیقاً مسیر دکمه‌ها؛ پاسخ با Future برمی‌گردد.
+
+    مسیرها: GET /state، GET /commands، POST /command با {"cmd": ..., "args": {...}}
+    و /ws (تله‌متری به صورت push و فرمان با {"id": ..., "cmd": ..., "args": ...}).
+
+    ایمنی: روی آدرسی غیر از loopback فقط با token مشترک اجرا می‌شود (هدر
+    Authorization: Bearer یا ?token=). عملگری که با فرمان deadman یک کلاینت WebSocket
+    روشن شده، وقتی آن کلاینت قطع شود یا deadman_s هیچ فریمی (فرمان یا ping) نفرستد،
+    با فرمان توقف متناظر خاموش می‌شود.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, rate_hz=5.0, keepalive_s=5.0, max_clients=16,
+                 command_timeout_s=2.0, send_timeout_s=10.0, token=None, deadman_s=3.0):
+        """
+        :param port: 0 یعنی پورت آزاد دلخواه (بعد از start در self.port)
+        :param rate_hz: حداکثر نرخ تله‌متری برای همه کلاینت‌ها
+        :param send_timeout_s: کلاینتی که این مدت هیچ داده‌ای نگیرد قطع می‌شود
+        :param token: رمز مشترک؛ برای host غیر loopback الزامی است
+        :param deadman_s: حداکثر سکوت کلاینتی که عملگر روشن نگه داشته است
+        """
+        self.host = host
+        self.port = port
+        self.rate_hz = rate_hz
+        self.keepalive_s = keepalive_s
+        self.max_clients = max_clients
+        self.command_timeout_s = command_timeout_s
+        self.send_timeout_s = send_timeout_s
+        self.token = token
+        self.deadman_s = deadman_s
+
+        # توسط Presenter پر می‌شوند
+        self.snapshot = dict                       # در ترد سرور صدا زده می‌شود؛ فقط خواندن
+        self.commands = {}                         # name -> callable(**args)، در ترد UI
+        self.deadman = {}                          # فرمان شروع -> (فرمان توقف، args) برای قطع کلاینت
+        self.post = lambda func, *args: func(*args)
+
+        self._loop = None
+        self._stop = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._clients = set()
+        self._handlers = {}       # تسک -> writer اتصال‌های باز (برای بستن تمیز)
+        self._state = None        # (t, body) آخرین snapshot کدگذاری شده
+        self._error = None
+
+        # آمار
+        self.requests = 0
+        self.ws_connects = 0
+        self.rejected_clients = 0
+        self.peak_clients = 0
+        self.snapshots = 0
+        self.broadcasts = 0
+        self.frames_sent = 0
+        self.coalesced = 0        # فریم‌هایی که قبل از ارسال با فریم جدیدتر جایگزین شدند
+        self.commands_run = 0
+        self.command_errors = 0
+        self.unauthorized = 0
+        self.deadman_stops = 0
+        self.snapshot_ms = LatencyStats(maxlen=500)
+        self.command_ms = LatencyStats(maxlen=500)   # از دریافت تا پایان اجرا در ترد UI
+
+    # ---------- چرخه عمر (ترد فراخواننده) ----------
+
+    def start(self, timeout=5.0):
+        if not self.token and not _is_loopback(self.host):
+            raise RuntimeError(f"remote API on {self.host} controls motors; a token is required")
+        self._thread = threading.Thread(target=self._run, name="remote-api", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout) or self._error:
+            raise RuntimeError(f"remote API failed to start: {self._error}")
+        print(f"[API] listening on http://{self.host}:{self.port}")
+        return self
+
+    def close(self):
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._thread.join(timeout=2.0)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._main())
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+        finally:
+            self._loop.close()
+
+    async def _main(self):
+        self._stop = asyncio.Event()
+        # limit بافر خواندن را به اندازه سرآیند محدود می‌کند تا readuntil بیش از MAX_HEADER نگه ندارد
+        server = await asyncio.start_server(self._handle, self.host, self.port, limit=MAX_HEADER)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        ticker = asyncio.create_task(self._broadcast())
+        async with server:
+            await self._stop.wait()
+        ticker.cancel()
+        # بستن اتصال‌ها (نه cancel تسک‌ها) تا هر هندلر با EOF به شکل عادی خارج شود
+        for writer in self._handlers.values():
+            writer.close()
+        if self._handlers:
+            await asyncio.wait(list(self._handlers), timeout=1.0)
+
+    # ---------- تله‌متری ----------
+
+    def _encode_state(self):
+        t0 = time.perf_counter()
+        body = json.dumps(self.snapshot(), sort_keys=True, separators=(",", ":"))
+        self.snapshot_ms.add((time.perf_counter() - t0) * 1000.0)
+        self.snapshots += 1
+        self._state = (time.monotonic(), body)
+        return body
+
+    def _current_state(self):
+        """snapshot برای HTTP؛ درخواست‌های پشت سر هم از همان نمونه تیک فعلی استفاده می‌کنند"""
+        if self._state and time.monotonic() - self._state[0] < 1.0 / self.rate_hz:
+            return self._state[1]
+        return self._encode_state()
+
+    async def _broadcast(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.rate_hz
+        next_t = loop.time()
+        last_body, last_sent = None, 0.0
+        while True:
+            next_t += interval
+            delay = next_t - loop.time()
+            if delay < 0:
+                next_t, delay = loop.time(), 0   # عقب افتاده‌ایم؛ جبران انفجاری نداریم
+            await asyncio.sleep(delay)
+            now = time.monotonic()
+            for client in self._clients:
+                if client.armed and now - client.last_rx > self.deadman_s:
+                    # کلاینت ساکت (کابل کشیده شده، برنامه گیر کرده): اتصال بسته و عملگرها متوقف می‌شوند
+                    print(f"[API] client silent for {now - client.last_rx:.1f} s; dropping")
+                    client.writer.close()
+            if not self._clients:
+                last_body = None
+                continue
+            try:
+                body = self._encode_state()
+            except Exception as e:  # خطای snapshot نباید ارسال را متوقف کند
+                print(f"[API] snapshot failed: {e}")
+                continue
+            now = loop.time()
+            if body == last_body and now - last_sent < self.keepalive_s:
+                continue
+            last_body, last_sent = body, now
+            frame = ws_encode(OP_TEXT, f'{{"type":"telemetry","t":{time.time():.3f},"state":{body}}}'.encode())
+            self.broadcasts += 1
+            for client in self._clients:
+                if client.telemetry is not None:
+                    self.coalesced += 1
+                client.telemetry = frame
+                client.wake.set()
+
+    # ---------- فرمان‌ها ----------
+
+    async def _execute(self, name, args):
+        """اجرای فرمان در ترد UI؛ (status, payload)"""
+        func = self.commands.get(name)
+        if func is None:
+            return 404, {"ok": False, "error": f"unknown command: {name}"}
+        if not isinstance(args, dict):
+            return 400, {"ok": False, "error": "args must be an object"}
+        t0 = time.perf_counter()
+        future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return  # زمان انتظار گذشته؛ فرمان دیرهنگام اجرا نشود
+            try:
+                future.set_result(func(**args))
+            except Exception as e:
+                future.set_exception(e)
+
+        self.post(run)
+        try:
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.command_timeout_s)
+        except asyncio.TimeoutError:
+            self.command_errors += 1
+            return 503, {"ok": False, "error": "UI loop did not respond"}
+        except CommandError as e:
+            self.command_errors += 1
+            return e.status, {"ok": False, "error": str(e)}
+        except (TypeError, ValueError, KeyError) as e:
+            self.command_errors += 1
+            return 400, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            self.command_errors += 1
+            print(f"[API] {name} failed: {e}")
+            return 500, {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.commands_run += 1
+        self._state = None   # GET /state بعدی نتیجه فرمان را ببیند
+        self.command_ms.add((time.perf_counter() - t0) * 1000.0)
+        return 200, {"ok": True, "result": result}
+
+    # ---------- HTTP ----------
+
+    async def _handle(self, reader, writer):
+        self.requests += 1
+        task = asyncio.current_task()
+        self._handlers[task] = writer
+        try:
+            try:
+                request = await asyncio.wait_for(self._read_request(reader), 5.0)
+            except asyncio.LimitOverrunError:
+                await self._respond(writer, 431, {"ok": False, "error": "header too large"})
+                return
+            except (ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                await self._respond(writer, 400, {"ok": False, "error": str(e) or "bad request"})
+                return
+            method, path, query, headers, body = request
+            if self.token and not self._authorized(headers, query):
+                self.unauthorized += 1
+                await self._respond(writer, 401, {"ok": False, "error": "missing or invalid token"})
+                return
+            if path == "/ws":
+                await self._websocket(reader, writer, headers)
+            elif path == "/state" and method == "GET":
+                await self._respond(writer, 200, self._current_state().encode())
+            elif path == "/commands" and method == "GET":
+                await self._respond(writer, 200, {"commands": sorted(self.commands)})
+            elif path == "/command" and method == "POST":
+                try:
+                    msg = json.loads(body or b"{}")
+                    status, payload = await self._execute(msg["cmd"], msg.get("args", {}))
+                except (ValueError, KeyError, TypeError) as e:
+                    status, payload = 400, {"ok": False, "error": f"bad command: {e}"}
+                await self._respond(writer, status, payload)
+            elif path in ("/state", "/commands", "/command"):
+                await self._respond(writer, 405, {"ok": False, "error": "method not allowed"})
+            else:
+                await self._respond(writer, 404, {"ok": False, "error": "not found"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._handlers.pop(task, None)
+            writer.close()
+
+    async def _read_request(self, reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY:
+            raise ValueError("body too large")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return method.upper(), url.path, url.query, headers, body
+
+    def _authorized(self, headers, query):
+        auth = headers.get("authorization", "")
+        given = auth[7:].strip() if auth.lower().startswith("bearer ") else parse_qs(query).get("token", [""])[0]
+        return hmac.compare_digest(given.encode(), self.token.encode())
+
+    async def _respond(self, writer, status, payload):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        writer.write((f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                      f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                      f"Connection: close\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    # ---------- WebSocket ----------
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if "websocket" not in headers.get("upgrade", "").lower() or not key:
+            await self._respond(writer, 400, {"ok": False, "error": "websocket upgrade required"})
+            return
+        if len(self._clients) >= self.max_clients:
+            self.rejected_clients += 1
+            await self._respond(writer, 503, {"ok": False, "error": "too many clients"})
+            return
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {ws_accept_key(key)}\r\n\r\n").encode())
+        self.ws_connects += 1
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER)
+        writer.transport.set_write_buffer_limits(high=SEND_BUFFER)
+        client = _Client(writer)
+        # وضعیت فعلی بلافاصله (بدون انتظار برای تغییر بعدی)
+        client.telemetry = ws_encode(OP_TEXT, f'{{"type":"state","state":{self._current_state()}}}'.encode())
+        client.wake.set()
+        self._clients.add(client)
+        self.peak_clients = max(self.peak_clients, len(self._clients))
+        sender = asyncio.create_task(self._sender(client))
+
+        def alive():
+            client.last_rx = time.monotonic()
+
+        try:
+            while not sender.done():
+                msg = await ws_read_message(reader, writer, on_frame=alive)
+                if msg is None:
+                    break
+                opcode, data = msg
+                if opcode == OP_TEXT:
+                    # ابتدا پاسخ کامل شود؛ فرستنده در حین انتظار فهرست replies را عوض می‌کند
+                    reply = ws_encode(OP_TEXT, json.dumps(await self._ws_command(data, client)).encode())
+                    client.replies.append(reply)
+                    client.wake.set()
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+            if not writer.is_closing():
+                writer.write(ws_encode(OP_CLOSE, b""))
+            if client.armed and not self._stop.is_set():
+                await self._release(client)
+
+    async def _ws_command(self, data, client=None):
+        try:
+            msg = json.loads(data)
+            name, args = msg["cmd"], msg.get("args", {})
+            status, payload = await self._execute(name, args)
+            reply = {"type": "reply", "id": msg.get("id"), "status": status, **payload}
+        except (ValueError, KeyError, TypeError) as e:
+            return {"type": "reply", "id": None, "status": 400, "ok": False, "error": f"bad command: {e}"}
+        if client is not None and status == 200:
+            if name in self.deadman:
+                stop_name, stop_args = self.deadman[name]
+                client.armed[stop_name] = stop_args
+            else:
+                client.armed.pop(name, None)   # کلاینت خودش متوقف کرد
+        return reply
+
+    async def _release(self, client):
+        """deadman: توقف عملگرهایی که کلاینت قطع شده روشن کرده بود"""
+        for name, args in client.armed.items():
+            status, payload = await self._execute(name, args)
+            self.deadman_stops += 1
+            print(f"[API] client dropped -> {name}: {status} {payload.get('error', '')}".rstrip())
+        client.armed.clear()
+
+    async def _sender(self, client):
+        """تنها نویسنده روی اتصال: پاسخ‌ها به ترتیب، سپس فقط جدیدترین تله‌متری"""
+        try:
+            while True:
+                await client.wake.wait()
+                client.wake.clear()
+                frames, client.replies = client.replies, []
+                if client.telemetry is not None:
+                    frames.append(client.telemetry)
+                    client.telemetry = None
+                client.writer.write(b"".join(frames))
+                await asyncio.wait_for(client.writer.drain(), self.send_timeout_s)
+                client.sent += len(frames)
+                self.frames_sent += len(frames)
+        except (ConnectionError, asyncio.TimeoutError):
+            client.writer.close()  # کلاینت گیر کرده؛ خواننده با بسته شدن اتصال خارج می‌شود
+
+    # ---------- آمار ----------
+
+    def stats(self):
+        return {
+            "clients": len(self._clients),
+            "peak_clients": self.peak_clients,
+            "requests": self.requests,
+            "ws_connects": self.ws_connects,
+            "rejected_clients": self.rejected_clients,
+            "snapshots": self.snapshots,
+            "broadcasts": self.broadcasts,
+            "frames_sent": self.frames_sent,
+            "coalesced": self.coalesced,
+            "commands": self.commands_run,
+            "command_errors": self.command_errors,
+            "unauthorized": self.unauthorized,
+            "deadman_stops": self.deadman_stops,
+            "snapshot": self.snapshot_ms.summary(),
+            "command": self.command_ms.summary(),
+        }
+
+    def report(self):
+        return (f"Remote API: {self.requests} connections (peak {self.peak_clients} websocket clients, "
+                f"{self.rejected_clients} rejected), {self.broadcasts} broadcasts, {self.frames_sent} frames sent, "
+                f"{self.coalesced} coalesced, {self.commands_run} commands ({self.command_errors} errors), "
+                f"{self.deadman_stops} deadman stops, {self.unauthorized} unauthorized\n"
+                + self.snapshot_ms.format("  snapshot") + "\n" + self.command_ms.format("  command (UI thread)"))
+
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# ==========================================
+# کلاینت درون‌پروسه‌ای (آزمایش روی localhost)
+# ==========================================
+
+def _auth_header(token):
+    return f"Authorization: Bearer {token}\r\n" if token else ""
+
+
+async def http_request(host, port, method, path, payload=None, token=None):
+    """یک درخواست HTTP؛ (status, json)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n{_auth_header(token)}"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(body)
+
+
+class WebSocketClient:
+    """کلاینت حداقلی WebSocket برای آزمایش و ابزارهای محلی"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host, port, path="/ws", limit=2 ** 16, token=None):
+        reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"{_auth_header(token)}Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        if " 101 " not in head.split("\r\n")[0] or ws_accept_key(key) not in head:
+            writer.close()
+            raise ConnectionError(head.split("\r\n")[0])
+        return cls(reader, writer)
+
+    async def receive(self):
+        """پیام بعدی (dict) یا None اگر بسته شد"""
+        msg = await ws_read_message(self.reader, self.writer, require_mask=False)
+        return None if msg is None else json.loads(msg[1])
+
+    async def send_command(self, cmd, **args):
+        self._next_id += 1
+        self.writer.write(ws_encode(OP_TEXT, json.dumps({"id": self._next_id, "cmd": cmd, "args": args}).encode(),
+                                    mask=True))
+        await self.writer.drain()
+        return self._next_id
+
+    async def ping(self):
+        """نگه داشتن deadman وقتی فرمانی برای فرستادن نیست"""
+        self.writer.write(ws_encode(OP_PING, b"", mask=True))
+        await self.writer.drain()
+
+    async def close(self):
+        try:
+            self.writer.write(ws_encode(OP_CLOSE, b"", mask=True))
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+        self.writer.close()
+
+
+# ==========================================
+# سنجش: چندین کلاینت، یک کلاینت کند و زمان رفت و برگشت فرمان
+# ==========================================
+
+def demo(clients=50, seconds=3.0, rate_hz=10.0):
+    """
+    سرور با مدل ساختگی و یک «ترد UI» که صف post را خالی می‌کند.
+    نشان می‌دهد: نرخ تله‌متری هر کلاینت <= rate_hz، snapshot مستقل از تعداد کلاینت‌ها،
+    کلاینت کند فقط فریم‌ها را از دست می‌دهد، و فرمان‌ها در ترد UI اجرا می‌شوند.
+    """
+    import queue
+
+    state = {"speed": 0, "ticks": 0}
+    ui_queue = queue.Queue()
+    ui_thread_ids = set()
+    ui_calls = [0]
+
+    def ui_loop():
+        while True:
+            func, args = ui_queue.get()
+            if func is None:
+                return
+            ui_calls[0] += 1
+            ui_thread_ids.add(threading.get_ident())
+            func(*args)
+
+    def set_speed(percent):
+        percent = int(percent)
+        if not 0 <= percent <= 100:
+            raise ValueError("speed out of range")
+        state["speed"] = percent
+        return {"speed": percent}
+
+    def snapshot():
+        state["ticks"] += 1   # تغییر در هر تیک: بدترین حالت برای ادغام
+        # بزرگ‌تر از snapshot واقعی تا پر شدن بافر کلاینت کند زودتر دیده شود
+        return {"pad": {"speed": state["speed"]}, "tick": state["ticks"], "log": "x" * 4096}
+
+    ui = threading.Thread(target=ui_loop, daemon=True)
+    ui.start()
+    api = RemoteAPI(port=0, rate_hz=rate_hz, max_clients=clients + 1)
+    api.snapshot = snapshot
+    api.commands["pad.set_speed"] = set_speed
+    api.post = lambda func, *args: ui_queue.put((func, args))
+    api.start()
+
+    async def run():
+        host, port = api.host, api.port
+        status, body = await http_request(host, port, "GET", "/state")
+        print(f"GET /state -> {status} pad={body['pad']} tick={body['tick']}")
+        status, body = await http_request(host, port, "POST", "/command", {"cmd": "pad.set_speed", "args": {"percent": 40}})
+        print(f"POST /command -> {status} {body}")
+        status, body = await http_request(host, port, "POST", "/command", {"cmd": "pad.set_speed", "args": {"percent": 400}})
+        print(f"POST /command (bad) -> {status} {body}")
+
+        counts = [0] * clients
+        stop = asyncio.Event()
+
+        async def listen(i, ws, slow):
+            while not stop.is_set():
+                msg = await ws.receive()
+                if msg is None:
+                    return
+                if msg["type"] == "telemetry":
+                    counts[i] += 1
+                    if slow:
+                        await asyncio.sleep(0.5)   # مصرف کننده کند
+
+        # کلاینت اول کند است و بافر دریافت کوچکی دارد (مثل یک لینک کند)
+        sockets = [await WebSocketClient.connect(host, port, limit=4096 if i == 0 else 2 ** 16) for i in range(clients)]
+        sockets[0].writer.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        listeners = [asyncio.create_task(listen(i, ws, slow=(i == 0))) for i, ws in enumerate(sockets)]
+
+        rtt = LatencyStats()
+        replies = asyncio.Queue()
+        commander = await WebSocketClient.connect(host, port)
+
+        async def commander_reader():
+            while True:
+                msg = await commander.receive()
+                if msg is None:
+                    return
+                if msg["type"] == "reply":
+                    await replies.put(msg)
+
+        reader_task = asyncio.create_task(commander_reader())
+        t_end = time.monotonic() + seconds
+        while time.monotonic() < t_end:
+            t0 = time.perf_counter()
+            await commander.send_command("pad.set_speed", percent=int(t0 * 1000) % 100)
+            reply = await replies.get()
+            assert reply["ok"], reply
+            rtt.add((time.perf_counter() - t0) * 1000.0)
+            await asyncio.sleep(0.05)
+        stop.set()
+        reader_task.cancel()
+        for task in listeners:
+            task.cancel()
+        for ws in sockets + [commander]:
+            await ws.close()
+
+        fast = counts[1:]
+        print(f"{clients} clients for {seconds:.0f} s at {rate_hz:.0f} Hz: "
+              f"{min(fast) / seconds:.1f}-{max(fast) / seconds:.1f} msg/s per client, slow client {counts[0] / seconds:.1f} msg/s")
+        print(rtt.format("websocket command round trip"))
+
+    try:
+        asyncio.run(run())
+    finally:
+        api.close()
+        ui_queue.put((None, ()))
+    print(f"snapshots built: {api.snapshots} (~{api.snapshots / seconds:.1f}/s, independent of client count); "
+          f"UI-thread calls: {ui_calls[0]} (commands only), UI threads used: {len(ui_thread_ids)}")
+    print(api.report())
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,254 @@
+import copy
+import json
+import os
+import threading
+import time
+
+from utils.stats import LatencyStats
+
+SCHEMA_VERSION = 2
+
+DEFAULTS = {
+    "version": SCHEMA_VERSION,
+    "settings": {
+        "speed": "10",        # مقدار پنل سرعت (% یا rpm)
+        "step": "100",        # مقدار پنل Step (um)
+        "speed_ccw": False,
+        "light": 50,          # موقعیت اسلایدر نور
+        "recipe": None,       # نام دستور انتخاب شده
+    },
+    "recipes": {},            # name -> recipe
+}
+
+
+def _migrate_v1(data):
+    """v1: تنظیمات در ریشه فایل و بدون recipes"""
+    settings = {k: v for k, v in data.items() if k != "version"}
+    return {"version": 2, "settings": settings, "recipes": {}}
+
+
+# نسخه -> تابع ارتقا به نسخه بعد
+MIGRATIONS = {1: _migrate_v1}
+
+
+class SettingsStore:
+    """
+    مخزن تنظیمات و دستورها.
+    فایل فقط یک بار در شروع خوانده می‌شود و همه خواندن‌ها از نسخه حافظه است.
+    نوشتن‌ها در ترد جداگانه و با تأخیر کوتاه ادغام می‌شوند و هر ذخیره یک
+    نوشتن اتمیک (فایل موقت + fsync + rename) است، پس کارت SD هیچ‌وقت هندلر
+    لمسی را معطل نمی‌کند و فایل نیمه‌نوشته باقی نمی‌ماند.
+    """
+
+    def __init__(self, path, batch_delay_s=0.5):
+        """
+        :param batch_delay_s: مدت جمع کردن تغییرات قبل از نوشتن (کاهش فرسایش فلش)
+        """
+        self.path = path
+        self.batch_delay_s = batch_delay_s
+
+        self._data = self._load()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._dirty_since = None
+        self._version = 0      # شمارنده تغییرات حافظه
+        self._saved = 0        # آخرین نسخه نوشته شده روی دیسک
+        # توابعی که پس از هر نوشتن موفق (در ترد نویسنده) صدا زده می‌شوند
+        self.listeners = []
+
+        # آمار
+        self.requests = 0       # تعداد set/update
+        self.writes = 0         # نوشتن واقعی روی فلش
+        self.bytes_written = 0
+        self.failures = 0
+        self.write_latency = LatencyStats(maxlen=200)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+        self._thread.start()
+
+    # ---------- بارگذاری ----------
+
+    def _load(self):
+        data = copy.deepcopy(DEFAULTS)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except FileNotFoundError:
+            return data
+        except (OSError, ValueError) as e:
+            return self._quarantine(data, e)
+        # JSON معتبر با ساختار اشتباه هم خراب است (مثلاً [] یا "settings": null)
+        if not isinstance(stored, dict) or not isinstance(stored.get("version", 1), int):
+            return self._quarantine(data, "not a settings object")
+
+        version = stored.get("version", 1)
+        while version < SCHEMA_VERSION:
+            migrate = MIGRATIONS.get(version)
+            if migrate is None:
+                return self._quarantine(data, f"unknown schema v{version}")
+            stored = migrate(stored)
+            version = stored["version"]
+            print(f"[SETTINGS] migrated to schema v{version}")
+        if not isinstance(stored.get("settings", {}), dict) or not isinstance(stored.get("recipes", {}), dict):
+            return self._quarantine(data, "settings/recipes are not objects")
+        if version > SCHEMA_VERSION:
+            print(f"[SETTINGS] schema v{version} is newer than supported v{SCHEMA_VERSION}; unknown keys kept")
+
+        # کلیدهای ناشناخته ریشه (و شماره نسخه جدیدتر) دوباره نوشته می‌شوند، نه حذف
+        for key, value in stored.items():
+            if key not in ("settings", "recipes"):
+                data[key] = value
+        data["settings"].update(stored.get("settings", {}))
+        data["recipes"].update(stored.get("recipes", {}))
+        return data
+
+    def _quarantine(self, data, reason):
+        """فایل خراب: نگه داشتن نسخه خراب برای بررسی و شروع با پیش‌فرض‌ها"""
+        print(f"[SETTINGS] {self.path} unreadable ({reason}); using defaults")
+        try:
+            os.replace(self.path, self.path + ".bad")
+        except OSError:
+            pass
+        return data
+
+    # ---------- خواندن (از حافظه) ----------
+
+    def get(self, key, default=None):
+        return self._data["settings"].get(key, default)
+
+    def recipe_names(self):
+        return sorted(self._data["recipes"])
+
+    def get_recipe(self, name):
+        recipe = self._data["recipes"].get(name)
+        return copy.deepcopy(recipe) if recipe is not None else None
+
+    # ---------- نوشتن (غیرهم‌زمان) ----------
+
+    def update(self, **values):
+        """تغییر چند تنظیم؛ فقط اگر واقعاً چیزی عوض شود نوشتن زمان‌بندی می‌شود"""
+        with self._cond:
+            self.requests += 1
+            settings = self._data["settings"]
+            changed = {k: v for k, v in values.items() if settings.get(k, object()) != v}
+            if not changed:
+                return False
+            settings.update(changed)
+            self._mark_dirty()
+        return True
+
+    def set(self, key, value):
+        return self.update(**{key: value})
+
+    def save_recipe(self, recipe):
+        with self._cond:
+            self.requests += 1
+            if self._data["recipes"].get(recipe["name"]) == recipe:
+                return False
+            self._data["recipes"][recipe["name"]] = copy.deepcopy(recipe)
+            self._mark_dirty()
+        return True
+
+    def delete_recipe(self, name):
+        with self._cond:
+            self.requests += 1
+            if self._data["recipes"].pop(name, None) is not None:
+                self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._version += 1
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        self._cond.notify()
+
+    def flush(self, timeout=2.0):
+        """انتظار تا نوشته شدن همه تغییرات (برای خاموش کردن)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._dirty_since = 0.0 if self._dirty_since is not None else None  # بدون انتظار ادغام
+            self._cond.notify_all()
+            while self._saved < self._version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+    # ---------- ترد نویسنده ----------
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._dirty_since is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                # ادغام: تغییرات پشت سر هم در یک نوشتن
+                wait = self._dirty_since + self.batch_delay_s - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                payload = json.dumps(self._data, indent=2, ensure_ascii=False)
+                version = self._version
+                self._dirty_since = None
+
+            t0 = time.perf_counter()
+            try:
+                self._write_atomic(payload)
+            except OSError as e:
+                self.failures += 1
+                print(f"[SETTINGS] write failed: {e}")
+                with self._cond:
+                    if self._dirty_since is None:
+                        self._dirty_since = time.monotonic()  # تلاش دوباره بعد از batch_delay
+                continue
+            self.write_latency.add((time.perf_counter() - t0) * 1000.0)
+
+            with self._cond:
+                self.writes += 1
+                self.bytes_written += len(payload.encode("utf-8"))
+                self._saved = max(self._saved, version)
+                self._cond.notify_all()
+            for listener in self.listeners:
+                listener()
+
+    def _write_atomic(self, payload):
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        # ثبت rename در دایرکتوری (در صورت قطع برق)
+        try:
+            fd = os.open(folder, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "writes": self.writes,
+            "bytes_written": self.bytes_written,
+            "failures": self.failures,
+            "write_latency": self.write_latency.summary(),
+        }
+
+    def report(self):
+        return (f"Settings store: {self.requests} changes -> {self.writes} flash writes "
+                f"({self.bytes_written} bytes, {self.failures} failures)\n"
+                + self.write_latency.format("  write latency"))
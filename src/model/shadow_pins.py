@@ -0,0 +1,123 @@
+import functools
+import threading
+
+
+class PinWriteStats:
+    """
+    شمارنده نوشتن‌های GPIO (صادر شده در برابر حذف شده).
+    یک نمونه سراسری (PIN_STATS) بین همه مدل‌ها مشترک است.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.issued = 0
+        self.elided = 0
+        self.per_pin = {}   # name -> [issued, elided]
+        self.actions = {}   # label -> [calls, issued, elided]
+        # تابع اختیاری که پس از هر نوشتن واقعی با نام پین صدا زده می‌شود (سنجش تأخیر)
+        self.listener = None
+
+    def record(self, name, issued):
+        with self._lock:
+            counts = self.per_pin.setdefault(name, [0, 0])
+            if issued:
+                self.issued += 1
+                counts[0] += 1
+            else:
+                self.elided += 1
+                counts[1] += 1
+        if issued and self.listener:
+            self.listener(name)
+
+    def snapshot(self):
+        return self.issued, self.elided
+
+    def record_action(self, label, before):
+        """ثبت ترافیک یک اکشن UI نسبت به snapshot قبلی"""
+        issued = self.issued - before[0]
+        elided = self.elided - before[1]
+        with self._lock:
+            row = self.actions.setdefault(label, [0, 0, 0])
+            row[0] += 1
+            row[1] += issued
+            row[2] += elided
+        return issued, elided
+
+    def reset(self):
+        with self._lock:
+            self.issued = 0
+            self.elided = 0
+            self.per_pin.clear()
+            self.actions.clear()
+
+    def report(self):
+        lines = [f"GPIO writes: issued={self.issued} elided={self.elided}"]
+        for name, (iss, eli) in sorted(self.per_pin.items()):
+            lines.append(f"  pin {name}: issued={iss} elided={eli}")
+        for label, (calls, iss, eli) in sorted(self.actions.items()):
+            lines.append(f"  action {label}: calls={calls} issued={iss} elided={eli}")
+        return "\n".join(lines)
+
+
+PIN_STATS = PinWriteStats()
+
+
+def track_writes(label):
+    """دکوراتور برای اندازه‌گیری ترافیک GPIO هر اکشن UI"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            before = PIN_STATS.snapshot()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PIN_STATS.record_action(label, before)
+        return wrapper
+    return decorator
+
+
+class ShadowPin:
+    """
+    رجیستر سایه روی یک خروجی gpiozero.
+    آخرین مقدار اعمال شده را نگه می‌دارد و نوشتن‌های تکراری را حذف می‌کند.
+    """
+
+    def __init__(self, device, name=None, stats=PIN_STATS):
+        self.device = device
+        self.name = name if name is not None else str(getattr(device, "pin", "?"))
+        self.stats = stats
+        self._value = None  # هنوز چیزی نوشته نشده؛ اولین نوشتن همیشه انجام می‌شود
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        return self._value if self._value is not None else 0
+
+    @value.setter
+    def value(self, value):
+        self.write(value)
+
+    def write(self, value):
+        """نوشتن مقدار؛ اگر با مقدار قبلی برابر باشد به سخت‌افزار نمی‌رسد"""
+        with self._lock:
+            if value == self._value:
+                self.stats.record(self.name, False)
+                return False
+            self.device.value = value
+            self._value = value
+        self.stats.record(self.name, True)
+        return True
+
+    def on(self):
+        return self.write(1)
+
+    def off(self):
+        return self.write(0)
+
+    def invalidate(self):
+        """فراموش کردن مقدار سایه (مثلاً اگر پین از مسیر دیگری تغییر کرده)"""
+        with self._lock:
+            self._value = None
+
+    def close(self):
+        self.device.close()
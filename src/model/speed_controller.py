@@ -0,0 +1,215 @@
+import threading
+import time
+
+from utils.stats import LatencyStats
+
+
+class SpeedController:
+    """
+    کنترلر PI دور پد با نرخ ثابت در ترد مستقل.
+    هر تیک در deadline از پیش محاسبه شده اجرا می‌شود (بدون انباشت خطای sleep)،
+    دور از Tachometer خوانده و duty از طریق PadModel.apply_duty اصلاح می‌شود.
+    تا وقتی رمپ شروع در جریان است اصلاحی انجام نمی‌شود و انتگرال‌گیر ثابت می‌ماند.
+    """
+
+    def __init__(self, pad, tach, rate_hz=50, kp=0.0002, ki=0.0015, max_rpm=3000.0):
+        """
+        :param kp: بهره تناسبی (duty به ازای هر rpm خطا)
+        :param ki: بهره انتگرالی (duty به ازای هر rpm·s)
+        :param max_rpm: دور تقریبی در duty=1 برای پیش‌خور (feed-forward)
+        """
+        self.pad = pad
+        self.tach = tach
+        self.rate_hz = rate_hz
+        self.kp = kp
+        self.ki = ki
+        self.max_rpm = max_rpm
+
+        self.target_rpm = 0.0
+        self.measured_rpm = 0.0
+        self.duty = 0.0
+        self._integral = 0.0
+
+        # متریک‌ها
+        self.jitter = LatencyStats()                 # تأخیر تیک نسبت به برنامه (ms)
+        self.tracking_error = LatencyStats()         # |خطای دور| (rpm) در تیک‌های فعال حلقه بسته
+        self.ticks = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ---------- API ----------
+
+    def feed_forward(self, rpm):
+        """duty اولیه تخمینی برای رسیدن به rpm (برای رمپ شروع)"""
+        return max(0.0, min(1.0, rpm / self.max_rpm))
+
+    def set_target(self, rpm):
+        with self._lock:
+            self.target_rpm = max(0.0, float(rpm))
+            self._integral = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="pad-speed-pi", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # ---------- حلقه کنترل ----------
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        next_tick = time.monotonic() + period
+        while True:
+            timeout = next_tick - time.monotonic()
+            if self._stop.wait(timeout) if timeout > 0 else self._stop.is_set():
+                return
+            now = time.monotonic()
+            self.jitter.add((now - next_tick) * 1000.0)
+            self.step(now, period)
+            next_tick += period
+            if now - next_tick > period:
+                next_tick = now + period  # تیک‌های عقب‌افتاده جبران نمی‌شوند
+
+    def step(self, now, dt):
+        """یک تیک کنترل (برای استفاده مستقیم در شبیه‌سازی هم قابل فراخوانی است)"""
+        self.ticks += 1
+        rpm = self.tach.rpm(now)
+        self.measured_rpm = rpm
+        with self._lock:
+            target = self.target_rpm
+            if target <= 0:
+                self._integral = 0.0
+                return
+            integral = self._integral
+        error = target - rpm
+        candidate = integral + error * dt
+        duty = self.feed_forward(target) + self.kp * error + self.ki * candidate
+        clamped = max(0.0, min(1.0, duty))
+        # ضد اشباع: در حالت اشباع انتگرال فقط به سمت خروج از اشباع تغییر می‌کند
+        unwinding = (duty > 1.0 and error < 0) or (duty < 0.0 and error > 0)
+
+        # اگر رمپ در جریان باشد یا پد متوقف شده باشد اصلاح رد می‌شود و انتگرال‌گیر ثابت می‌ماند
+        if self.pad.apply_duty(clamped):
+            if clamped == duty or unwinding:
+                with self._lock:
+                    if self.target_rpm == target:
+                        self._integral = candidate
+            self.duty = clamped
+            self.tracking_error.add(abs(error))
+        elif self.pad.current_speed == 0:
+            # پد از مسیر دیگری متوقف شده (STOP، توقف اضطراری، watchdog): هدف هم پاک شود
+            self.set_target(0)
+
+    def metrics(self):
+        err = self.tracking_error.summary()
+        return {
+            "target_rpm": self.target_rpm,
+            "measured_rpm": round(self.measured_rpm, 1),
+            "ticks": self.ticks,
+            "tick_jitter": self.jitter.summary(),
+            # مقادیر بر حسب rpm هستند (کلیدهای _ms از LatencyStats به ارث رسیده‌اند)
+            "tracking_error_rpm": {"count": err["count"], "mean": err["mean_ms"],
+                                   "p95": err["p95_ms"], "max": err["max_ms"]},
+        }
+
+    def report(self):
+        m = self.metrics()
+        e = m["tracking_error_rpm"]
+        return "\n".join([
+            self.jitter.format(f"Pad PI loop ({self.rate_hz} Hz) tick jitter"),
+            f"Pad PI tracking error: n={e['count']} mean={e['mean']:.1f} rpm "
+            f"p95={e['p95']:.1f} rpm max={e['max']:.1f} rpm",
+        ])
+
+
+class SimulatedMotor:
+    """
+    مدل مرتبه اول موتور پد برای آزمایش روی MockFactory.
+    duty از پین PWM پد خوانده می‌شود، دور با ثابت زمانی tau به سمت
+    max_rpm·duty·(1-load) می‌رود و پالس‌های تاکومتر روی پین mock تولید می‌شوند.
+    """
+
+    def __init__(self, pad, tach_pin, max_rpm=3000.0, tau_s=0.25, pulses_per_rev=2, step_hz=2000):
+        from gpiozero import Device
+
+        self.pad = pad
+        self.max_rpm = max_rpm
+        self.tau_s = tau_s
+        self.pulses_per_rev = pulses_per_rev
+        self.step_hz = step_hz
+        self.load = 0.0   # 0..1 کاهش گشتاور ناشی از بار/سایش پد
+        self.rpm = 0.0
+
+        self._mock = Device.pin_factory.pin(tach_pin)
+        self._phase = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sim-motor", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        dt = 1.0 / self.step_hz
+        next_t = time.monotonic()
+        while not self._stop.is_set():
+            next_t += dt
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            steady = self.max_rpm * self.pad.motor.value * (1.0 - self.load)
+            self.rpm += (steady - self.rpm) * dt / self.tau_s
+            self._phase += self.rpm / 60.0 * self.pulses_per_rev * dt
+            while self._phase >= 1.0:
+                self._phase -= 1.0
+                self._mock.drive_high()
+                self._mock.drive_low()
+
+
+def simulate(target_rpm=1500, seconds=4.0, load_step=0.2, tach_pin=21):
+    """
+    اجرای حلقه بسته روی موتور شبیه‌سازی شده: شروع، رسیدن به دور هدف و
+    اعمال پله بار در نیمه مسیر. خروجی: متریک‌های کنترلر
+    """
+    from model.pad_model import PadModel
+    from model.tachometer import Tachometer
+
+    pad = PadModel(12, 13, 6)
+    tach = Tachometer(tach_pin)
+    ctrl = SpeedController(pad, tach)
+    motor = SimulatedMotor(pad, tach_pin)
+    try:
+        motor.start()
+        ctrl.start()
+        pad.set_speed(int(ctrl.feed_forward(target_rpm) * 100))
+        ctrl.set_target(target_rpm)
+        time.sleep(seconds / 2)
+        motor.load = load_step
+        ctrl.tracking_error.reset()
+        time.sleep(seconds / 2)
+        return ctrl.metrics()
+    finally:
+        pad.stop_rotation()
+        ctrl.close()
+        motor.close()
+        tach.close()
+        pad.close()
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("GPIOZERO_PIN_FACTORY", "mock")
+    os.environ.setdefault("GPIOZERO_MOCK_PIN_CLASS", "mockpwmpin")
+    for key, value in simulate().items():
+        print(f"{key}: {value}")
@@ -0,0 +1,351 @@
+import bisect
+import math
+import threading
+import time
+from array import array
+from functools import lru_cache
+
+from utils.stats import LatencyStats, percentile
+
+
+@lru_cache(maxsize=32)
+def step_schedule(steps, max_rate, accel, start_rate=200.0):
+    """
+    زمان هر گام (ثانیه از شروع) برای پروفایل ذوزنقه‌ای سرعت.
+    در فاز شتاب زمان گام n از حل v0·t + a·t²/2 = n به دست می‌آید،
+    سپس سرعت ثابت و فاز کاهش قرینه فاز شتاب است.
+    :param max_rate: حداکثر نرخ گام (step/s)
+    :param accel: شتاب (step/s²)
+    :param start_rate: نرخ شروع بدون شتاب (step/s)
+    """
+    steps = abs(int(steps))
+    if steps == 0:
+        return ()
+    start_rate = min(start_rate, max_rate)
+    # تعداد گام لازم برای رسیدن به max_rate (حداکثر نصف مسیر)
+    ramp_steps = int((max_rate ** 2 - start_rate ** 2) / (2 * accel))
+    ramp_steps = min(ramp_steps, steps // 2)
+
+    ramp = [(math.sqrt(start_rate ** 2 + 2 * accel * n) - start_rate) / accel for n in range(ramp_steps)]
+    peak_rate = math.sqrt(start_rate ** 2 + 2 * accel * ramp_steps)
+    cruise_start = (peak_rate - start_rate) / accel
+    cruise_steps = steps - 2 * ramp_steps
+    cruise = [cruise_start + i / peak_rate for i in range(cruise_steps)]
+
+    # فاز کاهش: آینه فاز شتاب
+    times = ramp + cruise
+    if ramp:
+        end = times[-1] + cruise_start
+        times.extend(end - x for x in reversed(ramp))
+    return tuple(times)
+
+
+# حداقل زمان high (و low) پالس Step؛ درایورهای رایج 1.9 تا 2.5 µs لازم دارند
+PULSE_HIGH_S = 5e-6
+PR_SET_TIMERSLACK = 29
+
+
+def wave_chunks(schedule, high_us, chunk_s=0.01):
+    """
+    تبدیل برنامه گام‌ها به تکه‌های شکل موج برای صف ارسال lgpio.
+    هر گام یک جفت (high_us, low_us) است؛ low تا لبه بالای گام بعد ادامه دارد و زمان‌ها
+    از روی برنامه مطلق گرد می‌شوند تا خطای گرد کردن جمع نشود. هر تکه حدود chunk_s طول می‌کشد.
+    خروجی: فهرست (اندیس اولین گام، [(high_us, low_us), ...])
+    """
+    rises = [int(round(t * 1e6)) for t in schedule]
+    chunks = []
+    chunk_us = chunk_s * 1e6
+    for i, rise in enumerate(rises):
+        low = rises[i + 1] - rise - high_us if i + 1 < len(rises) else high_us
+        if not chunks or rise - rises[chunks[-1][0]] >= chunk_us:
+            chunks.append((i, []))
+        chunks[-1][1].append((high_us, max(high_us, low)))
+    return chunks
+
+
+class SoftwarePulses:
+    """
+    ارسال پالس‌ها از ترد پایتون (پشتیبان وقتی صف lgpio در دسترس نیست).
+    تا هر deadline مطلق با time.sleep می‌خوابد (GIL آزاد است و حلقه Tk و callback های
+    gpiozero گرسنه نمی‌مانند) و فقط حداقل زمان high/low پالس را فعال صبر می‌کند.
+    اگر خواب دیر بیدار شود، عقب‌ماندگی با گام‌هایی حداکثر CATCHUP برابر تندتر از پروفایل
+    جبران می‌شود، نه با رگبار پالس‌های پشت سر هم که استپر را از گام می‌اندازد.
+    """
+    name = "software"
+    CATCHUP = 2.0
+
+    def __init__(self, device, min_high_s=PULSE_HIGH_S):
+        self.device = device
+        self.min_high_s = min_high_s
+
+    @staticmethod
+    def _tight_sleep():
+        """
+        کاهش timer slack همین ترد (پیش‌فرض لینوکس 50 µs) تا خواب‌های کوتاه دقیق بیدار شوند.
+        روی سیستم‌های دیگر بی‌اثر است.
+        """
+        try:
+            import ctypes
+            ctypes.CDLL(None).prctl(PR_SET_TIMERSLACK, 1000, 0, 0, 0)
+        except (OSError, AttributeError):
+            pass
+
+    def run(self, schedule, planned, actual, should_stop):
+        """
+        ارسال برنامه؛ (تعداد گام ارسال شده، تعداد نمونه زمان‌بندی در planned/actual) برمی‌گرداند.
+        should_stop قبل از هر پالس و بعد از هر خواب بررسی می‌شود.
+        """
+        self._tight_sleep()
+        step = self.device
+        high = self.min_high_s
+        clock = time.perf_counter
+        t0 = clock()
+        t_on = t_off = t0 - high
+        prev = 0.0
+        for i, offset in enumerate(schedule):
+            if should_stop():
+                return i, i
+            deadline = max(t0 + offset, t_on + (offset - prev) / self.CATCHUP)
+            prev = offset
+            remaining = deadline - clock()
+            if remaining > 0:
+                time.sleep(remaining)
+                if should_stop():
+                    return i, i
+            while clock() - t_off < high:
+                pass
+            step.on()
+            t_on = clock()
+            while clock() - t_on < high:
+                pass
+            step.off()
+            t_off = clock()
+            planned[i] = offset
+            actual[i] = t_on - t0
+        return len(schedule), len(schedule)
+
+
+class LgpioPulses:
+    """
+    ارسال پالس‌ها با صف شکل موج lgpio (tx_wave): زمان‌بندی هر لبه در ترد C خود lgpio
+    انجام می‌شود، نه در پایتون. برنامه در تکه‌های کوتاه (CHUNK_S) و حداکثر QUEUED تکه جلوتر
+    فرستاده می‌شود تا توقف سریع بماند؛ توقف صف را با tx_pulse(0, 0) خالی می‌کند.
+    زمان پایان هر تکه (از tx_room) برای خطای نرخ و لرزش ثبت می‌شود.
+    """
+    name = "lgpio"
+    CHUNK_S = 0.01
+    QUEUED = 2
+    POLL_S = 0.0005
+
+    def __init__(self, lgpio, handle, gpio, min_high_s=PULSE_HIGH_S):
+        self.lgpio = lgpio
+        self.handle = handle
+        self.gpio = gpio
+        self.high_us = max(1, int(round(min_high_s * 1e6)))
+
+    def run(self, schedule, planned, actual, should_stop):
+        lg, h, gpio = self.lgpio, self.handle, self.gpio
+        chunks = wave_chunks(schedule, self.high_us, self.CHUNK_S)
+        room0 = lg.tx_room(h, gpio, lg.TX_WAVE)
+        sent = finished = marks = 0
+        t0 = time.perf_counter()
+        while finished < len(chunks):
+            if should_stop():
+                lg.tx_pulse(h, gpio, 0, 0)
+                # گام‌های تکه در حال اجرا از روی زمان سپری شده تخمین زده می‌شوند
+                first = chunks[finished][0]
+                last = chunks[sent][0] if sent < len(chunks) else len(schedule)
+                done = bisect.bisect_right(schedule, time.perf_counter() - t0)
+                return min(max(done, first), last), marks
+            while sent < len(chunks) and sent - finished < self.QUEUED:
+                pulses = []
+                for high_us, low_us in chunks[sent][1]:
+                    pulses.append(lg.pulse(1, 1, high_us))
+                    pulses.append(lg.pulse(0, 1, low_us))
+                lg.tx_wave(h, gpio, pulses)
+                sent += 1
+            time.sleep(self.POLL_S)
+            now_finished = sent - (room0 - lg.tx_room(h, gpio, lg.TX_WAVE))
+            if now_finished > finished:
+                finished = now_finished
+                # پایان تکه = لبه بالای گام بعد از آن (یا پایان آخرین پالس)
+                end = chunks[finished][0] if finished < len(chunks) else len(schedule)
+                planned[marks] = schedule[end] if end < len(schedule) else schedule[-1] + 2 * self.high_us / 1e6
+                actual[marks] = time.perf_counter() - t0
+                marks += 1
+        return len(schedule), marks
+
+
+def make_pulse_backend(device, gpio, min_high_s=PULSE_HIGH_S):
+    """
+    صف شکل موج lgpio اگر کارخانه پین gpiozero lgpio باشد (پیش‌فرض Pi 5)، وگرنه ارسال نرم‌افزاری.
+    پین قبلاً توسط gpiozero روی همان handle به عنوان خروجی گرفته شده است.
+    """
+    factory = device.pin_factory
+    if type(factory).__name__ == "LGPIOFactory":
+        try:
+            import lgpio
+            return LgpioPulses(lgpio, factory._handle, gpio, min_high_s)
+        except (ImportError, AttributeError) as e:
+            print(f"[STEP] lgpio wave unavailable ({e}), using software pulses")
+    return SoftwarePulses(device, min_high_s)
+
+
+class StepGenerator:
+    """
+    مولد قطار پالس Step/Dir برای ستون با درایور استپر.
+    برنامه زمانی همه گام‌ها از قبل محاسبه می‌شود و یک backend آن را ارسال می‌کند:
+    روی lgpio صف شکل موج tx_wave (زمان‌بندی در ترد C، بدون حلقه پایتون برای هر گام)،
+    در غیر این صورت SoftwarePulses که تا deadline های مطلق می‌خوابد. حداقل زمان high
+    هر پالس (min_high_s) در هر دو تضمین می‌شود.
+    API آن مثل ColumnPositioner است (move_by / busy / position_um) تا Presenter
+    بدون تغییر از آن استفاده کند.
+    """
+
+    def __init__(self, column, steps_per_um=1.0, max_rate=4000.0, accel=20000.0, start_rate=200.0,
+                 up_is_positive=True, min_high_s=PULSE_HIGH_S, backend=None):
+        """
+        :param column: ColumnModel (پین EN/Pulse به عنوان Step و پین DIR)
+        :param backend: SoftwarePulses / LgpioPulses؛ None یعنی انتخاب خودکار
+        """
+        self.column = column
+        self.steps_per_um = steps_per_um
+        self.max_rate = max_rate
+        self.accel = accel
+        self.start_rate = start_rate
+        self.up_is_positive = up_is_positive
+        # دسترسی مستقیم به پین Step (هر پالس از رجیستر سایه و آمار عبور نکند)
+        self._step = column.motor_enable.device
+        self.backend = backend or make_pulse_backend(self._step, column.en_pin, min_high_s)
+
+        self.position_steps = 0
+        self.busy = False
+        self.history = []   # (steps, rate_error_pct, duration_s)
+        # تأخیر نسبت به برنامه (ms): هر گام در ارسال نرم‌افزاری، پایان هر تکه در lgpio
+        self.jitter = LatencyStats()
+        self._abort = threading.Event()
+        self._thread = None
+
+    @property
+    def position_um(self):
+        return self.position_steps / self.steps_per_um
+
+    def move_by(self, um, on_done=None):
+        """
+        شروع حرکت نسبی؛ بلافاصله برمی‌گردد.
+        :param on_done: تابع (final_error_um) در ترد مولد؛ None یعنی حرکت لغو شد
+        """
+        if self.busy:
+            return False
+        interlock = getattr(self.column, "interlock", None)
+        if interlock and not interlock():
+            return False
+        steps = int(round(um * self.steps_per_um))
+        if steps == 0:
+            return False
+        self.busy = True
+        self._abort.clear()
+        self._thread = threading.Thread(target=self._run, args=(steps, on_done), name="column-steps", daemon=True)
+        self._thread.start()
+        return True
+
+    def abort(self):
+        self._abort.set()
+
+    def _run(self, steps, on_done):
+        direction = 1 if steps > 0 else -1
+        schedule = step_schedule(abs(steps), self.max_rate, self.accel, self.start_rate)
+        planned = array("d", bytes(8 * (len(schedule) + 1)))
+        actual = array("d", bytes(8 * (len(schedule) + 1)))
+        done = marks = 0
+        column = self.column
+        abort = self._abort
+        allowed = getattr(column, "interlock", None) or (lambda: True)
+
+        def should_stop():
+            # توقف از مسیر دیگر (STOP، توقف اضطراری، watchdog) یا لغو؛ قبل از هر پالس،
+            # چون column.stop() پین Step را (که همین backend می‌راند) خاموش نگه نمی‌دارد
+            return abort.is_set() or column.moving_since is None or not allowed()
+
+        try:
+            if (direction > 0) == self.up_is_positive:
+                column.motor_dir.on()
+            else:
+                column.motor_dir.off()
+            column.moving_since = time.monotonic()
+            time.sleep(0.0001)   # زمان setup جهت در درایور
+            done, marks = self.backend.run(schedule, planned, actual, should_stop)
+        finally:
+            self.position_steps += direction * done
+            column.stop()
+            column.motor_enable.invalidate()
+            self.busy = False
+
+        self._record(planned, actual, marks, done)
+        if on_done:
+            on_done((direction * done - steps) / self.steps_per_um if done == len(schedule) else None)
+
+    def _record(self, planned, actual, marks, done):
+        for i in range(marks):
+            self.jitter.add((actual[i] - planned[i]) * 1000.0)
+        if marks > 1:
+            span = planned[marks - 1] - planned[0]
+            achieved = actual[marks - 1] - actual[0]
+            rate_error = (span / achieved - 1.0) * 100.0 if achieved > 0 else 0.0
+            self.history.append((done, rate_error, achieved))
+
+    def report(self):
+        if not self.history:
+            return f"Column step moves ({self.backend.name}): 0"
+        errors = [e for _, e, _ in self.history]
+        label = "  step jitter" if self.backend.name == "software" else "  chunk end lateness"
+        return "\n".join([
+            f"Column step moves ({self.backend.name}): {len(self.history)} "
+            f"rate error mean={sum(errors) / len(errors):+.2f}% "
+            f"p95|err|={percentile([abs(e) for e in errors], 95):.2f}%",
+            self.jitter.format(label),
+        ])
+
+
+def capture_on_mock_pin(steps=2000, max_rate=2000.0, accel=10000.0, step_pin=19, dir_pin=5):
+    """
+    اجرای یک حرکت روی MockFactory و ضبط پالس‌ها از تاریخچه حالت پین Step.
+    خروجی: (تعداد پالس ضبط شده، خطای نرخ میانگین %، حداکثر فاصله بین پالس‌ها ms،
+    کوتاه‌ترین زمان high پالس µs)
+    """
+    from gpiozero import Device
+    from model.column_model import ColumnModel
+
+    column = ColumnModel(step_pin, dir_pin)
+    gen = StepGenerator(column, steps_per_um=1.0, max_rate=max_rate, accel=accel)
+    pin = Device.pin_factory.pin(step_pin)
+    pin.clear_states()
+    finished = threading.Event()
+    try:
+        gen.move_by(steps, on_done=lambda err: finished.set())
+        finished.wait()
+        # timestamp هر حالت MockPin فاصله از تغییر قبلی است
+        t, rises, highs = 0.0, [], []
+        for prev, state in zip(pin.states, pin.states[1:]):
+            t += state.timestamp
+            if state.state and not prev.state:
+                rises.append(t)
+            elif prev.state and not state.state:
+                highs.append(state.timestamp)
+        gaps = [b - a for a, b in zip(rises, rises[1:])]
+        schedule = step_schedule(steps, max_rate, accel)
+        planned = schedule[-1] - schedule[0]
+        achieved = rises[-1] - rises[0] if len(rises) > 1 else 0.0
+        rate_error = (planned / achieved - 1.0) * 100.0 if achieved else 0.0
+        return (len(rises), rate_error, max(gaps) * 1000.0 if gaps else 0.0,
+                min(highs) * 1e6 if highs else 0.0)
+    finally:
+        column.close()
+
+
+if __name__ == "__main__":
+    import os
+    os.environ.setdefault("GPIOZERO_PIN_FACTORY", "mock")
+    count, err, max_gap, min_high = capture_on_mock_pin()
+    print(f"captured {count} pulses, rate error {err:+.2f}%, max gap {max_gap:.3f} ms, "
+          f"min high {min_high:.1f} us")
@@ -0,0 +1,80 @@
+import threading
+import time
+from array import array
+
+from gpiozero import DigitalInputDevice
+
+
+class Tachometer:
+    """
+    اندازه‌گیری دور پد از پالس‌های تاکومتر/سنسور هال.
+    زمان هر لبه در یک بافر حلقوی از پیش تخصیص یافته (array از double) نوشته
+    می‌شود، پس در مسیر callback هیچ شیء جدیدی نگه داشته نمی‌شود. دور روی یک
+    پنجره لغزان از فاصله اولین تا آخرین لبه داخل پنجره محاسبه می‌شود.
+    """
+
+    def __init__(self, pin, pulses_per_rev=2, window_s=0.25, capacity=512, pull_up=False,
+                 clock=time.monotonic):
+        """
+        :param pulses_per_rev: تعداد پالس در هر دور
+        :param window_s: طول پنجره اندازه‌گیری؛ اگر در این مدت لبه‌ای نیاید دور صفر است
+        :param capacity: حداکثر لبه‌های نگه‌داشته شده (باید از لبه‌های یک پنجره بیشتر باشد)
+        """
+        self.pin = pin
+        self.pulses_per_rev = pulses_per_rev
+        self.window_s = window_s
+        self.clock = clock
+
+        self._times = array("d", bytes(8 * capacity))
+        self._capacity = capacity
+        self._head = 0      # محل نوشتن لبه بعدی
+        self.edge_count = 0
+        self._lock = threading.Lock()
+
+        self.sensor = None
+        if pin is not None:
+            self.sensor = DigitalInputDevice(pin, pull_up=pull_up)
+            self.sensor.when_activated = self._on_edge
+
+    def _on_edge(self):
+        """در ترد gpiozero اجرا می‌شود"""
+        self.record_edge(self.clock())
+
+    def record_edge(self, t):
+        with self._lock:
+            self._times[self._head] = t
+            self._head = (self._head + 1) % self._capacity
+            self.edge_count += 1
+
+    def rpm(self, now=None):
+        """دور فعلی روی پنجره لغزان"""
+        now = self.clock() if now is None else now
+        start = now - self.window_s
+        with self._lock:
+            available = min(self.edge_count, self._capacity)
+            if available < 2:
+                return 0.0
+            last_idx = (self._head - 1) % self._capacity
+            last = self._times[last_idx]
+            if last < start:
+                return 0.0   # پد ایستاده یا خیلی کند است
+            first = last
+            n = 1
+            while n < available:
+                t = self._times[(last_idx - n) % self._capacity]
+                if t < start:
+                    break
+                first = t
+                n += 1
+        if n < 2 or last <= first:
+            return 0.0
+        return (n - 1) / (last - first) / self.pulses_per_rev * 60.0
+
+    def reset(self):
+        with self._lock:
+            self._head = 0
+            self.edge_count = 0
+
+    def close(self):
+        if self.sensor is not None:
+            self.sensor.close()
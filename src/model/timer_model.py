@@ -0,0 +1,93 @@
+import math
+import time
+
+
+def format_hms(seconds):
+    """ثانیه -> 'HH:MM:SS'"""
+    seconds = max(0, int(seconds))
+    h, rem = divmod(seconds, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h:02d}:{m:02d}:{s:02d}"
+
+
+class Stopwatch:
+    """
+    کرنومتر مبتنی بر ساعت monotonic.
+    زمان از روی لحظه شروع محاسبه می‌شود (نه جمع تیک‌ها) پس در چرخه‌های
+    چند ساعته هم خطا انباشته نمی‌شود.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.running = False
+        self._start = 0.0
+        self._accum = 0.0  # زمان بخش‌های قبلی (قبل از آخرین توقف)
+
+    def start(self):
+        if not self.running:
+            self._start = self.clock()
+            self.running = True
+
+    def stop(self):
+        if self.running:
+            self._accum += self.clock() - self._start
+            self.running = False
+
+    def reset(self):
+        self.running = False
+        self._accum = 0.0
+
+    def elapsed(self):
+        if self.running:
+            return self._accum + (self.clock() - self._start)
+        return self._accum
+
+    def displayed(self):
+        """ثانیه نمایش داده شده"""
+        return int(self.elapsed())
+
+    def seconds_to_next_change(self):
+        """فاصله تا تغییر عدد نمایش داده شده"""
+        e = self.elapsed()
+        return math.floor(e) + 1 - e
+
+
+class Countdown:
+    """تایمر معکوس روی همان Stopwatch"""
+
+    def __init__(self, duration=0, clock=time.monotonic):
+        self.duration = duration
+        self._sw = Stopwatch(clock)
+
+    @property
+    def running(self):
+        return self._sw.running
+
+    def set_duration(self, seconds):
+        self.duration = max(0, int(seconds))
+        self._sw.reset()
+
+    def start(self):
+        if self.duration > 0 and not self.finished:
+            self._sw.start()
+
+    def stop(self):
+        self._sw.stop()
+
+    def reset(self):
+        self._sw.reset()
+
+    def remaining(self):
+        return max(0.0, self.duration - self._sw.elapsed())
+
+    @property
+    def finished(self):
+        return self.duration > 0 and self.remaining() <= 0
+
+    def displayed(self):
+        """ثانیه باقیمانده نمایش داده شده (گرد به بالا تا 0 فقط در پایان دیده شود)"""
+        return int(math.ceil(self.remaining()))
+
+    def seconds_to_next_change(self):
+        r = self.remaining()
+        return r - (math.ceil(r) - 1)
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import deque
+
+
+class SafetyWatchdog:
+    """
+    نگهبان ایمنی در ترد مستقل.
+    UI به صورت دوره‌ای feed() را صدا می‌زند؛ اگر ضربان دیرتر از timeout برسد
+    (حلقه Tk گیر کرده است) همه عملگرها مستقیماً متوقف می‌شوند.
+    همچنین حرکت نگه‌داشتنی ستون بیشتر از max_hold ثانیه اجازه داده نمی‌شود
+    (مثلاً اگر رویداد ButtonRelease گم شود).
+    """
+
+    def __init__(self, pad=None, column=None, lissa=None, timeout_s=1.0, max_hold_s=8.0,
+                 check_interval_s=0.05, log=print):
+        self.pad = pad
+        self.column = column
+        self.lissa = lissa
+        self.timeout_s = timeout_s
+        self.max_hold_s = max_hold_s
+        self.check_interval_s = check_interval_s
+        self.log = log
+
+        self.trips = deque(maxlen=100)  # (wall_time, reason, stall_ms)
+        # توابع (reason, stall_ms) که بعد از توقف ایمن در ترد نگهبان صدا زده می‌شوند
+        self.listeners = []
+        self.stalled = False
+        self._stall_from = 0.0
+
+        self._last_feed = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._last_feed = time.monotonic()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="safety-watchdog", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def feed(self):
+        """ضربان UI (از ترد Tk)"""
+        self._last_feed = time.monotonic()
+
+    # ---------- ترد نگهبان ----------
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval_s):
+            self.check()
+
+    def check(self, now=None):
+        """یک بار بررسی (برای استفاده مستقیم در تست هم قابل فراخوانی است)"""
+        now = time.monotonic() if now is None else now
+        last_feed = self._last_feed
+        stall = now - last_feed
+
+        if stall > self.timeout_s:
+            if not self.stalled:
+                self.stalled = True
+                self._stall_from = last_feed
+                self._trip("ui-stall", stall, all_actuators=True)
+        elif self.stalled:
+            # طول کامل گیر کردن: فاصله دو ضربان متوالی
+            self.stalled = False
+            total_ms = (last_feed - self._stall_from) * 1000.0
+            self.trips.append((time.time(), "ui-stall-total", total_ms))
+            self.log(f"[WATCHDOG] UI recovered; total stall {total_ms:.0f} ms")
+
+        moving_since = getattr(self.column, "moving_since", None)
+        if moving_since is not None and now - moving_since > self.max_hold_s:
+            self._trip("column-hold", now - moving_since, all_actuators=False)
+
+    def _trip(self, reason, stall_s, all_actuators):
+        stall_ms = stall_s * 1000.0
+        self.trips.append((time.time(), reason, stall_ms))
+        self.log(f"[WATCHDOG] TRIP ({reason}): {stall_ms:.0f} ms -> safe stop")
+
+        # هر عملگر جداگانه؛ خطای یکی نباید مانع توقف بقیه شود
+        actions = []
+        if all_actuators and self.pad is not None:
+            actions.append(("pad", self.pad.stop_rotation))
+        if self.column is not None:
+            actions.append(("column", self.column.stop))
+        if all_actuators and self.lissa is not None:
+            actions.append(("lissa", lambda: self.lissa.set_state(False)))
+        for name, action in actions:
+            try:
+                action()
+            except Exception as e:
+                self.log(f"[WATCHDOG] failed to stop {name}: {e}")
+        for listener in self.listeners:
+            listener(reason, stall_ms)
@@ -0,0 +1,205 @@
+import time
+
+from PIL import Image, ImageDraw, ImageTk
+
+from utils.perf import timed
+
+class CameraPresenter:
+    """
+    نمایش آخرین فریم حلقه مشترک دوربین با نرخ نمایش.
+    در هر تیک فقط جدیدترین فریم خوانده می‌شود؛ فریم‌های میانی رد می‌شوند و
+    فریمی که هنگام خواندن بازنویسی شده (پاره) نمایش داده نمی‌شود.
+    تبدیل: Image.frombuffer روی نمای حافظه مشترک (تنها کپی خارج از حلقه) و
+    paste روی یک PhotoImage ثابت با همان حالت RGB (بدون تبدیل حالت و بدون ساخت تصویر جدید Tk).
+    وقتی صفحه دوربین دیده نمی‌شود هیچ تبدیلی انجام نمی‌شود.
+    با inspector، فریم‌ها (فقط شماره فریم) برای بازرسی به استخر پروسه فرستاده می‌شوند و
+    آخرین نتیجه روی تصویر رسم و قبول/رد در نوار وضعیت نمایش داده می‌شود.
+    دکمه AUTO FOCUS فوکوس خودکار را در ترد خودش اجرا می‌کند.
+    با archive، دکمه SNAPSHOT (و پایان دستور از main) فریم فعلی را بدون انتظار بایگانی می‌کند.
+    """
+    DISPLAY_MS = 33    # ~30 fps
+    IDLE_MS = 250      # صفحه دوربین پنهان است
+    STATS_MS = 500
+    INSPECT_MS = 250   # حداقل فاصله ارسال فریم برای بازرسی
+    DEFECT_COLORS = {"scratch": (255, 200, 0), "pit": (255, 120, 0), "contamination": (255, 40, 40)}
+
+    def __init__(self, camera, view, inspector=None, autofocus=None, archive=None):
+        self.camera = camera
+        self.view = view
+        self.inspector = inspector
+        self.autofocus = autofocus
+        self.archive = archive
+        self.inspection = None   # آخرین نتیجه بازرسی
+        self.photo = None
+        self._after = None
+        self._inspect_at = 0.0
+
+        self.last_id = 0
+        self.shown = 0
+        self.dropped = 0     # فریم‌هایی که ضبط شد ولی هیچ‌وقت نمایش داده نشد
+        self.torn = 0
+        self._window_start = time.monotonic()
+        self._window_shown = 0
+        self.display_fps = 0.0
+        self._stats_at = 0.0
+
+        if self.inspector:
+            self.inspector.listeners.append(lambda result: self.view.dispatcher.post(self._on_inspection, result))
+        self.bind_events()
+
+    def bind_events(self):
+        """اتصال به پنل دوربین پس از ساخت تنبل آن (قابل فراخوانی مجدد)"""
+        label = self.view.control_widgets.get("camera_image")
+        if label is None or self.photo is not None:
+            return
+        btn_af = self.view.control_widgets["camera_af"]
+        if self.autofocus:
+            btn_af.configure(command=self.on_autofocus)
+        else:
+            btn_af.state(["disabled"])
+        btn_snap = self.view.control_widgets["camera_snap"]
+        if self.archive:
+            btn_snap.configure(command=lambda: self.archive_frame(reason="snapshot"))
+        else:
+            btn_snap.state(["disabled"])
+        self.photo = ImageTk.PhotoImage("RGB", self.camera.size)
+        label.configure(image=self.photo, text="")
+        self._tick()
+
+    def _tick(self):
+        if self.view.views.current != "camera":
+            # فریم‌های زمان پنهان بودن صفحه جزو رد شده‌ها حساب نشوند
+            self.last_id = 0
+            self._after = self.view.after(self.IDLE_MS, self._tick)
+            return
+        self._after = self.view.after(self.DISPLAY_MS, self._tick)
+        self._show_latest()
+
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self.display_fps = self._window_shown / (now - self._window_start)
+            self._window_start, self._window_shown = now, 0
+        if now - self._stats_at >= self.STATS_MS / 1000.0:
+            self._stats_at = now
+            self._render_stats()
+
+    @timed("camera.frame")
+    def _show_latest(self):
+        ring = self.camera.ring
+        frame_id = ring.latest_id()
+        if not frame_id or frame_id == self.last_id:
+            return  # فریم جدیدی نیست
+        got = ring.acquire(frame_id)
+        if got is None:
+            self.torn += 1
+            return
+        view, seq, _ = got
+        try:
+            im = Image.frombuffer("RGB", self.camera.size, view, "raw", "RGB", 0, 1)
+        finally:
+            view.release()
+        if not ring.still_valid(frame_id, seq):
+            self.torn += 1
+            return
+        if self.inspection is not None:
+            self._draw_overlay(im, self.inspection)  # im کپی خودمان است
+        self.photo.paste(im)
+
+        now = time.monotonic()
+        if self.inspector and now - self._inspect_at >= self.INSPECT_MS / 1000.0 and not self.inspector.busy:
+            self._inspect_at = now
+            self.inspector.submit(frame_id)
+
+        if self.last_id:
+            self.dropped += max(0, frame_id - self.last_id - 1)
+        self.last_id = frame_id
+        self.shown += 1
+        self._window_shown += 1
+
+    # ---------- فوکوس خودکار ----------
+
+    @timed("camera.autofocus")
+    def on_autofocus(self):
+        if self.autofocus.busy:
+            self.autofocus.abort()
+            return
+        if self.autofocus.run(on_done=lambda result: self.view.dispatcher.post(self._on_focus_done, result)):
+            self.view.ui_state.set("camera_af", text="■ STOP AF", bootstyle="warning")
+            self.view.ui_state.set("status_step", text="State: FOCUSING", bootstyle="inverse-warning")
+
+    def _on_focus_done(self, result):
+        self.view.ui_state.set("camera_af", text="AUTO FOCUS", bootstyle="info")
+        if result is None:
+            self.view.ui_state.set("status_step", text="AF: aborted", bootstyle="inverse-secondary")
+            return
+        self.view.ui_state.set("status_step", text=f"AF: {result['offset_um']:+.1f} um in {result['duration_s']:.1f} s",
+                               bootstyle="inverse-secondary")
+
+    # ---------- بایگانی ----------
+
+    @timed("camera.archive")
+    def archive_frame(self, **meta):
+        """
+        ارسال آخرین فریم (با نتیجه بازرسی اخیر) به بایگانی؛ فقط یک کپی از حلقه
+        و قرار دادن در صف. meta: run, recipe و ... (پیوند به اجرای دستور)
+        """
+        if self.archive is None:
+            return False
+        got = self.camera.ring.read_copy()
+        if got is None:
+            return False
+        frame_id, data, _ = got
+        result = self.inspection
+        if result is not None:
+            meta.setdefault("verdict", "PASS" if result["passed"] else "FAIL")
+            meta.setdefault("focus", result["focus"])
+        meta["frame_id"] = frame_id
+        return self.archive.submit(data, self.camera.size, **meta)
+
+    # ---------- بازرسی ----------
+
+    def _on_inspection(self, result):
+        self.inspection = result
+        if not result["found"]:
+            self.view.ui_state.set("inspection", text="FACE: NO FIBER", bootstyle="inverse-warning")
+        elif result["passed"]:
+            self.view.ui_state.set("inspection", text="FACE: PASS", bootstyle="inverse-success")
+        else:
+            self.view.ui_state.set("inspection", text=f"FACE: FAIL ({result['failures'][0].split(':')[0]})",
+                                   bootstyle="inverse-danger")
+
+    def _draw_overlay(self, im, result):
+        draw = ImageDraw.Draw(im)
+        for x, y, size, cls in result["cells"]:
+            draw.rectangle((x, y, x + size - 1, y + size - 1), outline=self.DEFECT_COLORS[cls])
+        if result["found"]:
+            cx, cy = result["cx"], result["cy"]
+            for r, color in ((result["r_clad"], (0, 200, 255)), (result["r_core"], (0, 255, 120))):
+                if r:
+                    draw.ellipse((cx - r, cy - r, cx + r, cy + r), outline=color)
+        verdict = "PASS" if result["passed"] else "FAIL"
+        draw.text((8, im.height - 18), f"{verdict}  focus {result['focus']:.0f}  {result['ms']:.0f} ms",
+                  fill=(255, 255, 255))
+
+    def _render_stats(self):
+        if not self.camera.has_signal():
+            self.view.ui_state.set("camera_stats", text="NO SIGNAL", bootstyle="inverse-danger")
+            return
+        st = self.camera.stats()
+        self.view.ui_state.set(
+            "camera_stats",
+            text=f"CAM {st['capture_fps']:4.1f} fps | UI {self.display_fps:4.1f} fps | dropped {self.dropped}",
+            bootstyle="inverse-dark",
+        )
+
+    def close(self):
+        if self.autofocus:
+            self.autofocus.abort()
+        if self._after is not None:
+            self.view.after_cancel(self._after)
+            self._after = None
+
+    def report(self):
+        st = self.camera.stats()
+        return (f"Camera: captured {st['frames']} ({st['capture_fps']:.1f} fps, {st['overruns']} overruns), "
+                f"shown {self.shown}, dropped {self.dropped}, torn {self.torn}")
@@ -0,0 +1,62 @@
+class LatestValueCoalescer:
+    """
+    ادغام رویدادهای پرتکرار (مثل حرکت اسلایدر): فقط آخرین مقدار برنده است
+    و حداکثر یک بار در هر interval_ms به apply داده می‌شود.
+    با flush() مقدار نهایی بلافاصله اعمال می‌شود (مثلاً هنگام رها کردن اسلایدر).
+    """
+
+    def __init__(self, widget, apply, interval_ms=16):
+        self.widget = widget
+        self.apply = apply
+        self.interval_ms = interval_ms
+
+        self._pending = None
+        self._has_pending = False
+        self._after_id = None
+
+        # آمار
+        self.received = 0   # کل رویدادهای دریافتی
+        self.applied = 0    # دفعات اعمال واقعی
+        self.merged = 0     # رویدادهایی که با رویداد بعدی ادغام شدند
+
+    def push(self, value):
+        """ثبت مقدار جدید؛ اعمال در فریم بعدی"""
+        self.received += 1
+        if self._has_pending:
+            self.merged += 1
+        self._pending = value
+        self._has_pending = True
+
+        if self._after_id is None:
+            self._after_id = self.widget.after(self.interval_ms, self._on_timer)
+
+    def flush(self):
+        """اعمال فوری مقدار معلق (در صورت وجود)"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._apply_pending()
+
+    def cancel(self):
+        """دور ریختن مقدار معلق بدون اعمال"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending = None
+        self._has_pending = False
+
+    def _on_timer(self):
+        self._after_id = None
+        self._apply_pending()
+
+    def _apply_pending(self):
+        if not self._has_pending:
+            return
+        value = self._pending
+        self._pending = None
+        self._has_pending = False
+        self.applied += 1
+        self.apply(value)
+
+    def stats(self):
+        return {"received": self.received, "applied": self.applied, "merged": self.merged}
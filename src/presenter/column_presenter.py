@@ -1,7 +1,18 @@
+from model.shadow_pins import track_writes
+from utils.perf import timed
+
 class ColumnPresenter:
-    def __init__(self, model, view):
+    # نرخ نمایش موقعیت زنده در نوار وضعیت
+    POSITION_REFRESH_MS = 100
+
+    def __init__(self, model, view, positioner=None):
         self.model = model
         self.view = view
+        # با انکودر: دکمه‌ها ستون را به اندازه عدد پنل Step جابه‌جا می‌کنند (به جای نگه‌داشتن)
+        self.positioner = positioner
+        self._pos_after = None
+        # شرط اختیاری حرکت (مثلاً فوکوس خودکار در حال اجرا)؛ تابعی که True/False برمی‌گرداند
+        self.move_allowed = None
         
         # تلاش اولیه برای اتصال
         self.bind_events()
@@ -23,18 +34,84 @@ class ColumnPresenter:
             self.btn_down.bind('<ButtonRelease-1>', self.stop_move)
             print("[OK] Column DOWN Button Connected")
 
+    @timed("column.up")
+    @track_writes("column.up")
     def start_move_up(self, event):
-        self.model.move_up()
-        # تغییر متن وضعیت پایین صفحه
-        if hasattr(self.view, 'lbl_status_step'):
-            self.view.lbl_status_step.configure(text="State: MOVING UP", bootstyle="inverse-warning")
+        # bind روی دکمه غیرفعال هم اجرا می‌شود (مثلاً هنگام قفل توقف اضطراری)
+        if event.widget.instate(["disabled"]): return
+        self.move(+1)
 
+    @timed("column.down")
+    @track_writes("column.down")
     def start_move_down(self, event):
-        self.model.move_down()
-        if hasattr(self.view, 'lbl_status_step'):
-            self.view.lbl_status_step.configure(text="State: MOVING DOWN", bootstyle="inverse-warning")
+        if event.widget.instate(["disabled"]): return
+        self.move(-1)
 
+    @timed("column.stop")
+    @track_writes("column.stop")
     def stop_move(self, event):
+        self.stop()
+
+    def move(self, sign, step_um=None):
+        """
+        حرکت ستون: بدون انکودر تا stop نگه داشته می‌شود، با انکودر به اندازه یک گام.
+        :param step_um: None یعنی عدد پنل Step
+        :return: False اگر ستون در اختیار کار دیگری باشد
+        """
+        if self.move_allowed is not None and not self.move_allowed():
+            self.view.ui_state.set("status_step", text="State: COLUMN BUSY", bootstyle="inverse-danger")
+            return False
+        if self.positioner:
+            return self._move_by_step(sign, step_um)
+        if sign > 0:
+            self.model.move_up()
+            # تغییر متن وضعیت پایین صفحه (از طریق مخزن وضعیت، یک بار در هر فریم)
+            self.view.ui_state.set("status_step", text="State: MOVING UP", bootstyle="inverse-warning")
+        else:
+            self.model.move_down()
+            self.view.ui_state.set("status_step", text="State: MOVING DOWN", bootstyle="inverse-warning")
+        return True
+
+    def stop(self):
+        if self.positioner:
+            return  # حرکت با انکودر خودش در هدف متوقف می‌شود
         self.model.stop()
-        if hasattr(self.view, 'lbl_status_step'):
-            self.view.lbl_status_step.configure(text="State: IDLE", bootstyle="inverse-secondary")
\ No newline at end of file
+        self.view.ui_state.set("status_step", text="State: IDLE", bootstyle="inverse-secondary")
+
+    # ---------- حرکت با انکودر ----------
+
+    def _move_by_step(self, sign, step_um=None):
+        if step_um is None:
+            lbl_step = self.view.control_widgets.get("step")
+            try:
+                step_um = int(lbl_step.cget("text")) if lbl_step else 0
+            except ValueError:
+                print("[ERROR] Invalid step value")
+                return False
+        if self.positioner.move_by(sign * step_um, on_done=self._on_move_done):
+            self._refresh_position()
+            return True
+        return False
+
+    def _on_move_done(self, error_um):
+        """در ترد حرکت صدا زده می‌شود"""
+        self.view.dispatcher.post(self._show_move_result, error_um)
+
+    def _show_move_result(self, error_um):
+        if self._pos_after is not None:
+            self.view.after_cancel(self._pos_after)
+            self._pos_after = None
+        if error_um is None:
+            return  # لغو شده؛ مسیر توقف وضعیت خودش را نمایش می‌دهد
+        pos = self.positioner.position_um
+        self.view.ui_state.set("status_step", text=f"Pos: {pos:.1f} um ({error_um:+.1f})",
+                               bootstyle="inverse-secondary")
+
+    def _refresh_position(self):
+        """نمایش موقعیت زنده در حین حرکت"""
+        self._pos_after = None
+        if not self.positioner.busy:
+            return
+        pos = self.positioner.position_um
+        self.view.ui_state.set("status_step", text=f"Pos: {pos:.1f} um", bootstyle="inverse-warning")
+        self._pos_after = self.view.after(self.POSITION_REFRESH_MS, self._refresh_position)
\ No newline at end of file
@@ -0,0 +1,40 @@
+class ContactPresenter:
+    """
+    اتصال سنسور تماس به UI و به عنوان تریگر:
+    - شروع تایمر معکوس با برقراری تماس (اختیاری)
+    - اجازه شروع پد فقط در حالت تماس و توقف پد با قطع تماس (اختیاری)
+    """
+
+    def __init__(self, model, view, timer_presenter=None, pad_presenter=None,
+                 start_countdown_on_contact=False, require_contact_for_pad=False):
+        self.model = model
+        self.view = view
+        self.timer_presenter = timer_presenter
+        self.pad_presenter = pad_presenter
+        self.start_countdown_on_contact = start_countdown_on_contact
+        self.require_contact_for_pad = require_contact_for_pad
+
+        # توقف پد با قطع تماس مستقیماً در ترد سنسور انجام می‌شود (منتظر صف UI نمی‌ماند)
+        self.model.listeners.append(self._on_change)
+        if pad_presenter and require_contact_for_pad:
+            pad_presenter.start_allowed = lambda: self.model.is_touching
+
+        self.view.set_contact_status(self.model.is_touching)
+
+    def _on_change(self, is_touching, t):
+        """در ترد سنسور اجرا می‌شود"""
+        if not is_touching and self.require_contact_for_pad and self.pad_presenter:
+            self.pad_presenter.model.stop_rotation()
+        self.view.dispatcher.post(self.on_contact_changed, is_touching)
+
+    def on_contact_changed(self, is_touching):
+        self.view.set_contact_status(is_touching)
+        if is_touching:
+            timer = self.timer_presenter
+            if self.start_countdown_on_contact and timer and not timer.countdown.running \
+                    and not self.view.controls_locked:
+                if timer.countdown.duration > 0:
+                    timer.on_countdown_start()
+        elif self.require_contact_for_pad and self.pad_presenter:
+            self.view.ui_state.set("status_speed", text="Speed: 0% (no contact)", bootstyle="inverse-danger")
+        print(f"[CONTACT] {'touching' if is_touching else 'released'}")
@@ -0,0 +1,38 @@
+class EStopPresenter:
+    def __init__(self, model, view):
+        self.model = model
+        self.view = view
+        self.locked = False
+
+        # اطلاع‌رسانی غیرهم‌زمان: ترد gpiozero فقط کار را در صف dispatcher می‌گذارد
+        # و اجرای آن در نوبت بعدی حلقه Tk انجام می‌شود
+        self.model.listeners.append(lambda: self.view.dispatcher.post(self._on_model_trip))
+        if self.model.trip_event.is_set():
+            self.on_trip()  # کلید در زمان راه‌اندازی فشرده بوده است
+
+    def _on_model_trip(self):
+        if not self.locked:
+            self.on_trip()
+
+    def on_trip(self):
+        """نمایش وضعیت توقف و قفل کنترل‌ها تا زمان ریست"""
+        self.locked = True
+        # خروجی‌ها قطع شده‌اند؛ کلیدهای نور و لیساژور هم باید خاموش نمایش داده شوند
+        for key in ("light_toggle", "lissa_toggle"):
+            toggle = self.view.control_widgets.get(key)
+            if toggle: toggle.state(["!selected"])
+        self.view.set_controls_locked(True)
+        self.view.show_estop_overlay(self.on_reset)
+        self.view.ui_state.set("status_speed", text="Speed: 0%", bootstyle="inverse-danger")
+        self.view.ui_state.set("status_step", text="State: E-STOP", bootstyle="inverse-danger")
+        print("[E-STOP] Emergency stop triggered, controls locked")
+
+    def on_reset(self):
+        if not self.model.reset():
+            self.view.show_estop_overlay(self.on_reset, message="Release the E-STOP button first")
+            return
+        self.locked = False
+        self.view.hide_estop_overlay()
+        self.view.set_controls_locked(False)
+        self.view.ui_state.set("status_step", text="State: IDLE", bootstyle="inverse-secondary")
+        print("[E-STOP] Reset, controls unlocked")
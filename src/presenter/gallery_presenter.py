@@ -0,0 +1,132 @@
+import time
+from collections import OrderedDict
+
+from PIL import ImageTk
+
+from utils.perf import timed
+
+class GalleryPresenter:
+    """
+    صفحه‌بندی بایگانی تصاویر در پنل گالری.
+    پرس‌وجوی هر صفحه و دکد تصاویر کوچک در ترد خواننده بایگانی اجرا می‌شود و نتیجه
+    از dispatcher به ترد UI می‌رسد؛ ترد Tk فقط PhotoImage می‌سازد. تصاویر کوچک در یک
+    کش کوچک (LRU) نگه داشته می‌شوند و تصویر کامل هیچ‌وقت خوانده نمی‌شود.
+    """
+    PAGE_SIZE = 10
+    CACHE_SIZE = 60
+
+    def __init__(self, archive, view):
+        self.archive = archive
+        self.view = view
+        self.rows = []
+        self._before = None      # کلید صفحه فعلی (None = جدیدترین)
+        self._history = []       # کلید صفحه‌های جدیدتر برای بازگشت
+        self._generation = 0     # تغییر صفحه بارگذاری‌های قبلی را لغو می‌کند
+        self._cache = OrderedDict()  # hash -> PhotoImage
+        self._bound = False
+
+        self.archive.listeners.append(lambda row: self.view.dispatcher.post(self._on_stored, row))
+        self.bind_events()
+
+    def bind_events(self):
+        """اتصال پنل گالری پس از ساخت تنبل آن (یک بار)"""
+        w = self.view.control_widgets
+        if "gallery_next" not in w or self._bound:
+            return
+        self._bound = True
+        w["gallery_next"].configure(command=self.on_older)
+        w["gallery_prev"].configure(command=self.on_newer)
+        for i in range(self.PAGE_SIZE):
+            w[f"gallery_thumb_{i}"].bind("<Button-1>", lambda e, i=i: self.on_select(i))
+        self.load_page()
+
+    # ---------- صفحه‌بندی ----------
+
+    def load_page(self):
+        """درخواست صفحه فعلی؛ نتیجه در _show_page"""
+        if not self._bound:
+            return
+        self._generation += 1
+        generation = self._generation
+        self.archive.read(self.archive.page, self._before, self.PAGE_SIZE,
+                          on_done=lambda rows: self.view.dispatcher.post(self._show_page, generation, rows))
+
+    @timed("gallery.page")
+    def _show_page(self, generation, rows):
+        if generation != self._generation:
+            return  # صفحه دیگری درخواست شده
+        self.rows = rows
+        w = self.view.control_widgets
+        missing = []
+        for i in range(self.PAGE_SIZE):
+            lbl = w[f"gallery_thumb_{i}"]
+            if i < len(self.rows):
+                row = self.rows[i]
+                photo = self._cache.get(row["hash"])
+                if photo is not None:
+                    self._cache.move_to_end(row["hash"])
+                else:
+                    missing.append((i, row["hash"], row["thumb"]))
+                lbl.configure(image=photo or "", text=self._caption(row))
+            else:
+                lbl.configure(image="", text="")
+        self.view.ui_state.set("gallery_info", text=f"{self.archive.total} images")
+        self.view.ui_state.set("gallery_prev", state="normal" if self._history else "disabled")
+        self.view.ui_state.set("gallery_next", state="normal" if len(self.rows) == self.PAGE_SIZE else "disabled")
+        if missing:
+            self.archive.read(self._decode_thumbs, generation, missing)
+
+    def on_older(self):
+        if len(self.rows) < self.PAGE_SIZE:
+            return
+        self._history.append(self._before)
+        self._before = self.rows[-1]["id"]
+        self.load_page()
+
+    def on_newer(self):
+        if not self._history:
+            return
+        self._before = self._history.pop()
+        self.load_page()
+
+    def on_select(self, index):
+        if index >= len(self.rows):
+            return
+        row = self.rows[index]
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["t"]))
+        run = f"{row['recipe'] or '-'} / {row['run'] or '-'}"
+        self.view.ui_state.set("gallery_detail", text=f"{when}  {run}  {row['verdict'] or '-'}  #{row['hash'][:8]}")
+
+    # ---------- بارگذاری تنبل تصاویر کوچک ----------
+
+    def _decode_thumbs(self, generation, missing):
+        """در ترد خواننده بایگانی: هر تصویر کوچک جدا دکد و به ترد UI فرستاده می‌شود"""
+        for index, digest, relpath in missing:
+            if generation != self._generation:
+                return  # صفحه عوض شده
+            try:
+                im = self.archive.load_thumb(relpath)
+            except OSError as e:
+                print(f"[GALLERY] thumbnail failed: {e}")
+                continue
+            self.view.dispatcher.post(self._show_thumb, generation, index, digest, im)
+
+    def _show_thumb(self, generation, index, digest, im):
+        photo = ImageTk.PhotoImage(im)
+        self._cache[digest] = photo
+        while len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        if generation == self._generation:
+            self.view.control_widgets[f"gallery_thumb_{index}"].configure(image=photo)
+
+    # ---------- رویدادهای بایگانی (ترد UI) ----------
+
+    def _on_stored(self, row):
+        self.view.ui_state.set("gallery_detail", text=f"Archived #{row['hash'][:8]}")
+        self.view.ui_state.set("gallery_info", text=f"{self.archive.total} images")
+        if self._before is None:
+            self.load_page()  # فقط صفحه جدیدترین‌ها تغییر می‌کند
+
+    @staticmethod
+    def _caption(row):
+        return f"{time.strftime('%H:%M:%S', time.localtime(row['t']))} {row['verdict'] or ''}"
@@ -1,4 +1,12 @@
+from model.shadow_pins import track_writes
+from utils.perf import timed
+
+from .coalescer import LatestValueCoalescer
+
 class LightPresenter:
+    # نرخ حداکثر اعمال روشنایی (یک بار در هر فریم نمایش)
+    APPLY_INTERVAL_MS = 16
+
     def __init__(self, model, view):
         self.model = model
         self.view = view
@@ -6,18 +14,51 @@ class LightPresenter:
         self.slider = self.view.control_widgets["light_scale"]
         self.toggle = self.view.control_widgets['light_toggle']
 
+        # خط لوله روشنایی: رویدادهای اسلایدر ادغام شده و با نرخ محدود اعمال می‌شوند
+        self.brightness_pipe = LatestValueCoalescer(self.view, self._apply_brightness, self.APPLY_INTERVAL_MS)
+
         self.slider.configure(command=self.on_slider_change)
+        self.slider.bind('<ButtonRelease-1>', self.on_slider_release, add="+")
         self.toggle.configure(command=self.on_toggle)
 
-    
+
     def on_slider_change(self, value):
         if 'selected' in self.toggle.state():
             brightness = int(float(value))
-            self.model.set_brightness(brightness)
+            self.brightness_pipe.push(brightness)
 
+    def on_slider_release(self, event):
+        """پایان کشیدن: مقدار نهایی حتماً و فوراً اعمال شود"""
+        if 'selected' in self.toggle.state():
+            self.brightness_pipe.push(int(self.slider.get()))
+        self.brightness_pipe.flush()
+
+    @timed("light.slider")
+    @track_writes("light.slider")
+    def _apply_brightness(self, brightness):
+        self.model.set_brightness(brightness)
+
+    @timed("light.toggle")
+    @track_writes("light.toggle")
     def on_toggle(self):
+        # مقدار معلق اسلایدر نباید بعد از خاموش/روشن شدن اعمال شود
+        self.brightness_pipe.cancel()
         if 'selected' in self.toggle.state():
             current_brightness = int(self.slider.get())
             self.model.set_brightness(current_brightness)
         else:
-            self.model.set_brightness(0)
\ No newline at end of file
+            self.model.set_brightness(0)
+
+    @timed("light.set")
+    @track_writes("light.set")
+    def set_brightness(self, brightness):
+        """روشنایی بدون لمس (API محلی)؛ کلید و اسلایدر هم‌گام می‌شوند، 0 یعنی خاموش"""
+        brightness = max(0, min(100, int(brightness)))
+        if brightness:
+            self.slider.set(brightness)
+            self.toggle.state(["selected"])
+        else:
+            self.toggle.state(["!selected"])
+        # مقدار معلقی که slider.set از مسیر اسلایدر فرستاده باشد لغو شود
+        self.brightness_pipe.cancel()
+        self.model.set_brightness(brightness)
@@ -1,3 +1,6 @@
+from model.shadow_pins import track_writes
+from utils.perf import timed
+
 class LissaPresenter:
     def __init__(self, view, model):
         self.model = model
@@ -6,7 +9,13 @@ class LissaPresenter:
         self.toggle = view.control_widgets['lissa_toggle']
         self.toggle.configure(command = self.on_toggle_lissa)
 
+    @timed("lissa.toggle")
+    @track_writes("lissa.toggle")
     def on_toggle_lissa(self):
         is_on = 'selected' in self.toggle.state()
         self.model.set_state(is_on)
-        
\ No newline at end of file
+
+    def set_state(self, is_on):
+        """روشن/خاموش بدون لمس (API محلی)؛ کلید هم‌گام می‌شود"""
+        self.toggle.state(["selected" if is_on else "!selected"])
+        self.on_toggle_lissa()
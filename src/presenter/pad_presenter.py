@@ -1,7 +1,18 @@
+from model.shadow_pins import track_writes
+from utils.perf import timed
+
 class PadPresenter:
-    def __init__(self, model, view):
+    # فاصله به‌روزرسانی دور اندازه‌گیری شده در نوار وضعیت
+    RPM_REFRESH_MS = 250
+
+    def __init__(self, model, view, speed_controller=None):
         self.model = model
         self.view = view
+        # اگر تنظیم شود عدد پنل سرعت دور هدف (rpm) است و کنترلر PI آن را نگه می‌دارد
+        self.speed_controller = speed_controller
+        self._rpm_after = None
+        # شرط اختیاری شروع (مثلاً تماس فیبر)؛ تابعی که True/False برمی‌گرداند
+        self.start_allowed = None
         # در ابتدا سعی می‌کنیم وصل شویم
         self.bind_events()
 
@@ -23,31 +34,65 @@ class PadPresenter:
         if self.btn_ccw:
             self.btn_ccw.configure(command=self.on_dir_toggle)
 
+    @timed("pad.start")
+    @track_writes("pad.start")
     def on_start(self):
         """شروع حرکت موتور"""
         try:
             if self.lbl_speed: # چک کردن وجود لیبل
                 speed_text = self.lbl_speed.cget("text")
-                speed_val = int(speed_text)
-                
-                # اول جهت را ست می‌کنیم
-                self.on_dir_toggle()
-                
-                # سپس سرعت را اعمال می‌کنیم
-                self.model.set_speed(speed_val)
-                
-                # آپدیت وضعیت
-                self.view.lbl_status_speed.configure(text=f"Speed: {speed_val}%", bootstyle="inverse-success")
-                
+                self.start_at(int(speed_text))
         except ValueError:
             print("[ERROR] Invalid speed value")
 
+    def start_at(self, speed_val, ccw=None):
+        """
+        شروع با سرعت داده شده (درصد یا rpm هدف)؛ همان مسیر دکمه START.
+        :param ccw: None یعنی جهت فعلی دکمه جهت
+        :return: False اگر شرط شروع (تماس) برقرار نباشد
+        """
+        if self.start_allowed is not None and not self.start_allowed():
+            self.view.ui_state.set("status_speed", text="Speed: 0% (no contact)", bootstyle="inverse-danger")
+            print("[PAD] Start blocked: no contact")
+            return False
+
+        # اول جهت را ست می‌کنیم
+        if ccw is not None:
+            self.set_direction(ccw)
+        else:
+            self.on_dir_toggle()
+
+        if self.speed_controller:
+            # رمپ تا duty تخمینی، سپس کنترلر دور را روی هدف نگه می‌دارد
+            ctrl = self.speed_controller
+            percent = int(round(ctrl.feed_forward(speed_val) * 100))
+            # دور کم به 0% گرد می‌شود و کنترلر پد ایستاده را «متوقف شده» می‌بیند و هدف را پاک می‌کند
+            if speed_val > 0:
+                percent = max(1, percent)
+            self.model.set_speed(percent)
+            ctrl.set_target(speed_val)
+            self._refresh_rpm()
+            return True
+
+        # سپس سرعت را اعمال می‌کنیم
+        self.model.set_speed(speed_val)
+
+        # آپدیت وضعیت
+        self.view.ui_state.set("status_speed", text=f"Speed: {speed_val}%", bootstyle="inverse-success")
+        return True
+
+    @timed("pad.stop")
+    @track_writes("pad.stop")
     def on_stop(self):
         """توقف کامل"""
+        if self.speed_controller:
+            self.speed_controller.set_target(0)
         self.model.set_speed(0)
         self.model.stop_rotation()
-        self.view.lbl_status_speed.configure(text="Speed: 0%", bootstyle="inverse-danger")
+        self.view.ui_state.set("status_speed", text="Speed: 0%", bootstyle="inverse-danger")
 
+    @timed("pad.dir")
+    @track_writes("pad.dir")
     def on_dir_toggle(self):
         """تغییر جهت چرخش"""
         if self.btn_ccw:
@@ -57,8 +102,28 @@ class PadPresenter:
                 # متن دکمه هم باید ساده باشد اگر فونت سیستم ساپورت نکند
                 # اما معمولاً GUI مشکلی ندارد، فقط ترمینال مشکل دارد.
                 # فعلا متن دکمه را با فلش نگه می‌داریم چون Tkinter معمولاً UTF-8 است.
-                self.btn_ccw.configure(text="CCW <", bootstyle="outline-warning-toolbutton")
+                self.view.ui_state.set("speed_dir", text="CCW <", bootstyle="outline-warning-toolbutton")
             else:
-                self.btn_ccw.configure(text="CW >", bootstyle="outline-secondary-toolbutton")
+                self.view.ui_state.set("speed_dir", text="CW >", bootstyle="outline-secondary-toolbutton")
             
-            self.model.set_direction(is_ccw)
\ No newline at end of file
+            self.model.set_direction(is_ccw)
+
+    def set_direction(self, ccw):
+        """انتخاب جهت بدون کلیک (دکمه جهت هم هم‌گام می‌شود)"""
+        if self.btn_ccw:
+            self.btn_ccw.state(["selected" if ccw else "!selected"])
+            self.on_dir_toggle()
+        else:
+            self.model.set_direction(bool(ccw))
+
+    def _refresh_rpm(self):
+        """نمایش دور اندازه‌گیری شده تا زمانی که هدف فعال است"""
+        if self._rpm_after is not None:
+            self.view.after_cancel(self._rpm_after)
+        self._rpm_after = None
+        ctrl = self.speed_controller
+        if ctrl.target_rpm <= 0:
+            return
+        self.view.ui_state.set("status_speed", text=f"Speed: {ctrl.measured_rpm:.0f}/{ctrl.target_rpm:.0f} rpm",
+                               bootstyle="inverse-success")
+        self._rpm_after = self.view.after(self.RPM_REFRESH_MS, self._refresh_rpm)
@@ -0,0 +1,118 @@
+from model.recipe import DEFAULT_RECIPE, compile_recipe
+from model.timer_model import format_hms
+from utils.perf import timed
+
+class RecipePresenter:
+    """
+    اتصال اجراکننده دستور به پنل دستور.
+    رویدادهای ترد زمان‌بند از طریق dispatcher به ترد UI می‌رسند و زمان باقیمانده
+    مرحله فقط هنگام اجرا هر نیم ثانیه به‌روز می‌شود.
+    """
+    REFRESH_MS = 500
+
+    def __init__(self, runner, view, recipe=None):
+        self.runner = runner
+        self.view = view
+        self.recipe = recipe or DEFAULT_RECIPE
+        self._after = None
+
+        self.runner.listeners.append(lambda event, stage: self.view.dispatcher.post(self._on_event, event, stage))
+        self.bind_events()
+
+    def bind_events(self):
+        """اتصال پنل دستور (قابل فراخوانی مجدد)"""
+        w = self.view.control_widgets
+        if "recipe_table" not in w:
+            return
+        w["recipe_run"].configure(command=self.on_run)
+        w["recipe_pause"].configure(command=self.on_pause_toggle)
+        w["recipe_abort"].configure(command=self.on_abort)
+        self._fill_table()
+        for stage in range(len(self.runner.timings)):
+            self._update_row(stage)
+        self._render_state()
+
+    def set_recipe(self, recipe):
+        if self.runner.state in ("running", "paused"):
+            return False
+        compile_recipe(recipe)  # اعتبارسنجی قبل از نمایش
+        self.recipe = recipe
+        self._fill_table()
+        return True
+
+    # ---------- فرمان‌ها ----------
+
+    @timed("recipe.run")
+    def on_run(self):
+        if self.runner.run(self.recipe):
+            self._fill_table()
+            self._schedule_refresh()
+        elif self.runner.state not in ("running", "paused"):
+            self.view.ui_state.set("status_step", text="Recipe: column busy", bootstyle="inverse-danger")
+
+    def on_pause_toggle(self):
+        if self.runner.state == "paused":
+            self.runner.resume()
+        else:
+            self.runner.pause()
+
+    def on_abort(self):
+        self.runner.abort()
+
+    # ---------- رویدادهای اجراکننده (ترد UI) ----------
+
+    def _on_event(self, event, stage):
+        if event == "stage_end":
+            self._update_row(stage)
+        elif event in ("done", "aborted"):
+            self._cancel_refresh()
+            print(self.runner.report())
+        elif event == "resumed":
+            self._schedule_refresh()
+        self._render_state()
+
+    def _schedule_refresh(self):
+        self._cancel_refresh()
+        self._render_state()
+        if self.runner.state == "running":
+            self._after = self.view.after(self.REFRESH_MS, self._schedule_refresh)
+
+    def _cancel_refresh(self):
+        if self._after is not None:
+            self.view.after_cancel(self._after)
+            self._after = None
+
+    # ---------- نمایش ----------
+
+    def _render_state(self):
+        runner = self.runner
+        stages = runner.stages
+        if runner.state in ("running", "paused") and 0 <= runner.current < len(stages):
+            name = stages[runner.current]["name"]
+            prefix = "PAUSED" if runner.state == "paused" else "RUNNING"
+            text = f"{prefix} {runner.current + 1}/{len(stages)} {name}  {format_hms(runner.remaining_s())}"
+            style = "warning" if runner.state == "paused" else "success"
+        else:
+            text, style = runner.state.upper(), {"aborted": "danger", "done": "success"}.get(runner.state, "info")
+        self.view.ui_state.set("recipe_state", text=text, bootstyle=style)
+        self.view.ui_state.set("recipe_pause", text="▶ RESUME" if runner.state == "paused" else "⏸ PAUSE")
+
+    def _fill_table(self):
+        table = self.view.control_widgets.get("recipe_table")
+        if table is None:
+            return
+        _, stages = compile_recipe(self.recipe)
+        table.delete(*table.get_children())
+        for i, st in enumerate(stages):
+            table.insert("", "end", iid=str(i), values=(
+                st["name"], f"{st['speed']}%", "CCW" if st["ccw"] else "CW", f"{float(st['duration_s']):g}",
+                "ON" if st["lissa"] else "-", st["light"], st["column_um"] or "-", "",
+            ))
+        self.view.ui_state.set("recipe_title", text=self.recipe.get("name", "RECIPE").upper())
+
+    def _update_row(self, stage):
+        table = self.view.control_widgets.get("recipe_table")
+        timing = self.runner.timings[stage] if 0 <= stage < len(self.runner.timings) else None
+        if table is None or timing is None or timing["actual_s"] is None or not table.exists(str(stage)):
+            return
+        table.set(str(stage), "actual", f"{timing['actual_s']:.2f}")
@@ -0,0 +1,114 @@
+from model.remote_api import CommandError
+from model.timer_model import format_hms
+
+class RemotePresenter:
+    """
+    اتصال API محلی (RemoteAPI) به برنامه.
+    فرمان‌ها همان متدهای Presenter هایی هستند که دکمه‌ها صدا می‌زنند و با
+    view.dispatcher.post در ترد UI اجرا می‌شوند، پس کلیدها، نوار وضعیت و قفل
+    توقف اضطراری با لمس هم‌گام می‌مانند. snapshot در ترد سرور فقط ویژگی‌های
+    مدل‌ها را می‌خواند و هیچ کاری در صف UI نمی‌گذارد.
+    """
+
+    def __init__(self, api, view, pad, light, lissa, column, timer, estop=None):
+        self.api = api
+        self.view = view
+        self.pad = pad
+        self.light = light
+        self.lissa = lissa
+        self.column = column
+        self.timer = timer
+        self.estop = estop
+
+        api.post = view.dispatcher.post
+        api.snapshot = self.snapshot
+        api.commands.update({
+            # فرمان‌های توقف همیشه مجازند؛ بقیه هنگام قفل توقف اضطراری رد می‌شوند
+            "pad.start": self.on_pad_start,
+            "pad.stop": lambda: self.pad.on_stop(),
+            "pad.direction": self.on_pad_direction,
+            "light.set": self.on_light_set,
+            "lissa.set": self.on_lissa_set,
+            "column.move": self.on_column_move,
+            "column.stop": self.on_column_stop,
+            "stopwatch.start": lambda: self.timer.on_stopwatch_start(),
+            "stopwatch.stop": lambda: self.timer.on_stopwatch_stop(),
+            "stopwatch.reset": lambda: self.timer.on_stopwatch_reset(),
+            "countdown.set": self.on_countdown_set,
+            "countdown.start": lambda: self.timer.on_countdown_start(),
+            "countdown.stop": lambda: self.timer.on_countdown_stop(),
+            "countdown.reset": lambda: self.timer.on_countdown_reset(),
+        })
+        # عملگرهایی که یک کلاینت WebSocket روشن کرده با قطع شدن همان کلاینت متوقف می‌شوند
+        api.deadman.update({
+            "pad.start": ("pad.stop", {}),
+            "column.move": ("column.stop", {}),
+            "lissa.set": ("lissa.set", {"on": False}),
+        })
+
+    # ---------- فرمان‌ها (ترد UI) ----------
+
+    def _unlocked(self):
+        if self.estop is not None and self.estop.locked:
+            raise CommandError("controls locked by E-STOP")
+
+    def on_pad_start(self, speed, ccw=None):
+        self._unlocked()
+        if not self.pad.start_at(int(speed), None if ccw is None else bool(ccw)):
+            raise CommandError("start blocked: no contact")
+
+    def on_pad_direction(self, ccw):
+        self._unlocked()
+        self.pad.set_direction(bool(ccw))
+
+    def on_light_set(self, brightness):
+        self._unlocked()
+        self.light.set_brightness(brightness)
+
+    def on_lissa_set(self, on):
+        self._unlocked()
+        self.lissa.set_state(bool(on))
+
+    def on_column_move(self, direction, step_um=None):
+        """direction: 'up' یا 'down'؛ بدون انکودر تا column.stop حرکت می‌کند (Watchdog زمان نگه‌داشتن را محدود می‌کند)"""
+        self._unlocked()
+        if direction not in ("up", "down"):
+            raise ValueError(f"direction must be 'up' or 'down', not {direction!r}")
+        if not self.column.move(+1 if direction == "up" else -1, None if step_um is None else int(step_um)):
+            raise CommandError("column busy")
+
+    def on_column_stop(self):
+        if self.column.positioner:
+            self.column.positioner.abort()
+        self.column.stop()
+
+    def on_countdown_set(self, seconds):
+        if not self.timer.set_countdown(seconds):
+            raise CommandError("countdown is running")
+
+    # ---------- تله‌متری (ترد سرور؛ فقط خواندن) ----------
+
+    def snapshot(self):
+        pad, col = self.pad.model, self.column.model
+        stopwatch, countdown = self.timer.stopwatch, self.timer.countdown
+        # فقط ثانیه‌های نمایش داده شده: وضعیت بیکار بین تیک‌ها عوض نمی‌شود و ارسال نمی‌شود
+        state = {
+            "pad": {"speed": pad.current_speed, "ccw": pad.is_ccw},
+            "light": {"brightness": self.light.model.current_brightness},
+            "lissa": {"on": self.lissa.model.is_on},
+            "column": {"moving": col.moving_since is not None, "direction": col.direction},
+            "stopwatch": {"running": stopwatch.running, "elapsed_s": stopwatch.displayed(),
+                          "text": format_hms(stopwatch.displayed())},
+            "countdown": {"running": countdown.running, "duration_s": countdown.duration,
+                          "remaining_s": countdown.displayed(), "finished": countdown.finished,
+                          "text": format_hms(countdown.displayed())},
+        }
+        ctrl = self.pad.speed_controller
+        if ctrl:
+            state["pad"].update(target_rpm=round(ctrl.target_rpm), measured_rpm=round(ctrl.measured_rpm))
+        if self.column.positioner:
+            state["column"].update(position_um=round(self.column.positioner.position_um, 1),
+                                   moving=self.column.positioner.busy)
+        if self.estop is not None:
+            state["estop"] = self.estop.locked
+        return state
@@ -0,0 +1,65 @@
+from utils.perf import timed
+
+class SettingsPresenter:
+    """
+    اتصال دکمه SAVE CONFIG به مخزن تنظیمات و اعمال تنظیمات ذخیره شده در شروع.
+    ذخیره فقط حافظه را به‌روز می‌کند؛ نوشتن روی فلش در ترد مخزن انجام می‌شود
+    و نتیجه از طریق dispatcher روی دکمه نمایش داده می‌شود.
+    """
+    FEEDBACK_MS = 1500
+
+    def __init__(self, store, view):
+        self.store = store
+        self.view = view
+        self._feedback_after = None
+        self._dir_applied = False
+
+        # مقادیر اولیه پنل‌ها قبل از ساخت تنبل آن‌ها
+        self.view.panel_defaults["speed"] = str(store.get("speed"))
+        self.view.panel_defaults["step"] = str(store.get("step"))
+        self.view.control_widgets["light_scale"].set(store.get("light", 0))
+
+        self.view.control_widgets["btn_save"].configure(command=self.on_save)
+        self.store.listeners.append(lambda: self.view.dispatcher.post(self._on_saved))
+        self.bind_events()
+
+    def bind_events(self):
+        """اعمال جهت ذخیره شده وقتی پنل سرعت ساخته شد (یک بار)"""
+        btn_dir = self.view.control_widgets.get("speed_dir")
+        if btn_dir is None or self._dir_applied:
+            return
+        self._dir_applied = True
+        if self.store.get("speed_ccw"):
+            btn_dir.state(["selected"])
+            self.view.ui_state.set("speed_dir", text="CCW <", bootstyle="outline-warning-toolbutton")
+
+    @timed("settings.save")
+    def on_save(self):
+        w = self.view.control_widgets
+        values = {"light": int(w["light_scale"].get())}
+        if "speed" in w:
+            values["speed"] = w["speed"].cget("text")
+        if "step" in w:
+            values["step"] = w["step"].cget("text")
+        if "speed_dir" in w:
+            values["speed_ccw"] = "selected" in w["speed_dir"].state()
+        recipe_saved = False
+        recipe_presenter = getattr(self.view, "recipe_presenter", None)
+        if recipe_presenter:
+            values["recipe"] = recipe_presenter.recipe.get("name")
+            recipe_saved = self.store.save_recipe(recipe_presenter.recipe)
+
+        if self.store.update(**values) or recipe_saved:
+            self.view.ui_state.set("btn_save", text="SAVING...")
+        else:
+            self._on_saved()  # چیزی تغییر نکرده؛ نوشتن لازم نیست
+
+    def _on_saved(self):
+        self.view.ui_state.set("btn_save", text="SAVED ✓")
+        if self._feedback_after is not None:
+            self.view.after_cancel(self._feedback_after)
+        self._feedback_after = self.view.after(self.FEEDBACK_MS, self._reset_feedback)
+
+    def _reset_feedback(self):
+        self._feedback_after = None
+        self.view.ui_state.set("btn_save", text="SAVE CONFIG")
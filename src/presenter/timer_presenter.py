@@ -0,0 +1,158 @@
+from model.timer_model import Stopwatch, Countdown, format_hms
+from utils.perf import timed
+
+class TimerPresenter:
+    """
+    موتور کرنومتر و تایمر معکوس.
+    فقط وقتی ثانیه نمایش داده شده عوض می‌شود بیدار می‌شود (بدون polling)
+    و زمان‌بندی روی پنجره اصلی است، پس با مخفی شدن پنل متوقف نمی‌شود.
+    """
+    # حاشیه کوچک تا بیدار شدن بعد از مرز ثانیه باشد، نه قبل از آن
+    WAKE_MARGIN_MS = 2
+    LIMITS = {"h": 23, "m": 59, "s": 59}
+
+    def __init__(self, view, pad_model=None, stop_pad_on_finish=True):
+        self.view = view
+        self.pad_model = pad_model
+        self.stop_pad_on_finish = stop_pad_on_finish
+
+        self.stopwatch = Stopwatch()
+        self.countdown = Countdown()
+        self.setpoint = {"h": 0, "m": 0, "s": 0}
+        # توابعی که پایان تایمر معکوس را دریافت می‌کنند
+        self.finish_listeners = []
+
+        self._sw_after = None
+        self._cd_after = None
+        self.bind_events()
+
+    def bind_events(self):
+        """یافتن ویجت‌های پنل تایمر و اتصال رویدادها (قابل فراخوانی مجدد)"""
+        w = self.view.control_widgets
+        if "stopwatch_label" not in w:
+            return
+
+        w["stopwatch_start"].configure(command=self.on_stopwatch_start)
+        w["stopwatch_stop"].configure(command=self.on_stopwatch_stop)
+        w["stopwatch_reset"].configure(command=self.on_stopwatch_reset)
+        w["timer_start"].configure(command=self.on_countdown_start)
+        w["timer_stop"].configure(command=self.on_countdown_stop)
+        w["timer_reset"].configure(command=self.on_countdown_reset)
+
+        for key in self.LIMITS:
+            w[f"timer_{key}_up"].configure(command=lambda k=key: self.on_spin(k, +1))
+            w[f"timer_{key}_down"].configure(command=lambda k=key: self.on_spin(k, -1))
+
+        # نمایش وضعیت فعلی (پنل ممکن است بعد از شروع تایمر ساخته شده باشد)
+        self._render_stopwatch()
+        self._render_setpoint()
+        self._render_countdown()
+
+    # ---------- کرنومتر ----------
+
+    @timed("timer.stopwatch_start")
+    def on_stopwatch_start(self):
+        self.stopwatch.start()
+        self._cancel("_sw_after")
+        self._schedule_stopwatch()
+
+    def on_stopwatch_stop(self):
+        self.stopwatch.stop()
+        self._cancel("_sw_after")
+        self._render_stopwatch()
+
+    def on_stopwatch_reset(self):
+        self.stopwatch.reset()
+        self._cancel("_sw_after")
+        self._render_stopwatch()
+
+    def _schedule_stopwatch(self):
+        self._render_stopwatch()
+        if self.stopwatch.running:
+            delay = int(self.stopwatch.seconds_to_next_change() * 1000) + self.WAKE_MARGIN_MS
+            self._sw_after = self.view.after(delay, self._schedule_stopwatch)
+
+    def _render_stopwatch(self):
+        self.view.ui_state.set("stopwatch", text=format_hms(self.stopwatch.displayed()))
+
+    # ---------- تایمر معکوس ----------
+
+    def on_spin(self, key, delta):
+        if self.countdown.running:
+            return
+        limit = self.LIMITS[key]
+        self.setpoint[key] = (self.setpoint[key] + delta) % (limit + 1)
+        self.set_countdown(self.setpoint["h"] * 3600 + self.setpoint["m"] * 60 + self.setpoint["s"])
+
+    def set_countdown(self, seconds):
+        """تنظیم مستقیم مدت تایمر معکوس (حداکثر 23:59:59)؛ مثل دکمه‌های +/- هنگام اجرا نادیده گرفته می‌شود"""
+        if self.countdown.running:
+            return False
+        seconds = max(0, min(int(seconds), 23 * 3600 + 59 * 60 + 59))
+        self.setpoint = {"h": seconds // 3600, "m": seconds // 60 % 60, "s": seconds % 60}
+        self.countdown.set_duration(seconds)
+        self._render_setpoint()
+        self._render_countdown()
+        return True
+
+    @timed("timer.countdown_start")
+    def on_countdown_start(self):
+        if self.countdown.finished:
+            self.countdown.reset()
+        self.countdown.start()
+        self._cancel("_cd_after")
+        self._schedule_countdown()
+
+    def on_countdown_stop(self):
+        self.countdown.stop()
+        self._cancel("_cd_after")
+        self._render_countdown()
+
+    def on_countdown_reset(self):
+        self.countdown.reset()
+        self._cancel("_cd_after")
+        self._render_countdown()
+
+    def _schedule_countdown(self):
+        if self.countdown.running and self.countdown.finished:
+            self.countdown.stop()
+            self._render_countdown()
+            self._on_countdown_finished()
+            return
+        self._render_countdown()
+        if self.countdown.running:
+            delay = int(self.countdown.seconds_to_next_change() * 1000) + self.WAKE_MARGIN_MS
+            self._cd_after = self.view.after(delay, self._schedule_countdown)
+
+    def _on_countdown_finished(self):
+        print("[TIMER] Countdown finished")
+        if self.stop_pad_on_finish and self.pad_model:
+            self.pad_model.stop_rotation()
+            self.view.ui_state.set("status_speed", text="Speed: 0%", bootstyle="inverse-danger")
+        for listener in self.finish_listeners:
+            listener()
+
+    def _render_setpoint(self):
+        for key, value in self.setpoint.items():
+            self.view.ui_state.set(f"timer_{key}", text=f"{value:02d}")
+
+    def _render_countdown(self):
+        if self.countdown.duration == 0:
+            text, style = "READY TO START", "info"
+        elif self.countdown.finished:
+            text, style = "DONE  00:00:00", "success"
+        elif self.countdown.running:
+            text, style = format_hms(self.countdown.displayed()), "warning"
+        else:
+            text, style = format_hms(self.countdown.displayed()), "info"
+        self.view.ui_state.set("countdown", text=text, bootstyle=style)
+
+    def _cancel(self, attr):
+        after_id = getattr(self, attr)
+        if after_id is not None:
+            self.view.after_cancel(after_id)
+            setattr(self, attr, None)
+
+    def close(self):
+        self._cancel("_sw_after")
+        self._cancel("_cd_after")
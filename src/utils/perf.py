@@ -0,0 +1,103 @@
+import functools
+import json
+import threading
+import time
+
+from .stats import LatencyStats
+
+# مرزهای بالای سطل‌های هیستوگرام تأخیر حلقه (ms)
+LAG_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, float("inf"))
+
+
+class LagHistogram:
+    """هیستوگرام تأخیر حلقه رویداد Tk"""
+
+    def __init__(self, bounds=LAG_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.stats = LatencyStats(maxlen=2000)
+        self._lock = threading.Lock()
+
+    def add(self, lag_ms):
+        with self._lock:
+            for i, bound in enumerate(self.bounds):
+                if lag_ms <= bound:
+                    self.counts[i] += 1
+                    break
+        self.stats.add(lag_ms)
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * len(self.bounds)
+        self.stats.reset()
+
+    def as_dict(self):
+        with self._lock:
+            buckets = {
+                (f"<={b:g}ms" if b != float("inf") else f">{self.bounds[-2]:g}ms"): c
+                for b, c in zip(self.bounds, self.counts)
+            }
+        return {"buckets": buckets, **self.stats.summary()}
+
+
+class PerfRegistry:
+    """
+    مخزن سراسری زمان‌سنجی‌ها: تأخیر حلقه رویداد و زمان اجرای هندلرها.
+    مثل PIN_STATS یک نمونه سراسری (PERF) بین همه لایه‌ها مشترک است.
+    """
+
+    def __init__(self):
+        self.lag = LagHistogram()
+        self.handlers = {}  # label -> LatencyStats
+        # منابع متریک دیگر: name -> تابعی که dict برمی‌گرداند (در گزارش صادر می‌شود)
+        self.sources = {}
+        self._lock = threading.Lock()
+
+    def record(self, label, ms):
+        stats = self.handlers.get(label)
+        if stats is None:
+            with self._lock:
+                stats = self.handlers.setdefault(label, LatencyStats(maxlen=500))
+        stats.add(ms)
+
+    def timed(self, label):
+        """دکوراتور زمان‌سنجی هندلر"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, (time.perf_counter() - t0) * 1000.0)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        self.lag.reset()
+        with self._lock:
+            self.handlers.clear()
+
+    def as_dict(self):
+        with self._lock:
+            handlers = dict(self.handlers)
+        return {
+            "timestamp": time.time(),
+            "loop_lag": self.lag.as_dict(),
+            "handlers": {label: st.summary() for label, st in sorted(handlers.items())},
+            **{name: source() for name, source in sorted(self.sources.items())},
+        }
+
+    def export(self, path):
+        """ذخیره گزارش به صورت JSON"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return path
+
+
+PERF = PerfRegistry()
+
+
+def timed(label):
+    """دکوراتور میانبر روی PERF"""
+    return PERF.timed(label)
@@ -0,0 +1,51 @@
+import threading
+from collections import deque
+
+
+def percentile(values, pct):
+    """صدک ساده (بدون وابستگی به numpy)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class LatencyStats:
+    """
+    نگهداری نمونه‌های اخیر یک زمان‌بندی (ms) و خلاصه آماری آن.
+    از چند ترد قابل استفاده است.
+    """
+
+    def __init__(self, maxlen=1000):
+        self._samples = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def add(self, value_ms):
+        with self._lock:
+            self._samples.append(value_ms)
+            self.count += 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self.count = 0
+
+    def samples(self):
+        with self._lock:
+            return list(self._samples)
+
+    def summary(self):
+        values = self.samples()
+        return {
+            "count": self.count,
+            "mean_ms": sum(values) / len(values) if values else 0.0,
+            "p95_ms": percentile(values, 95),
+            "max_ms": max(values) if values else 0.0,
+        }
+
+    def format(self, label):
+        st = self.summary()
+        return (f"{label}: n={st['count']} mean={st['mean_ms']:.2f} ms "
+                f"p95={st['p95_ms']:.2f} ms max={st['max_ms']:.2f} ms")
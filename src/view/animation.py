@@ -0,0 +1,155 @@
+import time
+from collections import deque
+
+from utils.stats import percentile
+
+
+def ease_out_cubic(t):
+    """شروع سریع و توقف نرم"""
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_cubic(t):
+    if t < 0.5:
+        return 4 * t * t * t
+    return 1 - (-2 * t + 2) ** 3 / 2
+
+
+class FrameStats:
+    """
+    آمار زمان فریم‌ها: فاصله بین فریم‌ها، زمان کار هر فریم و فریم‌های از دست رفته.
+    """
+
+    def __init__(self, frame_ms, maxlen=600):
+        self.frame_ms = frame_ms
+        self.intervals = deque(maxlen=maxlen)  # فاصله واقعی بین دو فریم (ms)
+        self.work = deque(maxlen=maxlen)       # زمان اجرای هر فریم (ms)
+        self.missed = 0                        # تعداد فریم‌هایی که جا انداخته شدند
+
+    def record(self, interval_ms, work_ms, dropped=0):
+        if interval_ms is not None:
+            self.intervals.append(interval_ms)
+        self.work.append(work_ms)
+        self.missed += dropped
+
+    def reset(self):
+        self.intervals.clear()
+        self.work.clear()
+        self.missed = 0
+
+    def summary(self):
+        iv = list(self.intervals)
+        wk = list(self.work)
+        return {
+            "frames": len(wk),
+            "mean_ms": sum(iv) / len(iv) if iv else 0.0,
+            "p95_ms": percentile(iv, 95),
+            "max_ms": max(iv) if iv else 0.0,
+            "missed": self.missed,
+            "work_mean_ms": sum(wk) / len(wk) if wk else 0.0,
+            "work_total_ms": sum(wk),
+        }
+
+
+class Tween:
+    """
+    انیمیشن زمان‌محور یک مقدار (مثلاً مختصات x منوی کشویی).
+    موقعیت فقط از روی ساعت monotonic محاسبه می‌شود، پس طول انیمیشن
+    به سرعت سرویس‌دهی تایمرهای Tk بستگی ندارد؛ اگر حلقه عقب بیفتد
+    فریم‌های عقب‌افتاده جا انداخته می‌شوند و مستقیم به موقعیت درست می‌پرد.
+    """
+
+    def __init__(self, widget, apply, duration_ms=220, fps=60, easing=ease_out_cubic, on_done=None):
+        """
+        :param widget: هر ویجت Tk (برای after)
+        :param apply: تابعی که مقدار صحیح جدید را اعمال می‌کند
+        """
+        self.widget = widget
+        self.apply = apply
+        self.duration = duration_ms / 1000.0
+        self.fps = fps
+        self.easing = easing
+        self.on_done = on_done
+
+        self.stats = FrameStats(1000.0 / fps)
+        self.value = 0
+        self.running = False
+
+        self._start = 0
+        self._end = 0
+        self._t0 = 0.0
+        self._frame_idx = 0
+        self._last_tick = None
+        self._after_id = None
+
+    @property
+    def frame_period(self):
+        return 1.0 / self.fps
+
+    def set_fps(self, fps):
+        self.fps = fps
+        self.stats.frame_ms = 1000.0 / fps
+
+    def jump(self, value):
+        """قرار دادن فوری بدون انیمیشن"""
+        self.cancel()
+        self.value = int(value)
+        self.apply(self.value)
+
+    def start(self, target):
+        """
+        حرکت به سمت target. اگر انیمیشن در جریان باشد، از موقعیت فعلی
+        با همان مدت زمان به سمت مقصد جدید ادامه می‌دهد.
+        """
+        self.cancel()
+        self._start = self.value
+        self._end = int(target)
+        if self._start == self._end:
+            return
+
+        self._t0 = time.monotonic()
+        self._frame_idx = 0
+        self._last_tick = None
+        self.stats.reset()
+        self.running = True
+        self._tick()
+
+    def cancel(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self.running = False
+
+    def _tick(self):
+        self._after_id = None
+        now = time.monotonic()
+        work_t0 = time.perf_counter()
+
+        elapsed = now - self._t0
+        t = min(1.0, elapsed / self.duration) if self.duration > 0 else 1.0
+        value = int(round(self._start + (self._end - self._start) * self.easing(t)))
+
+        # فقط در صورت تغییر پیکسلی، جابه‌جایی انجام شود
+        if value != self.value:
+            self.value = value
+            self.apply(value)
+
+        # تعیین فریم بعدی بر اساس برنامه زمانی؛ فریم‌های عقب‌افتاده جا انداخته می‌شوند
+        period = self.frame_period
+        expected_idx = int(elapsed / period) + 1
+        dropped = max(0, expected_idx - self._frame_idx - 1) if self._last_tick is not None else 0
+        self._frame_idx = expected_idx
+
+        interval = (now - self._last_tick) * 1000.0 if self._last_tick is not None else None
+        self._last_tick = now
+        self.stats.record(interval, (time.perf_counter() - work_t0) * 1000.0, dropped)
+
+        if t >= 1.0:
+            self.running = False
+            if self.on_done:
+                self.on_done()
+            return
+
+        next_deadline = self._t0 + self._frame_idx * period
+        delay_ms = max(1, int((next_deadline - time.monotonic()) * 1000))
+        self._after_id = self.widget.after(delay_ms, self._tick)
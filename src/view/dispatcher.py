@@ -0,0 +1,86 @@
+import time
+from collections import deque
+
+from utils.stats import LatencyStats
+
+
+class UIDispatcher:
+    """
+    تحویل کار از تردهای پس‌زمینه (callback های gpiozero، تایمرها، workerها) به حلقه Tk.
+    post() از هر تردی امن است: فقط یک append روی deque (بدون قفل).
+    یک poll تطبیقی با after صف را خالی می‌کند: وقتی کار هست با فاصله min_ms و
+    در بیکاری با دو برابر شدن تا max_ms، و همه کارهای معلق در یک نوبت اجرا می‌شوند.
+    """
+
+    def __init__(self, root, min_ms=4, max_ms=64, budget_ms=8.0):
+        self.root = root
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.budget_ms = budget_ms
+
+        self._queue = deque()
+        self._interval = max_ms
+        self._after_id = None
+
+        # آمار
+        self.delivered = 0
+        self.max_depth = 0
+        self.latency = LatencyStats()   # زمان از post تا اجرا (ms)
+        self.batch_sizes = LatencyStats(maxlen=500)
+
+    @property
+    def depth(self):
+        return len(self._queue)
+
+    def post(self, func, *args):
+        """ثبت یک کار برای اجرا در ترد UI (امن از هر ترد)"""
+        self._queue.append((time.monotonic(), func, args))
+
+    def start(self):
+        if self._after_id is None:
+            self._after_id = self.root.after(self.min_ms, self._poll)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _poll(self):
+        depth = len(self._queue)
+        if depth > self.max_depth:
+            self.max_depth = depth
+        ran = self.drain()
+
+        # poll تطبیقی: کار بود -> سریع، بیکار -> کندتر
+        if ran or self._queue:
+            self._interval = self.min_ms
+        else:
+            self._interval = min(self.max_ms, self._interval * 2)
+        self._after_id = self.root.after(self._interval, self._poll)
+
+    def drain(self):
+        """اجرای کارهای معلق تا سقف بودجه زمانی این نوبت"""
+        ran = 0
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        while self._queue:
+            t_post, func, args = self._queue.popleft()
+            self.latency.add((time.monotonic() - t_post) * 1000.0)
+            try:
+                func(*args)
+            except Exception as e:
+                print(f"[DISPATCH] {getattr(func, '__qualname__', func)} failed: {e}")
+            ran += 1
+            if time.perf_counter() > deadline:
+                break
+        if ran:
+            self.delivered += ran
+            self.batch_sizes.add(ran)
+        return ran
+
+    def stats(self):
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "delivered": self.delivered,
+            "latency": self.latency.summary(),
+        }
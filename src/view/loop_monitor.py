@@ -0,0 +1,64 @@
+import time
+
+import ttkbootstrap as ttk
+import ttkbootstrap.constants as ttk_const
+
+from utils.perf import PERF
+
+
+class LoopMonitor:
+    """
+    پایش پاسخ‌گویی حلقه اصلی Tk.
+    یک ضربان سبک با after زمان‌بندی می‌شود و اختلاف زمان واقعی با زمان مورد انتظار
+    (تأخیر حلقه) در هیستوگرام PERF ثبت می‌شود. به صورت اختیاری یک نمایشگر کوچک
+    در نوار وضعیت خلاصه را نشان می‌دهد.
+    """
+
+    def __init__(self, root, interval_ms=50, registry=PERF):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.registry = registry
+        self.overlay = None
+        # توابعی که در هر ضربان صدا زده می‌شوند (مثلاً Watchdog.feed)
+        self.listeners = []
+        self._expected = None
+        self._after_id = None
+        self._overlay_id = None
+
+    def start(self):
+        if self._after_id is None:
+            self._expected = time.monotonic() + self.interval_ms / 1000.0
+            self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def stop(self):
+        for aid in (self._after_id, self._overlay_id):
+            if aid is not None:
+                self.root.after_cancel(aid)
+        self._after_id = None
+        self._overlay_id = None
+
+    def _beat(self):
+        now = time.monotonic()
+        lag_ms = max(0.0, (now - self._expected) * 1000.0)
+        self.registry.lag.add(lag_ms)
+        for listener in self.listeners:
+            listener()
+        self._expected = now + self.interval_ms / 1000.0
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    # ---------- نمایشگر توسعه‌دهنده ----------
+
+    def attach_overlay(self, parent, after=None, refresh_ms=1000):
+        """افزودن لیبل خلاصه به نوار وضعیت (کنار ویجت after)"""
+        self.overlay = ttk.Label(parent, text="lag: --", font=("Consolas", 9), bootstyle="inverse-secondary")
+        if after is not None:
+            self.overlay.pack(side=ttk_const.RIGHT, padx=5, after=after)
+        else:
+            self.overlay.pack(side=ttk_const.RIGHT, padx=5)
+        self._refresh_ms = refresh_ms
+        self._overlay_id = self.root.after(refresh_ms, self._refresh_overlay)
+
+    def _refresh_overlay(self):
+        st = self.registry.lag.stats.summary()
+        self.overlay.configure(text=f"lag p95 {st['p95_ms']:.0f} / max {st['max_ms']:.0f} ms")
+        self._overlay_id = self.root.after(self._refresh_ms, self._refresh_overlay)
@@ -5,6 +5,15 @@ from tkinter import messagebox
 # ایمپورت ماژولار پنل‌ها
 from .panels.timer_panel import TimerPanel
 from .panels.control_panel import ControlPanel
+from .panels.recipe_panel import RecipePanel
+from .panels.camera_panel import CameraPanel
+from .panels.gallery_panel import GalleryPanel
+from .view_manager import ViewManager
+from .animation import Tween, ease_out_cubic
+from .loop_monitor import LoopMonitor
+from .dispatcher import UIDispatcher
+from .ui_state import UIStateStore
+from utils.perf import PERF, timed
 
 class PolisherView(ttk.Window):
     """
@@ -24,6 +33,9 @@ class PolisherView(ttk.Window):
         "FONT_H2": ("Segoe UI", 14, "bold"),
         "FONT_BODY": ("Segoe UI", 11),
         "BTN_PAD": (15, 10),
+        "MENU_ANIM_MS": 220,   # مدت انیمیشن منو (مستقل از سرعت حلقه Tk)
+        "ANIM_FPS": 60,        # نرخ فریم هدف انیمیشن
+        "DEV_OVERLAY": False,  # نمایش تأخیر حلقه رویداد در نوار وضعیت (برای توسعه‌دهنده)
     }
 
     def __init__(self):
@@ -38,15 +50,33 @@ class PolisherView(ttk.Window):
         # 2. وضعیت‌های داخلی
         self.menu_visible = False
         self.side_menu_pos = -self.CONSTANTS["MENU_WIDTH"]
-        # --- [تغییر جدید] متغیرهای کنترل انیمیشن ---
         self.target_menu_pos = -self.CONSTANTS["MENU_WIDTH"] # مقصد نهایی کجاست؟
-        self.is_animating = False                            # آیا موتور انیمیشن روشن است؟
         self.control_widgets = {} # مخزن ویجت‌ها برای Presenter
+        self.controls_locked = False
         self.presenter = None
+        self.speed_unit = "%"   # با کنترل حلقه بسته دور، "rpm"
+        # مقادیر اولیه LCD پنل‌ها (از تنظیمات ذخیره شده، قبل از ساخت تنبل)
+        self.panel_defaults = {"speed": "10", "step": "100"}
+
+        # مخزن وضعیت: Presenter ها وضعیت را می‌نویسند، ویو یک بار در هر فریم اعمال می‌کند
+        self.ui_state = UIStateStore(self)
 
         # 3. راه‌اندازی گرافیک
         self._setup_styles()
         self._build_layout()
+        self._bind_ui_state()
+
+        # پایش تأخیر حلقه رویداد (ضربان سبک با after)
+        self.loop_monitor = LoopMonitor(self)
+        self.loop_monitor.start()
+        # آمار فریم آخرین انیمیشن منو در گزارش کارایی
+        PERF.sources["anim.drawer"] = self.menu_anim.stats.summary
+
+        # تحویل رویدادهای تردهای پس‌زمینه به حلقه Tk (تنها مسیر مجاز برای آن تردها)
+        self.dispatcher = UIDispatcher(self)
+        self.dispatcher.start()
+        if self.CONSTANTS["DEV_OVERLAY"]:
+            self.show_perf_overlay()
         
         # 4. رندر نهایی
         self.update_idletasks()
@@ -64,6 +94,22 @@ class PolisherView(ttk.Window):
         self.lissa_presenter = kwargs.get('lissa_presenter')
         self.pad_presenter = kwargs.get('pad_presenter')
         self.column_presenter = kwargs.get('column_presenter') # <--- این خط مشکل را حل می‌کند
+        self.timer_presenter = kwargs.get('timer_presenter')
+        self.recipe_presenter = kwargs.get('recipe_presenter')
+        self.settings_presenter = kwargs.get('settings_presenter')
+        self.camera_presenter = kwargs.get('camera_presenter')
+        self.gallery_presenter = kwargs.get('gallery_presenter')
+
+        # پنل‌هایی که قبلاً ساخته شده‌اند را یک بار به پرزینترها وصل می‌کنیم
+        if self.views.is_built("step"): self._bind_column_presenter()
+        if self.views.is_built("speed"): self._bind_pad_presenter()
+        if self.views.is_built("timer"): self._bind_timer_presenter()
+        if self.views.is_built("recipe"): self._bind_recipe_presenter()
+        if self.views.is_built("camera"): self._bind_camera_presenter()
+        if self.views.is_built("gallery"): self._bind_gallery_presenter()
+
+        # ساخت بقیه پنل‌ها در زمان بیکاری تا اولین کلیک منو معطل نشود
+        self.views.prebuild()
 
     def _setup_styles(self):
         """تعریف استایل‌های اختصاصی"""
@@ -104,6 +150,11 @@ class PolisherView(ttk.Window):
         
         self.main_container.place(x=0, y=top_h, relwidth=1, height=content_h)
 
+        # مدیریت صفحات: هر پنل یک بار ساخته شده و زنده نگه داشته می‌شود
+        self.views = ViewManager(self.main_container)
+        self.views.after_build = self._on_page_built
+        self._register_pages()
+
         # 5. منوی کشویی (Overlay)
         self._create_side_menu()
 
@@ -188,6 +239,15 @@ class PolisherView(ttk.Window):
         )
         self.lbl_contact_light.pack(side=ttk_const.RIGHT, padx=15)
 
+        # نتیجه بازرسی سطح فیبر (قبول/رد)
+        self.lbl_inspection = ttk.Label(
+            bar, text="FACE: ---",
+            style="Led.TLabel",
+            bootstyle="inverse-secondary",
+            width=16, anchor="center"
+        )
+        self.lbl_inspection.pack(side=ttk_const.RIGHT, padx=5)
+
         # نمایشگرهای عددی
         self.lbl_status_step = ttk.Label(bar, text="Step: ---", font=self.CONSTANTS["FONT_BODY"], bootstyle="inverse-secondary")
         self.lbl_status_step.pack(side=ttk_const.RIGHT, padx=15)
@@ -210,7 +270,9 @@ class PolisherView(ttk.Window):
             ("Timer/Stopwatch", ttk_const.INFO, 'show_timer_view'),
             ("Set Step Size", ttk_const.PRIMARY, 'show_step_panel'),
             ("Set Speed Pad", ttk_const.SECONDARY, 'show_speed_panel'),
+            ("Polishing Recipe", ttk_const.SUCCESS, 'show_recipe_view'),
             ("Camera View", ttk_const.DANGER, 'show_camera_view'),
+            ("Image Gallery", ttk_const.WARNING, 'show_gallery_view'),
         ]
 
         for text, style, cmd in Sidebar_items:
@@ -231,6 +293,15 @@ class PolisherView(ttk.Window):
             height=menu_height
         )
 
+        # موتور انیمیشن زمان‌محور منو
+        self.menu_anim = Tween(
+            self, self._animate_loop,
+            duration_ms=self.CONSTANTS["MENU_ANIM_MS"],
+            fps=self.CONSTANTS["ANIM_FPS"],
+            easing=ease_out_cubic,
+        )
+        self.menu_anim.value = self.side_menu_pos
+
     # ==========================================
     # منطق UI (Logic)
     # ==========================================
@@ -247,98 +318,194 @@ class PolisherView(ttk.Window):
         else:
             self.target_menu_pos = -self.CONSTANTS["MENU_WIDTH"]
             
-        # 3. استارت زدن موتور انیمیشن (اگر خاموش است)
-        if not self.is_animating:
-            self.is_animating = True
-            self._animate_loop()
-
-    def _animate_loop(self):
-        """حلقه انیمیشن که همیشه به سمت target_menu_pos حرکت می‌کند"""
-        # اگر به مقصد رسیدیم، موتور را خاموش کن
-        if abs(self.side_menu_pos - self.target_menu_pos) < 2:
-            self.side_menu_pos = self.target_menu_pos
-            self.side_menu.place(x=int(self.side_menu_pos))
-            self.is_animating = False
-            return # خروج از حلقه
-
-        # محاسبه فاصله تا هدف
-        dist = self.target_menu_pos - self.side_menu_pos
-        
-        # محاسبه گام حرکت (سرعت متناسب با فاصله برای نرمی)
-        step = dist / 3.5 
-        
-        # جلوگیری از توقف در فواصل کم (حداقل سرعت)
-        if abs(step) < 1: 
-            step = 1 if dist > 0 else -1
-            
-        # حرکت دادن
-        self.side_menu_pos += step
-        self.side_menu.place(x=int(self.side_menu_pos))
-        
-        # تکرار در فریم بعدی (بدون ارسال آرگومان!)
-        self.after(10, self._animate_loop)
+        # 3. حرکت زمان‌محور به سمت مقصد (اگر در حال حرکت است، از همان نقطه ادامه می‌دهد)
+        self.menu_anim.start(self.target_menu_pos)
+
+    @property
+    def is_animating(self):
+        return self.menu_anim.running
+
+    @timed("anim.drawer")
+    def _animate_loop(self, x):
+        """اعمال یک فریم انیمیشن: فقط جابه‌جایی فریم منو (بدون چیدمان مجدد محتوا)"""
+        self.side_menu_pos = x
+        self.side_menu.place_configure(x=x)
 
     def _handle_menu_click(self, command):
         self._toggle_menu()
         command()
 
-    def _clear_main_container(self):
-        for widget in self.main_container.winfo_children():
-            widget.destroy()
+    def _register_pages(self):
+        """ثبت صفحات در مدیر صفحات (ساخت تنبل)"""
+        self.views.register("home", self._build_home_page)
+        self.views.register(
+            "timer",
+            lambda page: TimerPanel(page, self.control_widgets),
+            on_built=self._bind_timer_presenter,
+        )
+        self.views.register(
+            "step",
+            lambda page: ControlPanel(page, self.control_widgets, "Movement Step (um)", self.panel_defaults["step"], "step", mode="position"),
+            on_built=self._bind_column_presenter,
+        )
+        self.views.register(
+            "speed",
+            lambda page: ControlPanel(page, self.control_widgets, f"Speed Pad ({self.speed_unit})", self.panel_defaults["speed"], "speed", mode="speed"),
+            on_built=self._bind_pad_presenter,
+        )
+        self.views.register(
+            "recipe",
+            lambda page: RecipePanel(page, self.control_widgets),
+            on_built=self._bind_recipe_presenter,
+        )
+        self.views.register(
+            "camera",
+            lambda page: CameraPanel(page, self.control_widgets),
+            on_built=self._bind_camera_presenter,
+        )
+        self.views.register(
+            "gallery",
+            lambda page: GalleryPanel(page, self.control_widgets),
+            on_built=self._bind_gallery_presenter,
+        )
+
+    def _bind_ui_state(self):
+        """اتصال کلیدهای مخزن وضعیت به ویجت‌ها (ویجت‌های پنل‌ها ممکن است بعداً ساخته شوند)"""
+        w = self.control_widgets
+        self.ui_state.bind("status_speed", lambda: self.lbl_status_speed)
+        self.ui_state.bind("status_step", lambda: self.lbl_status_step)
+        self.ui_state.bind("contact", lambda: self.lbl_contact_light)
+        self.ui_state.bind("inspection", lambda: self.lbl_inspection)
+        self.ui_state.bind("btn_save", lambda: self.btn_Save)
+        self.ui_state.bind("speed_dir", lambda: w.get("speed_dir"))
+        self.ui_state.bind("stopwatch", lambda: w.get("stopwatch_label"))
+        self.ui_state.bind("countdown", lambda: w.get("timer_total_display"))
+        for key in ("h", "m", "s"):
+            self.ui_state.bind(f"timer_{key}", lambda k=key: w.get(f"timer_{k}_lbl"))
+        for key in ("recipe_title", "recipe_state", "recipe_pause", "camera_stats", "camera_af",
+                    "gallery_info", "gallery_detail", "gallery_prev", "gallery_next"):
+            self.ui_state.bind(key, lambda k=key: w.get(k))
+
+    def _on_page_built(self, name):
+        # پنلی که در زمان قفل ساخته شود هم باید قفل باشد
+        if self.controls_locked: self.set_controls_locked(True)
+        # تنظیمات ذخیره شده‌ای که به ویجت‌های پنل وابسته‌اند
+        if getattr(self, 'settings_presenter', None):
+            self.settings_presenter.bind_events()
+        # وضعیت‌هایی که قبل از ساخت پنل نوشته شده‌اند اعمال شوند
+        self.ui_state.refresh()
+
+    def _bind_timer_presenter(self):
+        # اتصال موتور تایمر به پنل (زمان‌سنجی مستقل از پنل ادامه دارد)
+        if getattr(self, 'timer_presenter', None):
+            self.timer_presenter.bind_events()
+
+    def _bind_recipe_presenter(self):
+        if getattr(self, 'recipe_presenter', None):
+            self.recipe_presenter.bind_events()
+
+    def _bind_camera_presenter(self):
+        if getattr(self, 'camera_presenter', None):
+            self.camera_presenter.bind_events()
+
+    def _bind_gallery_presenter(self):
+        if getattr(self, 'gallery_presenter', None):
+            self.gallery_presenter.bind_events()
+
+    def _bind_column_presenter(self):
+        # اتصال پرزینتر ستون (فقط یک بار پس از ساخت پنل)
+        if getattr(self, 'column_presenter', None):
+            self.column_presenter.bind_events()
+
+    def _bind_pad_presenter(self):
+        # اتصال پرزینتر پد (فقط یک بار پس از ساخت پنل)
+        if getattr(self, 'pad_presenter', None):
+            self.pad_presenter.bind_events()
 
     # ==========================================
     # نمایش صفحات (Navigation)
     # ==========================================
 
-    def show_home_view(self):
-        self._clear_main_container()
-        if self.menu_visible: self._toggle_menu()
-        
-        container = ttk.Frame(self.main_container)
+    def _build_home_page(self, page):
+        container = ttk.Frame(page)
         container.place(relx=0.5, rely=0.5, anchor="center")
         
         ttk.Label(container, text="SYSTEM READY", font=("Segoe UI", 48, "bold")).pack()
         ttk.Label(container, text="Select Mode from Menu", font=self.CONSTANTS["FONT_H2"]).pack(pady=10)
 
+    def show_home_view(self):
+        if self.menu_visible: self._toggle_menu()
+        self.views.show("home")
+
     def show_timer_view(self):
-        self._clear_main_container()
-        TimerPanel(self.main_container, self.control_widgets)
+        self.views.show("timer")
 
     def show_step_panel(self):
-        self._clear_main_container()
-        # ساخت پنل گرافیکی
-        ControlPanel(self.main_container, self.control_widgets, "Movement Step (um)", "100", "step", mode="position")
-        
-        # >>> بخش جدید <<<
-        # اتصال مجدد پرزینتر ستون (Re-binding)
-        if hasattr(self, 'column_presenter') and self.column_presenter:
-            self.column_presenter.bind_events()
+        self.views.show("step")
 
     def show_speed_panel(self):
-        self._clear_main_container()
-        # ساخت پنل گرافیکی
-        ControlPanel(self.main_container, self.control_widgets, "Speed Pad (%)", "10", "speed", mode="speed")
-        # >>> بخش جدید و حیاتی <<<
-        # اگر پرزینتر پد وجود دارد، بگو دوباره دکمه‌ها را پیدا کند
-        if hasattr(self, 'pad_presenter') and self.pad_presenter:
-            self.pad_presenter.bind_events()
+        self.views.show("speed")
         
+    def show_recipe_view(self):
+        self.views.show("recipe")
+
     def show_camera_view(self):
-        self._clear_main_container()
-        lbl = ttk.Label(self.main_container, text="Camera Feed\n(No Signal)", font=self.CONSTANTS["FONT_H1"])
-        lbl.pack(expand=True)
+        self.views.show("camera")
+
+    def show_gallery_view(self):
+        self.views.show("gallery")
 
     # ==========================================
     # API ارتباطی
     # ==========================================
+    def set_controls_locked(self, locked: bool):
+        """غیرفعال/فعال کردن همه کنترل‌های ثبت شده (مثلاً در توقف اضطراری)"""
+        self.controls_locked = locked
+        flag = ["disabled"] if locked else ["!disabled"]
+        for widget in self.control_widgets.values():
+            if isinstance(widget, (ttk.Button, ttk.Checkbutton, ttk.Scale)):
+                widget.state(flag)
+
+    def show_estop_overlay(self, on_reset, message=None):
+        """پوشش قرمز روی محتوا با دکمه ریست"""
+        if getattr(self, 'estop_overlay', None) is None:
+            # فرزند پنجره اصلی (نه main_container) تا جابه‌جایی صفحات آن را نپوشاند
+            self.estop_overlay = ttk.Frame(self, bootstyle=ttk_const.DANGER)
+            ttk.Label(
+                self.estop_overlay, text="EMERGENCY STOP",
+                font=("Segoe UI", 40, "bold"), bootstyle="inverse-danger"
+            ).pack(pady=(60, 10))
+            self.lbl_estop_msg = ttk.Label(
+                self.estop_overlay, text="", font=self.CONSTANTS["FONT_H2"], bootstyle="inverse-danger"
+            )
+            self.lbl_estop_msg.pack(pady=10)
+            self.btn_estop_reset = ttk.Button(
+                self.estop_overlay, text="RESET", bootstyle="light", padding=(40, 20)
+            )
+            self.btn_estop_reset.pack(pady=20)
+        self.btn_estop_reset.configure(command=on_reset)
+        self.lbl_estop_msg.configure(text=message or "All outputs are off. Release the button and press RESET.")
+        self.estop_overlay.place(in_=self.main_container, x=0, y=0, relwidth=1, relheight=1)
+        self.estop_overlay.lift()
+
+    def hide_estop_overlay(self):
+        if getattr(self, 'estop_overlay', None) is not None:
+            self.estop_overlay.place_forget()
+
+    def show_perf_overlay(self):
+        """نمایش آمار تأخیر حلقه کنار lbl_status_speed"""
+        if self.loop_monitor.overlay is None:
+            self.loop_monitor.attach_overlay(self.lbl_status_speed.master, after=self.lbl_status_speed)
+
     def set_contact_status(self, is_touching: bool):
         """تغییر وضعیت LED مجازی تماس"""
         # اگر تماس برقرار است، سبز شود (CONTACT)
         # اگر تماس نیست، قرمز شود (NO CONTACT)
+        # از طریق مخزن وضعیت: فراخوانی‌های تکراری به configure نمی‌رسند
         if is_touching:
-            self.lbl_contact_light.configure(bootstyle="inverse-success", text="CONTACT OK")
+            self.ui_state.set("contact", bootstyle="inverse-success", text="CONTACT OK")
         else:
-            self.lbl_contact_light.configure(bootstyle="inverse-danger", text="NO CONTACT")
+            self.ui_state.set("contact", bootstyle="inverse-danger", text="NO CONTACT")
             
     #def show_info_message(self, message):
         """نمایش پیام در لیبل اختصاصی بدون دستکاری سایر لیبل‌ها"""
@@ -0,0 +1,44 @@
+import ttkbootstrap as ttk
+import ttkbootstrap.constants as ttk_const
+
+class CameraPanel:
+    """
+    Polisher V2 - Camera Panel
+    نمایش زنده سطح فیبر؛ تصویر توسط CameraPresenter روی یک PhotoImage ثابت کشیده می‌شود
+    و آمار نرخ فریم روی گوشه تصویر قرار می‌گیرد.
+    """
+
+    def __init__(self, parent_frame, control_widgets_dict):
+        self.parent = parent_frame
+        self.widgets = control_widgets_dict
+        self._create_ui()
+
+    def _create_ui(self):
+        container = ttk.Frame(self.parent)
+        container.pack(fill=ttk_const.BOTH, expand=True)
+
+        # 1. تصویر (تا اتصال دوربین: No Signal)
+        lbl_image = ttk.Label(
+            container, text="Camera Feed\n(No Signal)",
+            font=("Segoe UI", 22, "bold"), anchor="center", justify="center"
+        )
+        lbl_image.place(relx=0.5, rely=0.5, anchor="center")
+        self.widgets["camera_image"] = lbl_image
+
+        # 2. آمار روی تصویر: نرخ ضبط / نرخ نمایش / فریم‌های رد شده
+        lbl_stats = ttk.Label(
+            container, text="CAM -- fps | UI -- fps | dropped 0",
+            font=("Consolas", 11, "bold"), bootstyle="inverse-dark", padding=(8, 4)
+        )
+        lbl_stats.place(relx=0.5, y=6, anchor="n")
+        self.widgets["camera_stats"] = lbl_stats
+
+        # 3. فوکوس خودکار (کنار تصویر)
+        btn_af = ttk.Button(container, text="AUTO FOCUS", bootstyle="info", width=12, padding=(10, 15))
+        btn_af.place(relx=1.0, rely=1.0, x=-15, y=-15, anchor="se")
+        self.widgets["camera_af"] = btn_af
+
+        # 4. ذخیره تصویر فعلی در بایگانی
+        btn_snap = ttk.Button(container, text="SNAPSHOT", bootstyle="secondary", width=12, padding=(10, 15))
+        btn_snap.place(relx=0.0, rely=1.0, x=15, y=-15, anchor="sw")
+        self.widgets["camera_snap"] = btn_snap
@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 import ttkbootstrap.constants as ttk_const
 
+from ..widgets.glyph_display import GlyphDisplay
+
 class ControlPanel:
     def __init__(self, parent, control_widgets, title, default_value, input_key, mode="position"):
         """
@@ -68,14 +70,13 @@ class ControlPanel:
         lcd_frame = ttk.Frame(parent)
         lcd_frame.pack(fill=ttk_const.X, pady=5)
 
-        # عدد بزرگ و خوانا
-        self.lbl_value = ttk.Label(
+        # عدد بزرگ و خوانا (گلیف‌های از پیش رندر شده به جای رستر مجدد فونت)
+        self.lbl_value = GlyphDisplay(
             lcd_frame, 
             text=self.current_value, 
             font=("Consolas", 48, "bold"), # فونت مونو اسپیس
             bootstyle="inverse-dark",      # بک‌گراند مشکی
-            anchor="center",
-            padding=(10, 10)
+            padding=10
         )
         self.lbl_value.pack(fill=ttk_const.X, expand=True)
         
@@ -0,0 +1,57 @@
+import ttkbootstrap as ttk
+import ttkbootstrap.constants as ttk_const
+
+class GalleryPanel:
+    """
+    Polisher V2 - Image Gallery Panel
+    مرور تصاویر بایگانی شده سطح فیبر به صورت صفحه‌ای (فقط تصاویر کوچک).
+    """
+    COLUMNS = 5
+    ROWS = 2
+
+    def __init__(self, parent_frame, control_widgets_dict):
+        self.parent = parent_frame
+        self.widgets = control_widgets_dict
+        self.NAV_BTN_WIDTH = 12
+        self._create_ui()
+
+    def _create_ui(self):
+        container = ttk.Frame(self.parent, padding=(20, 10))
+        container.pack(fill=ttk_const.BOTH, expand=True)
+
+        # 1. عنوان و تعداد
+        header = ttk.Frame(container)
+        header.pack(fill=ttk_const.X, pady=(0, 10))
+        ttk.Label(header, text="IMAGE GALLERY", font=("Segoe UI", 16, "bold")).pack(side=ttk_const.LEFT)
+        lbl_info = ttk.Label(header, text="0 images", font=("Segoe UI", 12), bootstyle="info")
+        lbl_info.pack(side=ttk_const.RIGHT)
+        self.widgets["gallery_info"] = lbl_info
+
+        # 2. شبکه تصاویر کوچک (تصویر توسط Presenter به صورت تنبل بارگذاری می‌شود)
+        grid = ttk.Frame(container)
+        grid.pack(fill=ttk_const.BOTH, expand=True)
+        for i in range(self.COLUMNS * self.ROWS):
+            lbl = ttk.Label(
+                grid, text="", compound="top", anchor="center",
+                font=("Segoe UI", 9), bootstyle="secondary", padding=4
+            )
+            lbl.grid(row=i // self.COLUMNS, column=i % self.COLUMNS, padx=6, pady=6, sticky="nsew")
+            self.widgets[f"gallery_thumb_{i}"] = lbl
+        for c in range(self.COLUMNS):
+            grid.columnconfigure(c, weight=1)
+
+        # 3. جزئیات تصویر انتخاب شده و دکمه‌های صفحه
+        footer = ttk.Frame(container)
+        footer.pack(fill=ttk_const.X, pady=(10, 0))
+
+        btn_prev = ttk.Button(footer, text="◀ NEWER", bootstyle="secondary", width=self.NAV_BTN_WIDTH, padding=(10, 12))
+        btn_prev.pack(side=ttk_const.LEFT)
+        self.widgets["gallery_prev"] = btn_prev
+
+        btn_next = ttk.Button(footer, text="OLDER ▶", bootstyle="secondary", width=self.NAV_BTN_WIDTH, padding=(10, 12))
+        btn_next.pack(side=ttk_const.RIGHT)
+        self.widgets["gallery_next"] = btn_next
+
+        lbl_detail = ttk.Label(footer, text="Select an image", font=("Segoe UI", 11), anchor="center")
+        lbl_detail.pack(side=ttk_const.LEFT, fill=ttk_const.X, expand=True, padx=10)
+        self.widgets["gallery_detail"] = lbl_detail
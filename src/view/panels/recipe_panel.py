@@ -0,0 +1,74 @@
+import ttkbootstrap as ttk
+import ttkbootstrap.constants as ttk_const
+
+class RecipePanel:
+    """
+    Polisher V2 - Recipe Panel
+    نمایش مراحل دستور پولیش و کنترل اجرا (شروع / توقف موقت / لغو).
+    """
+    COLUMNS = (
+        ("stage", "STAGE", 110),
+        ("speed", "SPEED", 70),
+        ("dir", "DIR", 60),
+        ("time", "TIME (s)", 80),
+        ("lissa", "LISSA", 60),
+        ("light", "LIGHT", 60),
+        ("column", "COLUMN (um)", 100),
+        ("actual", "ACTUAL (s)", 100),
+    )
+
+    def __init__(self, parent_frame, control_widgets_dict):
+        self.parent = parent_frame
+        self.widgets = control_widgets_dict
+        self.ACTION_BTN_WIDTH = 12
+        self._create_ui()
+
+    def _create_ui(self):
+        container = ttk.Frame(self.parent, padding=20)
+        container.pack(fill=ttk_const.BOTH, expand=True)
+
+        # 1. نام دستور و وضعیت اجرا
+        header = ttk.Frame(container)
+        header.pack(fill=ttk_const.X, pady=(0, 10))
+
+        lbl_title = ttk.Label(header, text="NO RECIPE", font=("Segoe UI", 16, "bold"))
+        lbl_title.pack(side=ttk_const.LEFT)
+        self.widgets["recipe_title"] = lbl_title
+
+        lbl_state = ttk.Label(header, text="IDLE", font=("Segoe UI", 16, "bold"), bootstyle="info")
+        lbl_state.pack(side=ttk_const.RIGHT)
+        self.widgets["recipe_state"] = lbl_state
+
+        # 2. جدول مراحل
+        table = ttk.Treeview(
+            container,
+            columns=[key for key, _, _ in self.COLUMNS],
+            show="headings",
+            bootstyle="info",
+            height=8,
+        )
+        for key, title, width in self.COLUMNS:
+            table.heading(key, text=title)
+            table.column(key, width=width, anchor="center")
+        table.pack(fill=ttk_const.BOTH, expand=True)
+        self.widgets["recipe_table"] = table
+
+        # 3. دکمه‌های کنترل
+        action_frame = ttk.Frame(container)
+        action_frame.pack(fill=ttk_const.X, pady=(15, 0))
+
+        self._add_action_btn(action_frame, "▶ RUN", "success", "recipe_run")
+        self._add_action_btn(action_frame, "⏸ PAUSE", "warning", "recipe_pause")
+        self._add_action_btn(action_frame, "⏹ ABORT", "danger", "recipe_abort")
+
+    def _add_action_btn(self, parent, text, style, key):
+        """دکمه عملیاتی هم‌اندازه (مثل پنل تایمر)"""
+        btn = ttk.Button(
+            parent,
+            text=text,
+            bootstyle=style,
+            width=self.ACTION_BTN_WIDTH,
+            padding=(10, 15)
+        )
+        btn.pack(side=ttk_const.LEFT, padx=10, expand=True, fill=ttk_const.X)
+        self.widgets[key] = btn
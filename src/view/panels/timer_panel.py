@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 import ttkbootstrap.constants as ttk_const
 
+from ..widgets.glyph_display import GlyphDisplay
+
 class TimerPanel:
     """
     Polisher V2 - Timer & Stopwatch Panel (Diamond Edition)
@@ -37,12 +39,12 @@ class TimerPanel:
     def _create_stopwatch_tab(self, parent):
         """طراحی تب کرنومتر: تمرکز روی نمایشگر بزرگ"""
         # 1. نمایشگر زمان (بسیار بزرگ)
-        lbl_time = ttk.Label(
+        # گلیف‌ها یک بار رندر می‌شوند؛ هر ثانیه فقط ارقام تغییر کرده جایگزین می‌شوند
+        lbl_time = GlyphDisplay(
             parent, 
             text="00:00:00", 
             font=("Segoe UI", 70, "bold"), # فونت غول‌پیکر برای خوانایی از دور
-            bootstyle="inverse-dark",
-            anchor="center"
+            bootstyle="inverse-dark"
         )
         lbl_time.pack(expand=True, fill=ttk_const.BOTH, pady=(20, 40))
         
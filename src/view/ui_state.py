@@ -0,0 +1,85 @@
+_MISSING = object()
+
+
+class UIStateStore:
+    """
+    مخزن مرکزی وضعیت UI.
+    Presenter ها فقط وضعیت مطلوب را می‌نویسند (set)؛ ویو در هر فریم یک بار
+    تغییرات را اعمال می‌کند و فقط ویژگی‌هایی که واقعاً عوض شده‌اند configure می‌شوند.
+    این کار مانع غرق شدن Tk در configure های تکراری از منابع پرتکرار
+    (سنسور تماس، تایمرها، بازخورد دور) می‌شود.
+    فقط از ترد UI صدا زده شود.
+    """
+
+    def __init__(self, root, frame_ms=16):
+        self.root = root
+        self.frame_ms = frame_ms
+        self._resolvers = {}   # key -> تابعی که ویجت را برمی‌گرداند (یا None اگر هنوز ساخته نشده)
+        self._desired = {}     # key -> {prop: value}
+        self._applied = {}     # key -> {prop: value} آخرین مقدار اعمال شده روی ویجت
+        self._dirty = set()
+        self._after_id = None
+
+        # آمار
+        self.writes = 0        # تعداد set
+        self.configures = 0    # تعداد configure واقعی
+        self.skipped = 0       # set هایی که چیزی را تغییر ندادند
+
+    def bind(self, key, resolver):
+        """
+        اتصال یک کلید به ویجت.
+        :param resolver: تابعی که ویجت را برمی‌گرداند (برای پنل‌های تنبل ممکن است None بدهد)
+        """
+        self._resolvers[key] = resolver
+        self._applied.pop(key, None)
+        if key in self._desired:
+            self._mark(key)
+
+    def set(self, key, **props):
+        self.writes += 1
+        desired = self._desired.setdefault(key, {})
+        desired.update(props)
+        if self._diff(key):
+            self._mark(key)
+        else:
+            self.skipped += 1
+
+    def get(self, key, prop=None, default=None):
+        state = self._desired.get(key, {})
+        return dict(state) if prop is None else state.get(prop, default)
+
+    def refresh(self):
+        """علامت‌گذاری کلیدهایی که هنوز روی ویجت اعمال نشده‌اند (مثلاً بعد از ساخت یک پنل)"""
+        for key in self._desired:
+            if self._diff(key):
+                self._mark(key)
+
+    def _diff(self, key):
+        applied = self._applied.get(key, {})
+        return {p: v for p, v in self._desired.get(key, {}).items() if applied.get(p, _MISSING) != v}
+
+    def _mark(self, key):
+        self._dirty.add(key)
+        if self._after_id is None:
+            self._after_id = self.root.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        """اعمال همه تغییرات معلق در یک نوبت"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            diff = self._diff(key)
+            if not diff:
+                continue
+            resolver = self._resolvers.get(key)
+            widget = resolver() if resolver else None
+            if widget is None:
+                continue  # پنل هنوز ساخته نشده؛ با refresh دوباره تلاش می‌شود
+            widget.configure(**diff)
+            self.configures += 1
+            self._applied.setdefault(key, {}).update(diff)
+
+    def stats(self):
+        return {"writes": self.writes, "configures": self.configures, "skipped": self.skipped}
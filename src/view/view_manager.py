@@ -0,0 +1,94 @@
+import time
+
+import ttkbootstrap as ttk
+
+from utils.perf import PERF
+
+
+class ViewManager:
+    """
+    مدیریت صفحات داخل main_container.
+    هر صفحه فقط یک بار ساخته می‌شود (تنبل یا در زمان بیکاری) و پس از آن
+    فقط با tkraise جلو آورده می‌شود؛ بنابراین مقدار LCD، وضعیت دکمه جهت
+    و اتصال Presenter ها بین جابه‌جایی‌ها حفظ می‌شود.
+    """
+
+    def __init__(self, container):
+        self.container = container
+        self._builders = {}   # name -> (builder, on_built)
+        self._frames = {}     # name -> ttk.Frame ساخته شده
+        self.current = None
+        # تابع اختیاری که پس از ساخت هر صفحه با نام آن صدا زده می‌شود
+        self.after_build = None
+
+        # آمار زمان‌بندی (میلی‌ثانیه) برای گزارش
+        self.build_times = {}
+        self.switch_times = {}
+
+    def register(self, name, builder, on_built=None):
+        """
+        ثبت یک صفحه.
+        :param builder: تابعی که فریم والد را می‌گیرد و محتوای صفحه را می‌سازد
+        :param on_built: تابع اختیاری که یک بار پس از ساخت اجرا می‌شود (مثلاً bind_events)
+        """
+        self._builders[name] = (builder, on_built)
+
+    def is_built(self, name):
+        return name in self._frames
+
+    def frame(self, name):
+        return self._frames.get(name)
+
+    def _build(self, name):
+        """ساخت یک صفحه (فقط یک بار)"""
+        if name in self._frames:
+            return self._frames[name]
+
+        builder, on_built = self._builders[name]
+        t0 = time.perf_counter()
+
+        page = ttk.Frame(self.container)
+        page.place(x=0, y=0, relwidth=1, relheight=1)
+        builder(page)
+        self._frames[name] = page
+
+        # صفحه جدید نباید روی صفحه فعلی بیاید
+        if self.current in self._frames:
+            self._frames[self.current].tkraise()
+
+        if on_built:
+            on_built()
+        if self.after_build:
+            self.after_build(name)
+
+        self.build_times[name] = (time.perf_counter() - t0) * 1000.0
+        PERF.record(f"build:{name}", self.build_times[name])
+        return page
+
+    def show(self, name):
+        """نمایش صفحه؛ در صورت نیاز ابتدا ساخته می‌شود"""
+        t0 = time.perf_counter()
+        page = self._build(name)
+        page.tkraise()
+        self.current = name
+        self.switch_times[name] = (time.perf_counter() - t0) * 1000.0
+        PERF.record(f"switch:{name}", self.switch_times[name])
+        return page
+
+    def prebuild(self, names=None, delay_ms=50):
+        """
+        ساخت صفحات در زمان بیکاری حلقه Tk.
+        در هر نوبت فقط یک صفحه ساخته می‌شود تا لمس‌ها معطل نمانند.
+        """
+        pending = [n for n in (names or self._builders) if n not in self._frames]
+
+        def _step():
+            while pending and pending[0] in self._frames:
+                pending.pop(0)
+            if not pending:
+                return
+            self._build(pending.pop(0))
+            if pending:
+                self.container.after(delay_ms, lambda: self.container.after_idle(_step))
+
+        self.container.after_idle(_step)
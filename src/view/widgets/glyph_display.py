@@ -0,0 +1,177 @@
+import time
+import tkinter as tk
+
+import ttkbootstrap as ttk
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+# فایل‌های فونت جایگزین برای نام‌های فونت طراحی (روی Pi فونت‌های ویندوز نصب نیستند)
+FONT_FILES = {
+    "Segoe UI": ("segoeuib.ttf", "DejaVuSans-Bold.ttf", "LiberationSans-Bold.ttf"),
+    "Consolas": ("consolab.ttf", "DejaVuSansMono-Bold.ttf", "LiberationMono-Bold.ttf"),
+}
+DEFAULT_FONT_FILES = ("DejaVuSans-Bold.ttf",)
+PRELOAD_CHARS = "0123456789:"
+
+# کش سراسری: (font, size_px, fg, bg, char) -> (PhotoImage, width)
+_GLYPH_CACHE = {}
+_FONT_CACHE = {}
+
+
+def load_font(family, size_px):
+    key = (family, size_px)
+    if key not in _FONT_CACHE:
+        font = None
+        for filename in FONT_FILES.get(family, ()) + DEFAULT_FONT_FILES:
+            try:
+                font = ImageFont.truetype(filename, size_px)
+                break
+            except OSError:
+                continue
+        _FONT_CACHE[key] = font or ImageFont.load_default(size=size_px)
+    return _FONT_CACHE[key]
+
+
+class GlyphDisplay(tk.Canvas):
+    """
+    نمایشگر عددی بزرگ با کش گلیف.
+    هر کاراکتر فقط یک بار با Pillow رندر و به PhotoImage تبدیل می‌شود؛ در هر
+    به‌روزرسانی فقط تصویر موقعیت‌هایی که تغییر کرده‌اند عوض می‌شود و Tk دیگر
+    فونت بزرگ را چیدمان و رستر نمی‌کند.
+    API آن برای Presenter ها مثل ttk.Label است: configure(text=...) و cget("text").
+    """
+
+    def __init__(self, parent, text="", font=("Segoe UI", 48, "bold"), bootstyle="inverse-dark", padding=0):
+        self._family, self._size_pt = font[0], font[1]
+        self._padding = padding
+        self._fg, self._bg = self._resolve_colors(bootstyle)
+        super().__init__(parent, background=self._bg, highlightthickness=0, borderwidth=0)
+
+        self._size_px = int(round(self.winfo_fpixels(f"{self._size_pt}p")))
+        self._font = load_font(self._family, self._size_px)
+        ascent, descent = self._font.getmetrics()
+        self._ascent = ascent
+        self._cell_h = ascent + descent
+
+        self._text = ""
+        self._items = []      # شناسه آیتم تصویر برای هر موقعیت
+        self._chars = []      # کاراکتر فعلی هر موقعیت
+
+        for ch in PRELOAD_CHARS:
+            self._glyph(ch)
+
+        self.configure(height=self._cell_h + 2 * padding)
+        self.bind("<Configure>", self._on_resize)
+        self.set_text(str(text))
+
+    # ---------- رنگ و گلیف ----------
+
+    @staticmethod
+    def _resolve_colors(bootstyle):
+        """inverse-<color>: پس‌زمینه رنگ تم و متن روشن (مثل ttk.Label)"""
+        colors = ttk.Style().colors
+        if bootstyle.startswith("inverse-"):
+            return colors.selectfg, colors.get(bootstyle[len("inverse-"):]) or colors.bg
+        return colors.get(bootstyle) or colors.fg, colors.bg
+
+    def _glyph(self, ch):
+        key = (self._family, self._size_px, self._fg, self._bg, ch)
+        cached = _GLYPH_CACHE.get(key)
+        if cached is None:
+            width = max(1, int(round(self._font.getlength(ch))))
+            img = Image.new("RGB", (width, self._cell_h), self._bg)
+            ImageDraw.Draw(img).text((0, self._ascent), ch, font=self._font, fill=self._fg, anchor="ls")
+            cached = (ImageTk.PhotoImage(img, master=self), width)
+            _GLYPH_CACHE[key] = cached
+        return cached
+
+    # ---------- متن ----------
+
+    def set_text(self, text):
+        text = str(text)
+        if text == self._text:
+            return
+        # اگر طول یا عرض کاراکترها عوض شود چیدمان کامل لازم است
+        if len(text) != len(self._chars) or any(
+            self._glyph(a)[1] != self._glyph(b)[1] for a, b in zip(text, self._chars)
+        ):
+            self._layout(text)
+        else:
+            for i, (new, old) in enumerate(zip(text, self._chars)):
+                if new != old:
+                    self.itemconfigure(self._items[i], image=self._glyph(new)[0])
+                    self._chars[i] = new
+        self._text = text
+
+    def _layout(self, text):
+        self.delete("glyph")
+        self._items = []
+        self._chars = list(text)
+        total_w = sum(self._glyph(ch)[1] for ch in text)
+        x = max(0, (self.winfo_width() - total_w) // 2) if self.winfo_width() > 1 else self._padding
+        y = max(self._padding, (self.winfo_height() - self._cell_h) // 2)
+        for ch in text:
+            photo, width = self._glyph(ch)
+            self._items.append(self.create_image(x, y, image=photo, anchor="nw", tags="glyph"))
+            x += width
+        req_w = total_w + 2 * self._padding
+        if int(self.cget("width")) != req_w:
+            super().configure(width=req_w)
+
+    def _on_resize(self, event):
+        self._layout(self._text)
+
+    # ---------- سازگاری با ttk.Label ----------
+
+    def configure(self, cnf=None, **kw):
+        restyle = False
+        if "bootstyle" in kw:
+            colors = self._resolve_colors(kw.pop("bootstyle"))
+            if colors != (self._fg, self._bg):
+                self._fg, self._bg = colors
+                kw["background"] = self._bg
+                restyle = True
+        text = kw.pop("text", None)
+        result = super().configure(cnf, **kw) if (cnf or kw) else None
+        if restyle:
+            # گلیف‌های رنگ جدید هم فقط یک بار ساخته و کش می‌شوند
+            self._layout(self._text)
+        if text is not None:
+            self.set_text(text)
+        return result
+
+    config = configure
+
+    def cget(self, key):
+        if key == "text":
+            return self._text
+        return super().cget(key)
+
+
+def benchmark_updates(root, updates=300):
+    """
+    مقایسه هزینه هر به‌روزرسانی: ttk.Label با فونت بزرگ در برابر GlyphDisplay.
+    خروجی: میانگین میلی‌ثانیه برای configure + update_idletasks
+    """
+    results = {}
+    candidates = {
+        "ttk.Label": lambda: ttk.Label(root, text="00:00:00", font=("Segoe UI", 70, "bold"), bootstyle="inverse-dark"),
+        "GlyphDisplay": lambda: GlyphDisplay(root, text="00:00:00", font=("Segoe UI", 70, "bold")),
+    }
+    for name, factory in candidates.items():
+        widget = factory()
+        widget.pack()
+        root.update()
+        t0 = time.perf_counter()
+        for i in range(updates):
+            widget.configure(text=f"00:{(i // 60) % 60:02d}:{i % 60:02d}")
+            root.update_idletasks()
+        results[name] = (time.perf_counter() - t0) * 1000.0 / updates
+        widget.destroy()
+    return results
+
+
+if __name__ == "__main__":
+    app = ttk.Window(themename="darkly")
+    for widget_name, ms in benchmark_updates(app).items():
+        print(f"{widget_name:13s} {ms:.3f} ms/update")
+    app.destroy()
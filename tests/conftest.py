@@ -0,0 +1,34 @@
+import os
+import sys
+
+# همه تست‌ها روی پین‌های شبیه‌سازی gpiozero اجرا می‌شوند (بدون سخت‌افزار)
+os.environ.setdefault("GPIOZERO_PIN_FACTORY", "mock")
+os.environ.setdefault("GPIOZERO_MOCK_PIN_CLASS", "mockpwmpin")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytest
+from gpiozero import Device
+
+
+@pytest.fixture
+def pins():
+    """کارخانه پین شبیه‌سازی؛ بعد از هر تست همه پین‌ها آزاد می‌شوند"""
+    if Device.pin_factory is None:
+        Device.pin_factory = Device._default_pin_factory()
+    yield Device.pin_factory
+    Device.pin_factory.reset()
+
+
+@pytest.fixture
+def tk_root():
+    """پنجره ttkbootstrap پنهان؛ بدون ttkbootstrap یا نمایشگر تست رد می‌شود"""
+    ttk = pytest.importorskip("ttkbootstrap")
+    import tkinter as tk
+    try:
+        root = ttk.Window(themename="darkly")
+    except tk.TclError as e:
+        pytest.skip(f"no display: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
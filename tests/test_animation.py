@@ -0,0 +1,88 @@
+import time
+
+from view.animation import Tween, ease_out_cubic
+
+
+class FakeWidget:
+    """زمان‌بند after شبیه Tk؛ callback ها با run_due اجرا می‌شوند"""
+
+    def __init__(self):
+        self.pending = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        self.pending[self._next] = (time.monotonic() + ms / 1000.0, func)
+        return self._next
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_until_idle(self, stall_s=0.0, timeout=2.0):
+        """اجرای callback ها به ترتیب زمان؛ stall_s شبیه‌سازی حلقه‌ای است که دیر سرویس می‌دهد"""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            after_id, (due, func) = min(self.pending.items(), key=lambda kv: kv[1][0])
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            time.sleep(stall_s)
+            del self.pending[after_id]
+            func()
+
+
+def test_tween_reaches_target_in_wall_clock_time():
+    widget = FakeWidget()
+    values = []
+    tween = Tween(widget, values.append, duration_ms=100, fps=60, easing=ease_out_cubic)
+    t0 = time.monotonic()
+    tween.start(250)
+    widget.run_until_idle()
+    assert values[-1] == 250 and tween.value == 250
+    assert not tween.running
+    assert 0.09 <= time.monotonic() - t0 < 0.2
+    assert all(b > a for a, b in zip(values, values[1:]))   # بدون برگشت
+
+
+def test_slow_loop_drops_frames_but_keeps_duration():
+    widget = FakeWidget()
+    tween = Tween(widget, lambda x: None, duration_ms=120, fps=60)
+    t0 = time.monotonic()
+    tween.start(-250)
+    widget.run_until_idle(stall_s=0.04)   # هر فریم 40 ms دیر
+    elapsed = time.monotonic() - t0
+    assert tween.value == -250
+    assert elapsed < 0.25   # طول انیمیشن به سرعت حلقه بستگی ندارد
+    summary = tween.stats.summary()
+    assert summary["missed"] > 0
+    assert summary["frames"] < 120 / (1000 / 60)
+
+
+def test_retarget_continues_from_current_position():
+    widget = FakeWidget()
+    values = []
+    tween = Tween(widget, values.append, duration_ms=100)
+    tween.start(200)
+    # چند فریم اول
+    for _ in range(3):
+        after_id, (due, func) = next(iter(widget.pending.items()))
+        time.sleep(max(0.0, due - time.monotonic()))
+        del widget.pending[after_id]
+        func()
+    mid = tween.value
+    assert 0 < mid < 200
+    tween.start(0)
+    widget.run_until_idle()
+    assert tween.value == 0
+    returning = values[values.index(mid) + 1:]
+    assert returning and all(v < mid for v in returning)
+
+
+def test_jump_and_cancel():
+    widget = FakeWidget()
+    values = []
+    tween = Tween(widget, values.append, duration_ms=100)
+    tween.start(100)
+    tween.jump(40)
+    assert not tween.running and not widget.pending
+    assert values[-1] == 40 and tween.value == 40
@@ -0,0 +1,49 @@
+import threading
+import time
+
+import pytest
+
+from model.autofocus import AutoFocus, SimulatedCamera, SimulatedColumn, SimulatedEncoder
+
+
+@pytest.fixture
+def rig():
+    # ستون واقعی 15% کندتر از سرعت کالیبره شده
+    column = SimulatedColumn(200.0 * 0.85, start_um=80.0)
+    camera = SimulatedCamera(column, focus_um=0.0)
+    yield column, camera
+    camera.close()
+
+
+def run_focus(af):
+    done = threading.Event()
+    out = {}
+    assert af.run(on_done=lambda r: (out.update(result=r), done.set()))
+    assert done.wait(30.0)
+    return out["result"]
+
+
+def test_encoder_position_instead_of_dead_reckoning(rig):
+    column, camera = rig
+    af = AutoFocus(column, camera.ring, speed_um_s=200.0, positioner=SimulatedEncoder(column))
+    result = run_focus(af)
+    assert result is not None
+    actual = column.position_at(time.monotonic())
+    assert abs(actual) < 3.0
+    # موقعیت گزارش شده همان موقعیت انکودر است، نه زمان × سرعت کالیبره شده
+    assert af.position_um == pytest.approx(actual, abs=1.0)
+    assert result["offset_um"] == pytest.approx(actual - 80.0, abs=1.0)
+
+
+def test_rejected_while_column_is_in_use(rig):
+    column, camera = rig
+    encoder = SimulatedEncoder(column)
+    af = AutoFocus(column, camera.ring, positioner=encoder)
+
+    encoder.busy = True   # حرکت انکودری در جریان
+    assert not af.run()
+    encoder.busy = False
+
+    af.column_free = lambda: False   # دستور در حال اجرا یا حرکت دستی
+    assert not af.run()
+    assert not af.busy and column.moving_since is None
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from model.camera import CameraProcess, FrameRing
+
+
+@pytest.fixture
+def ring():
+    r = FrameRing(8, 4, slots=3, create=True)
+    yield r
+    r.close(unlink=True)
+
+
+def frame(value):
+    return bytes([value]) * (8 * 4 * 3)
+
+
+def test_ring_round_trip_and_wraparound(ring):
+    assert ring.read_copy() is None
+    for value in range(1, 6):
+        assert ring.write(frame(value), t_ns=value) == value
+    assert ring.latest_id() == 5
+    assert ring.read_copy() == (5, frame(5), 5)
+    assert ring.read_copy(4)[1] == frame(4)
+    assert ring.acquire(1) is None   # خانه‌اش با فریم 4 بازنویسی شده
+
+
+def test_reader_detects_overwrite_during_read(ring):
+    ring.write(frame(1))
+    view, seq, _ = ring.acquire(1)
+    view.release()
+    for value in range(2, 5):   # نویسنده یک دور کامل جلو می‌رود
+        ring.write(frame(value))
+    assert not ring.still_valid(1, seq)
+
+
+def test_attach_reads_geometry_from_header(ring):
+    ring.write(frame(7))
+    other = FrameRing.attach(ring.name)
+    try:
+        assert (other.width, other.height, other.slots) == (8, 4, 3)
+        assert other.read_copy()[1] == frame(7)
+    finally:
+        other.close()
+
+
+def test_capture_process_fills_ring():
+    cam = CameraProcess("synthetic", 64, 48, fps=50, slots=3)
+    try:
+        time.sleep(0.3)
+        st = cam.stats()
+        assert st["signal"] and st["frames"] > 3
+        frame_id, data, _ = cam.ring.read_copy()
+        assert len(data) == 64 * 48 * 3
+    finally:
+        cam.close()
+    assert not cam.is_alive()
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from model.contact_model import RECORDED_TOUCHDOWN, ContactModel, Debouncer, replay, replay_on_mock_pin
+
+
+def test_replay_recorded_touchdown():
+    accepted = replay(RECORDED_TOUCHDOWN, make_window_s=0.02, break_window_s=0.05)
+    # لرزش برقراری و قطع کوتاه 10 ms حذف می‌شوند؛ فقط یک تماس و یک جدا شدن می‌ماند
+    assert [state for _, state in accepted] == [True, False]
+    assert accepted[0][0] == pytest.approx(0.009 + 0.02)
+    assert accepted[1][0] == pytest.approx(0.606 + 0.05)
+
+
+def test_debouncer_counts_rejected_bounce():
+    deb = Debouncer(make_window_s=0.02, break_window_s=0.05)
+    deb.edge(True, 0.0)
+    deb.edge(False, 0.005)
+    assert deb.rejected == 1
+    assert deb.deadline() is None
+    assert not deb.poll(1.0)
+    assert deb.state is False
+
+
+def test_replay_on_mock_pin_matches_deterministic_replay(pins):
+    observed, expected = replay_on_mock_pin(RECORDED_TOUCHDOWN, pin=21)
+    assert [s for _, s in observed] == [s for _, s in expected]
+    for (t_obs, _), (t_exp, _) in zip(observed, expected):
+        # هرگز قبل از پایان پنجره دیبانس پذیرفته نمی‌شود؛ دیر رسیدن فقط به زمان‌بندی ترد بستگی دارد
+        assert t_exp - 0.005 <= t_obs < t_exp + 0.05
+
+
+def test_listeners_only_on_accepted_change(pins):
+    contact = ContactModel(21, make_window_s=0.01, break_window_s=0.01)
+    pin = pins.pin(21)
+    seen = []
+    contact.listeners.append(lambda state, t: seen.append(state))
+    pin.drive_low()
+    pin.drive_high()   # لرزش کوتاه‌تر از پنجره
+    pin.drive_low()
+    time.sleep(0.1)
+    assert seen == [True]
+    assert contact.is_touching
+    contact.close()
@@ -0,0 +1,65 @@
+import threading
+
+from view.dispatcher import UIDispatcher
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, func):
+        self.scheduled.append((ms, func))
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def step(self):
+        ms, func = self.scheduled.pop(0)
+        func()
+        return ms
+
+
+def test_posts_from_threads_run_in_order_on_ui_thread():
+    root = FakeRoot()
+    disp = UIDispatcher(root)
+    seen = []
+    threads = [threading.Thread(target=lambda n=n: disp.post(seen.append, n)) for n in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert disp.depth == 20 and seen == []
+    disp.start()
+    root.step()
+    assert sorted(seen) == list(range(20))
+    assert disp.stats()["delivered"] == 20 and disp.max_depth == 20
+
+
+def test_poll_backs_off_when_idle_and_speeds_up_on_work():
+    root = FakeRoot()
+    disp = UIDispatcher(root, min_ms=4, max_ms=64)
+    disp.start()
+    intervals = [root.step() for _ in range(6)]
+    assert intervals[0] == 4
+    assert root.scheduled[-1][0] == 64
+    disp.post(lambda: None)
+    root.step()
+    assert root.scheduled[-1][0] == 4
+
+
+def test_failing_task_does_not_block_the_rest(capsys):
+    disp = UIDispatcher(FakeRoot())
+    seen = []
+    disp.post(lambda: 1 / 0)
+    disp.post(seen.append, "ok")
+    assert disp.drain() == 2
+    assert seen == ["ok"]
+    assert "[DISPATCH]" in capsys.readouterr().out
+
+
+def test_drain_respects_budget():
+    disp = UIDispatcher(FakeRoot(), budget_ms=0.0)
+    for _ in range(5):
+        disp.post(lambda: None)
+    assert disp.drain() == 1 and disp.depth == 4
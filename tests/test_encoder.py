@@ -0,0 +1,82 @@
+import pytest
+
+from model.encoder import QuadratureEncoder
+
+# یک سیکل کامل رو به جلو (A, B)؛ هر گذار +1
+FORWARD = ((1, 0), (1, 1), (0, 1), (0, 0))
+
+
+@pytest.fixture
+def encoder(pins):
+    enc = QuadratureEncoder(20, 21, counts_per_um=4.0)
+    yield enc, pins.pin(20), pins.pin(21)
+    enc.close()
+
+
+def drive(pin, value):
+    # pull-up: مقدار 1 یعنی پین پایین کشیده شده
+    if value:
+        pin.drive_low()
+    else:
+        pin.drive_high()
+
+
+def edges(cycles, reverse=False):
+    """لبه‌های تک‌کاناله (pin_index, value) برای چند سیکل"""
+    seq = FORWARD[::-1] if reverse else FORWARD
+    if reverse:
+        seq = seq[1:] + seq[:1]   # از 00 شروع به 01 برود
+    state = (0, 0)
+    out = []
+    for _ in range(cycles):
+        for nxt in seq:
+            ch = 0 if nxt[0] != state[0] else 1
+            out.append((ch, nxt[ch]))
+            state = nxt
+    return out
+
+
+def test_counts_both_directions(encoder):
+    enc, pa, pb = encoder
+    for ch, value in edges(25):
+        drive((pa, pb)[ch], value)
+    assert enc.position == 100 and enc.position_um == 25.0
+    for ch, value in edges(10, reverse=True):
+        drive((pa, pb)[ch], value)
+    assert enc.position == 60
+    assert enc.missed == 0
+
+
+def test_burst_delivered_late_keeps_every_count(encoder, pins):
+    """
+    همه لبه‌های یک رگبار قبل از رسیدن ترد callback رخ می‌دهند (مثل صف رویداد lgpio
+    وقتی callback ها عقب می‌افتند)؛ هر رویداد سطح لبه خودش را دارد و نباید شمارشی گم شود.
+    """
+    enc, pa, pb = encoder
+    handlers = {pa: pa.when_changed, pb: pb.when_changed}
+    for pin in handlers:
+        pin.when_changed = None
+    queued = []
+    for ch, value in edges(50):
+        pin = (pa, pb)[ch]
+        drive(pin, value)
+        queued.append((pin, pin.state))
+    for pin, handler in handlers.items():
+        pin.when_changed = handler
+    for pin, state in queued:
+        pin.when_changed(pins.ticks(), state)
+
+    assert enc.edges == 200
+    assert enc.position == 200
+    assert enc.missed == 0
+
+
+def test_zero(encoder):
+    enc, pa, pb = encoder
+    for ch, value in edges(3):
+        drive((pa, pb)[ch], value)
+    enc.zero()
+    assert enc.position == 0
+    for ch, value in edges(1):
+        drive((pa, pb)[ch], value)
+    assert enc.position == 4
@@ -0,0 +1,70 @@
+from model.estop_model import EStopModel
+from model.light_model import LightModel
+from model.pad_model import PadModel
+
+
+def closed_estop(pins, **outputs):
+    """کلید NC در حالت عادی (مدار بسته) و ریست شده"""
+    estop = EStopModel(16, **outputs)
+    pin = pins.pin(16)
+    pin.drive_low()
+    assert estop.reset()
+    return estop, pin
+
+
+def test_open_circuit_at_boot_is_tripped(pins):
+    # pull-up بدون کنتاکت بسته = سیم قطع
+    estop = EStopModel(16)
+    assert estop.is_pressed
+    assert estop.tripped
+    estop.close()
+
+
+def test_press_trips_and_cuts_outputs(pins):
+    light = LightModel(12)
+    pad = PadModel(18, 23, 24)
+    estop, pin = closed_estop(pins, light=light, pad=pad)
+    light.set_brightness(70)
+    pad.set_speed(50)
+
+    pin.drive_high()   # فشردن: کنتاکت NC باز می‌شود
+    assert estop.trip_event.wait(1.0)
+    assert estop.tripped
+    assert light.current_brightness == 0 and light.led.device.value == 0
+    assert pad.current_speed == 0
+
+    estop.close()
+    pad.close()
+    light.close()
+
+
+def test_interlock_blocks_outputs_until_reset(pins):
+    light = LightModel(12)
+    estop, pin = closed_estop(pins, light=light)
+    pin.drive_high()
+    assert estop.trip_event.wait(1.0)
+
+    # مثلاً after معلق اسلایدر نور بعد از توقف
+    light.set_brightness(40)
+    assert light.current_brightness == 0
+    light.set_brightness(0)   # خاموش کردن همیشه مجاز است
+
+    assert not estop.reset(), "reset must be refused while the circuit is open"
+    pin.drive_low()
+    assert estop.reset()
+    light.set_brightness(40)
+    assert light.current_brightness == 40
+
+    estop.close()
+    light.close()
+
+
+def test_normally_open_button(pins):
+    estop = EStopModel(16, normally_closed=False)
+    pin = pins.pin(16)
+    assert not estop.tripped
+    pin.drive_low()
+    assert estop.trip_event.wait(1.0)
+    pin.drive_high()
+    assert estop.reset()
+    estop.close()
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("ttkbootstrap")
+
+from view.widgets.glyph_display import GlyphDisplay, _GLYPH_CACHE
+
+
+def test_label_surface_and_partial_updates(tk_root):
+    lcd = GlyphDisplay(tk_root, text="00:00:00", font=("Consolas", 24, "bold"))
+    lcd.pack()
+    tk_root.update()
+    items = list(lcd._items)
+    cached = len(_GLYPH_CACHE)
+
+    lcd.configure(text="00:00:01")
+    assert lcd.cget("text") == "00:00:01"
+    assert lcd._items == items            # فقط تصویر آخرین موقعیت عوض شد
+    assert len(_GLYPH_CACHE) == cached    # ارقام از قبل کش شده بودند
+
+    lcd.configure(text="100:00:01")       # طول متفاوت: چیدمان کامل
+    assert len(lcd._items) == 9
+
+
+def test_bootstyle_change_restyles_once(tk_root):
+    lcd = GlyphDisplay(tk_root, text="12", font=("Segoe UI", 20, "bold"))
+    before = lcd._fg, lcd._bg
+    lcd.configure(bootstyle="inverse-success", text="13")
+    assert (lcd._fg, lcd._bg) != before
+    assert lcd.cget("text") == "13"
@@ -0,0 +1,84 @@
+import struct
+import time
+
+import pytest
+
+from model.hw_process import CONTROL_FIELDS, CONTROL_FMT, HardwareProcess, SeqBlock
+from model.shadow_pins import PinWriteStats, ShadowPin
+
+PINS = {"light": 18, "lissa": 26, "pad_pwm": 12, "pad_cw": 13, "pad_ccw": 6, "col_en": 19, "col_dir": 5}
+
+
+def test_seqblock_round_trip_and_stalled_writer():
+    block = SeqBlock(CONTROL_FMT, CONTROL_FIELDS, create=True)
+    try:
+        values = (42.5, 1, 3, 80, 1, -1, 123, 456)
+        seq = block.write(values)
+        read_seq, data = block.read()
+        assert read_seq == seq
+        assert tuple(data[f] for f in CONTROL_FIELDS) == values
+
+        # نویسنده‌ای که وسط نوشتن مرده (seq فرد): خواننده باید با خطا برگردد نه بچرخد
+        struct.pack_into("<I", block.shm.buf, 0, seq + 1)
+        t0 = time.monotonic()
+        with pytest.raises(TimeoutError):
+            block.read(timeout_s=0.05)
+        assert time.monotonic() - t0 < 1.0
+    finally:
+        block.close(unlink=True)
+
+
+def wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_stale_ui_heartbeat_switches_outputs_off():
+    hw = HardwareProcess(PINS, ui_timeout_s=0.3)
+    try:
+        hw.pad.set_speed(60)
+        hw.light.set_brightness(70)
+        assert wait_for(lambda: hw.read_status()["pad_duty"] > 0.1)
+
+        # ضربان منظم: خاموش نمی‌شود
+        for _ in range(10):
+            hw.heartbeat()
+            time.sleep(0.05)
+        assert hw.read_status()["safe_offs"] == 0
+
+        # UI گیر کرده: بدون ضربان
+        assert wait_for(lambda: hw.read_status()["safe_offs"] == 1)
+        assert wait_for(lambda: hw.read_status()["pad_duty"] == 0)
+
+        fired = []
+        hw.listeners.append(lambda: fired.append(True))
+        hw.heartbeat()
+        assert fired == [True]
+        assert hw.pad.current_speed == 0 and hw.light.current_brightness == 0
+
+        # بعد از بازگشت UI خروجی‌ها خودبه‌خود روشن نمی‌شوند
+        for _ in range(10):
+            hw.heartbeat()
+            time.sleep(0.03)
+        assert hw.read_status()["pad_duty"] == 0
+    finally:
+        hw.close()
+
+
+class FakeDevice:
+    value = 0
+
+
+def test_listener_only_sees_issued_writes():
+    stats = PinWriteStats()
+    seen = []
+    stats.listener = seen.append
+    pin = ShadowPin(FakeDevice(), name="col_en", stats=stats)
+    pin.on()
+    pin.on()
+    pin.off()
+    assert seen == ["col_en", "col_en"]
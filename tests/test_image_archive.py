@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+
+import pytest
+
+from model.image_archive import ImageArchive
+from presenter.gallery_presenter import GalleryPresenter
+
+SIZE = (32, 24)
+
+
+def frame(value):
+    return bytes([value]) * (SIZE[0] * SIZE[1] * 3)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    arc = ImageArchive(str(tmp_path / "archive"), thumb_size=(16, 12))
+    yield arc
+    arc.close()
+
+
+def test_store_deduplicate_and_page(archive):
+    for value, run in ((10, "r1"), (20, "r1"), (10, "r2")):
+        assert archive.submit(frame(value), SIZE, run=run, verdict="PASS", operator="ali")
+    assert archive.flush()
+    assert (archive.stored, archive.deduplicated, archive.total) == (2, 1, 3)
+
+    rows = archive.page(limit=2)
+    assert [r["run"] for r in rows] == ["r2", "r1"]
+    assert rows[0]["hash"] == archive.run_captures("r1")[0]["hash"]
+    older = archive.page(before_id=rows[-1]["id"], limit=2)
+    assert len(older) == 1
+    assert os.path.exists(archive.abspath(rows[0]["path"]))
+    assert archive.load_thumb(rows[0]["thumb"]).size == (16, 12)
+
+
+def test_total_survives_reopen(tmp_path):
+    root = str(tmp_path / "archive")
+    arc = ImageArchive(root)
+    arc.submit(frame(1), SIZE)
+    arc.submit(frame(2), SIZE)
+    arc.close()
+    arc = ImageArchive(root)
+    try:
+        assert arc.total == 2
+    finally:
+        arc.close()
+
+
+def test_unknown_format_rejected_up_front(tmp_path):
+    with pytest.raises(ValueError):
+        ImageArchive(str(tmp_path / "archive"), fmt="JPEG")
+
+
+def test_bad_meta_fails_one_frame_and_rolls_back(archive):
+    archive.submit(frame(5), SIZE, extra=object())   # قابل تبدیل به JSON نیست
+    archive.submit(frame(6), SIZE, run="ok")
+    assert archive.flush(timeout=2.0)
+    assert archive.failures == 1
+    assert archive.stored == 1 and archive.total == 1
+    # ردیف images فریم ناموفق برنگشته نمانده است
+    assert archive._db().execute("SELECT COUNT(*) FROM images").fetchone()[0] == 1
+    # کارگر زنده است
+    archive.submit(frame(5), SIZE)
+    assert archive.flush(timeout=2.0)
+    assert archive.stored == 2
+
+
+class FakeWidget:
+    def __init__(self):
+        self.options = {}
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def bind(self, event, func):
+        pass
+
+
+class FakeUIState:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, **options):
+        self.values[key] = options
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.posted = []
+        self.event = threading.Event()
+
+    def post(self, func, *args):
+        self.posted.append((func, args))
+        self.event.set()
+
+
+class FakeView:
+    def __init__(self):
+        self.control_widgets = {k: FakeWidget() for k in ("gallery_next", "gallery_prev")}
+        self.control_widgets.update({f"gallery_thumb_{i}": FakeWidget() for i in range(GalleryPresenter.PAGE_SIZE)})
+        self.ui_state = FakeUIState()
+        self.dispatcher = FakeDispatcher()
+
+
+def test_gallery_queries_off_the_ui_thread(archive):
+    archive.submit(frame(1), SIZE, verdict="PASS")
+    archive.submit(frame(2), SIZE, verdict="FAIL")
+    assert archive.flush()
+
+    ui_thread = threading.get_ident()
+    calls = []
+    page = archive.page
+    archive.page = lambda *args: calls.append(threading.get_ident()) or page(*args)
+
+    view = FakeView()
+    presenter = GalleryPresenter(archive, view)
+    assert view.dispatcher.event.wait(2.0)
+    assert calls and ui_thread not in calls
+
+    func, args = view.dispatcher.posted.pop(0)
+    assert func == presenter._show_page
+    view.dispatcher.event.clear()
+    func(*args)
+    assert view.ui_state.values["gallery_info"] == {"text": "2 images"}
+    assert view.control_widgets["gallery_thumb_0"].options["text"].endswith("FAIL")
+
+    # تصاویر کوچک در ترد خواننده دکد و یکی یکی به UI فرستاده می‌شوند
+    for _ in range(200):
+        if len(view.dispatcher.posted) == 2:
+            break
+        time.sleep(0.01)
+    thumbs = [args for func, args in view.dispatcher.posted if func == presenter._show_thumb]
+    assert [a[1] for a in thumbs] == [0, 1]
+    assert thumbs[0][3].size == (16, 12)
@@ -0,0 +1,53 @@
+import threading
+
+import numpy as np
+import pytest
+
+from model.camera import FrameRing
+from model.inspection import InspectionService, analyze, focus_score, synthetic_endface, to_gray
+
+SIZE = (320, 240)
+
+
+@pytest.mark.parametrize("defects, passed", [
+    ({}, True),
+    ({"scratches": 1}, False),
+    ({"pits": 1}, False),
+    ({"particles": 1}, False),
+])
+def test_verdicts_on_synthetic_endfaces(defects, passed):
+    img = synthetic_endface(SIZE, np.random.default_rng(3), **defects)
+    result = analyze(img)
+    assert result["found"]
+    assert result["passed"] is passed
+    assert result["um_per_px"] > 0 and result["concentricity_um"] < 2.0
+
+
+def test_no_fiber_is_reported():
+    result = analyze(np.zeros((SIZE[1], SIZE[0], 3), dtype=np.uint8))
+    assert not result["found"] and result["failures"] == ["no fiber"]
+
+
+def test_focus_score_drops_with_blur():
+    rng = np.random.default_rng(4)
+    sharp = focus_score(to_gray(synthetic_endface(SIZE, rng)))
+    blurred = focus_score(to_gray(synthetic_endface(SIZE, rng, blur=3)))
+    assert sharp > 2 * blurred
+
+
+def test_service_reads_frames_from_the_ring():
+    ring = FrameRing(SIZE[0], SIZE[1], slots=3, create=True)
+    service = InspectionService(ring.name, workers=1)
+    done = threading.Event()
+    results = []
+    service.listeners.append(lambda r: (results.append(r), done.set()))
+    try:
+        fid = ring.write(synthetic_endface(SIZE, np.random.default_rng(5), pits=1).tobytes())
+        assert service.submit(fid)
+        assert not service.submit(fid)   # تنها کارگر مشغول است؛ صف ساخته نمی‌شود
+        assert done.wait(30.0)
+        assert results[0]["frame_id"] == fid and not results[0]["passed"]
+        assert service.stats()["skipped"] == 1
+    finally:
+        service.close()
+        ring.close(unlink=True)
@@ -0,0 +1,56 @@
+from model.light_model import build_gamma_lut
+from presenter.coalescer import LatestValueCoalescer
+
+
+class FakeWidget:
+    def __init__(self):
+        self.timers = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        self.timers[self._next] = func
+        return self._next
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def fire(self):
+        timers, self.timers = self.timers, {}
+        for func in timers.values():
+            func()
+
+
+def test_burst_is_coalesced_to_latest_value():
+    widget, applied = FakeWidget(), []
+    pipe = LatestValueCoalescer(widget, applied.append, interval_ms=16)
+    for v in range(50):
+        pipe.push(v)
+    assert applied == [] and len(widget.timers) == 1   # یک تایمر برای کل رگبار
+    widget.fire()
+    assert applied == [49]
+    assert pipe.stats() == {"received": 50, "applied": 1, "merged": 49}
+    widget.fire()
+    assert applied == [49]   # چیزی معلق نیست
+
+
+def test_flush_applies_immediately_and_cancel_discards():
+    widget, applied = FakeWidget(), []
+    pipe = LatestValueCoalescer(widget, applied.append)
+    pipe.push(30)
+    pipe.flush()
+    assert applied == [30] and not widget.timers
+    pipe.push(70)
+    pipe.cancel()
+    widget.fire()
+    pipe.flush()
+    assert applied == [30]
+
+
+def test_gamma_lut_is_monotonic_and_perceptual():
+    lut = build_gamma_lut(2.2)
+    assert len(lut) == 101
+    assert lut[0] == 0.0 and lut[100] == 1.0
+    assert all(b >= a for a, b in zip(lut, lut[1:]))
+    # نیمه اسلایدر حدود یک پنجم duty (نه نصف)
+    assert 0.2 <= lut[50] <= 0.23
@@ -0,0 +1,70 @@
+from presenter.pad_presenter import PadPresenter
+from model.speed_controller import SpeedController
+
+
+class FakeUIState:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, **options):
+        self.values[key] = options
+
+
+class FakeLabel:
+    def __init__(self, text):
+        self.text = text
+
+    def cget(self, key):
+        return self.text
+
+
+class FakeView:
+    def __init__(self, speed="0"):
+        self.control_widgets = {"speed": FakeLabel(speed)}
+        self.ui_state = FakeUIState()
+
+    def after(self, ms, func):
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class FakePad:
+    def __init__(self):
+        self.current_speed = 0
+        self.is_ccw = False
+
+    def set_speed(self, percent):
+        self.current_speed = max(0, min(100, percent))
+
+    def set_direction(self, ccw):
+        self.is_ccw = ccw
+
+    def apply_duty(self, duty):
+        return self.current_speed > 0
+
+
+class StillTach:
+    def rpm(self, now):
+        return 0.0
+
+
+def test_low_rpm_target_survives_first_control_tick():
+    pad = FakePad()
+    ctrl = SpeedController(pad, StillTach(), max_rpm=3000.0)
+    presenter = PadPresenter(pad, FakeView("10"), speed_controller=ctrl)
+
+    # 10 rpm -> feed-forward 0.3% که به 0 گرد می‌شد
+    presenter.on_start()
+    assert pad.current_speed == 1
+    ctrl.step(0.0, 0.02)
+    assert ctrl.target_rpm == 10.0
+
+
+def test_zero_target_does_not_start():
+    pad = FakePad()
+    ctrl = SpeedController(pad, StillTach())
+    presenter = PadPresenter(pad, FakeView("0"), speed_controller=ctrl)
+    presenter.on_start()
+    assert pad.current_speed == 0
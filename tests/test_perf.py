@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from utils.perf import PerfRegistry
+
+
+def test_lag_histogram_buckets_and_summary():
+    perf = PerfRegistry()
+    for lag in (0.5, 1.0, 3.0, 40.0, 900.0):
+        perf.lag.add(lag)
+    report = perf.lag.as_dict()
+    assert report["buckets"]["<=1ms"] == 2
+    assert report["buckets"]["<=5ms"] == 1
+    assert report["buckets"]["<=50ms"] == 1
+    assert report["buckets"][">500ms"] == 1
+    assert report["count"] == 5 and report["max_ms"] == 900.0
+    perf.reset()
+    assert perf.lag.as_dict()["count"] == 0
+
+
+def test_timed_records_even_when_handler_raises():
+    perf = PerfRegistry()
+
+    @perf.timed("pad.start")
+    def start(speed):
+        return speed * 2
+
+    @perf.timed("pad.fail")
+    def fail():
+        raise RuntimeError("boom")
+
+    assert start(3) == 6 and start.__name__ == "start"
+    with pytest.raises(RuntimeError):
+        fail()
+    handlers = perf.as_dict()["handlers"]
+    assert handlers["pad.start"]["count"] == 1
+    assert handlers["pad.fail"]["count"] == 1
+
+
+def test_export_writes_json_report(tmp_path):
+    perf = PerfRegistry()
+    perf.record("light.apply", 2.5)
+    perf.sources["anim.drawer"] = lambda: {"count": 3}
+    path = perf.export(str(tmp_path / "perf.json"))
+    report = json.loads(open(path, encoding="utf-8").read())
+    assert report["handlers"]["light.apply"]["max_ms"] == 2.5
+    assert report["anim.drawer"] == {"count": 3}
+    assert "loop_lag" in report and "timestamp" in report
@@ -0,0 +1,94 @@
+import os
+
+from gpiozero import PWMOutputDevice
+
+from model.pwm_backend import SysfsPWM, benchmark, find_pwm_chip, make_pwm_output
+
+# pwmchip10 قبل از pwmchip2 مرتب می‌شود و 4 کانال دارد ولی کنترلر دیگری است
+CHIPS = (("pwmchip0", 2, "pwm@9c000"), ("pwmchip10", 4, "pwm@9c000"), ("pwmchip2", 4, "pwm@98000"))
+
+
+def pwm0_function(pin):
+    return {12: "PWM0_CHAN0", 13: "PWM0_CHAN1", 18: "PWM0_CHAN2", 19: "PWM0_CHAN3"}.get(pin, "none")
+
+
+def fake_sysfs(root, chips=CHIPS, channels=4):
+    """درخت جعلی /sys/class/pwm با فایل‌های معمولی (کانال‌ها از قبل export شده‌اند)"""
+    for name, npwm, node in chips:
+        chip = root / name
+        chip.mkdir(parents=True)
+        # device/of_node -> گره device-tree کنترلر
+        (root / "dt" / name / node).mkdir(parents=True)
+        (chip / "device").mkdir()
+        (chip / "device" / "of_node").symlink_to(root / "dt" / name / node)
+        (chip / "npwm").write_text(f"{npwm}\n")
+        (chip / "export").write_text("")
+        (chip / "unexport").write_text("")
+        for ch in range(min(npwm, channels)):
+            ch_dir = chip / f"pwm{ch}"
+            ch_dir.mkdir()
+            for f in ("period", "duty_cycle", "enable"):
+                (ch_dir / f).write_text("0")
+    return root
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_find_pwm_chip(tmp_path):
+    root = fake_sysfs(tmp_path)
+    assert find_pwm_chip(str(root)) == os.path.join(str(root), "pwmchip2")
+    assert find_pwm_chip(str(root), node="pwm@9c000") == os.path.join(str(root), "pwmchip10")
+    assert find_pwm_chip(str(root), min_channels=8) is None
+    assert find_pwm_chip(str(tmp_path / "missing")) is None
+
+
+def test_make_pwm_output_uses_hardware_only_when_pin_is_muxed(tmp_path, pins):
+    root = str(fake_sysfs(tmp_path))
+    dev = make_pwm_output(18, sysfs_root=root, pin_function=pwm0_function)
+    assert isinstance(dev, SysfsPWM)
+    assert dev.path == os.path.join(root, "pwmchip2", "pwm2")
+    dev.close()
+    # پین به صورت GPIO معمولی (بدون overlay) یا pinctrl ناموجود: PWM نرم‌افزاری
+    for func in (lambda pin: "GPIO18", lambda pin: None):
+        dev = make_pwm_output(18, sysfs_root=root, pin_function=func)
+        assert isinstance(dev, PWMOutputDevice)
+        dev.close()
+
+
+def test_sysfs_pwm_setup_write_and_close(tmp_path):
+    chip = str(fake_sysfs(tmp_path) / "pwmchip2")
+    dev = SysfsPWM(18, chip, 2, frequency=1000)
+    ch = os.path.join(chip, "pwm2")
+    assert read(os.path.join(ch, "period")) == "1000000"
+    assert read(os.path.join(ch, "enable")) == "1"
+
+    dev.value = 0.25
+    assert dev.value == 0.25
+    assert dev.read_duty() == 0.25
+    # عدد کوتاه‌تر بعد از بلندتر: "5000" نباید "500000" بماند
+    dev.value = 0.005
+    assert read(os.path.join(ch, "duty_cycle")) == "5000"
+    dev.value = 7   # محدود به 0..1
+    assert dev.read_duty() == 1.0
+
+    dev.close()
+    assert read(os.path.join(ch, "enable")) == "0"
+    assert read(os.path.join(chip, "unexport")) == "2"
+
+
+def test_make_pwm_output_falls_back_to_software(tmp_path, pins):
+    # پین بدون کانال سخت‌افزاری و ریشه sysfs ناموجود: هر دو PWM نرم‌افزاری
+    for pin, root in ((17, str(fake_sysfs(tmp_path))), (18, str(tmp_path / "missing"))):
+        dev = make_pwm_output(pin, sysfs_root=root, pin_function=pwm0_function)
+        assert isinstance(dev, PWMOutputDevice)
+        dev.close()
+
+
+def test_benchmark_reports_accuracy_only_for_hardware(tmp_path, pins):
+    root = str(fake_sysfs(tmp_path))
+    results = benchmark(18, duration=0.2, sysfs_root=root, pin_function=pwm0_function)
+    assert results["hardware"]["max_duty_error"] < 1e-6
+    assert results["software"]["max_duty_error"] is None
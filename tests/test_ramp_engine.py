@@ -0,0 +1,77 @@
+import threading
+
+from model.ramp_engine import RampEngine, ramp_table, unit_profile
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = []
+
+    def duty(self, value):
+        with self.lock:
+            self.events.append(("duty", value))
+
+    def direction(self, ccw):
+        with self.lock:
+            self.events.append(("dir", ccw))
+
+    def duties(self):
+        return [v for kind, v in self.events if kind == "duty"]
+
+
+def test_ramp_table_shapes():
+    assert ramp_table(0.5, 0.5, 2.0, 200) == ()
+    linear = ramp_table(0.0, 1.0, 2.0, 200, shape="trapezoid")
+    assert len(linear) == 100 and linear[-1] == 1.0
+    steps = [b - a for a, b in zip(linear, linear[1:])]
+    assert max(steps) - min(steps) < 1e-9
+    s = ramp_table(1.0, 0.0, 2.0, 200, shape="scurve")
+    assert s[-1] == 0.0 and len(s) == 150   # smoothstep: 1.5 برابر زمان
+    assert unit_profile("scurve", 4)[1] == 0.5
+
+
+def test_ramp_reaches_target_without_blocking_caller():
+    rec = Recorder()
+    engine = RampEngine(rec.duty, rec.direction, rate_hz=500, accel=10.0)
+    try:
+        engine.request(0.8, ccw=False)
+        assert not engine.is_idle()   # درخواست فوراً برمی‌گردد
+        assert engine.wait_idle(2.0)
+        assert rec.events[0] == ("dir", False)
+        duties = rec.duties()
+        assert duties[-1] == 0.8 and all(b >= a for a, b in zip(duties, duties[1:]))
+        assert engine.jitter.count == len(duties)
+    finally:
+        engine.close()
+
+
+def test_reversal_is_sequenced_through_zero():
+    rec = Recorder()
+    engine = RampEngine(rec.duty, rec.direction, rate_hz=500, accel=20.0, dead_time_ms=20)
+    try:
+        engine.request(0.5, ccw=False)
+        assert engine.wait_idle(2.0)
+        engine.request(0.5, ccw=True)
+        assert engine.wait_idle(2.0)
+        events = rec.events
+        flip = events.index(("dir", True))
+        # جهت فقط بعد از رسیدن duty به صفر عوض می‌شود
+        assert [v for kind, v in events[:flip] if kind == "duty"][-1] == 0.0
+        assert rec.duties()[-1] == 0.5
+    finally:
+        engine.close()
+
+
+def test_halt_stops_immediately():
+    rec = Recorder()
+    engine = RampEngine(rec.duty, rec.direction, rate_hz=200, accel=0.5)
+    try:
+        engine.request(1.0, ccw=True)
+        threading.Event().wait(0.05)
+        engine.halt()
+        assert engine.wait_idle(1.0)
+        assert engine.duty == 0.0 and engine.ccw is None
+        assert rec.events[-2:] == [("dir", None), ("duty", 0)]
+    finally:
+        engine.close()
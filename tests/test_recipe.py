@@ -0,0 +1,33 @@
+from unittest import mock
+
+import pytest
+
+from model.recipe import DEFAULT_RECIPE, RecipeRunner, compile_recipe
+
+
+def test_compile_recipe_timeline():
+    commands, stages = compile_recipe(DEFAULT_RECIPE)
+    assert [s["planned_start"] for s in stages][:2] == [0.0, 60.0]
+    assert all(a.t <= b.t for a, b in zip(commands, commands[1:]))
+    assert commands[-1].action == "finish"
+    with pytest.raises(ValueError):
+        compile_recipe({"stages": [{"duration_s": -1}]})
+
+
+def test_run_ids_are_unique_within_the_same_second():
+    runner = RecipeRunner(mock.Mock())
+    recipe = {"name": "quick", "stages": [{"name": "s", "speed": 10, "duration_s": 0}]}
+    ids = set()
+    for _ in range(20):
+        assert runner.run(recipe)
+        ids.add(runner.run_id)
+        runner._thread.join(1.0)
+        assert runner.state == "done"
+    assert len(ids) == 20
+
+
+def test_run_refused_when_start_not_allowed():
+    runner = RecipeRunner(mock.Mock())
+    runner.start_allowed = lambda: False   # مثلاً فوکوس خودکار ستون را گرفته
+    assert not runner.run(DEFAULT_RECIPE)
+    assert runner.state == "idle"
@@ -0,0 +1,209 @@
+import asyncio
+
+import pytest
+
+from model.remote_api import CommandError, RemoteAPI, WebSocketClient, http_request
+
+
+@pytest.fixture
+def api():
+    state = {"speed": 0}
+
+    def set_speed(percent):
+        percent = int(percent)
+        if not 0 <= percent <= 100:
+            raise ValueError("speed out of range")
+        state["speed"] = percent
+        return {"speed": percent}
+
+    def locked():
+        raise CommandError("controls locked by E-STOP")
+
+    server = RemoteAPI(port=0, rate_hz=50.0, keepalive_s=0.5)
+    server.snapshot = lambda: {"pad": {"speed": state["speed"]}}
+    server.commands.update({"pad.set_speed": set_speed, "pad.locked": locked})
+    server.start()
+    yield server
+    server.close()
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 5.0))
+
+
+def test_http_state_and_command_round_trip(api):
+    async def scenario():
+        host, port = api.host, api.port
+        assert await http_request(host, port, "GET", "/state") == (200, {"pad": {"speed": 0}})
+        status, body = await http_request(host, port, "POST", "/command",
+                                          {"cmd": "pad.set_speed", "args": {"percent": 40}})
+        assert (status, body) == (200, {"ok": True, "result": {"speed": 40}})
+        # وضعیت کش شده بعد از فرمان باطل می‌شود
+        assert await http_request(host, port, "GET", "/state") == (200, {"pad": {"speed": 40}})
+        status, body = await http_request(host, port, "GET", "/commands")
+        assert body["commands"] == ["pad.locked", "pad.set_speed"]
+
+    run(scenario())
+    assert api.commands_run == 1
+
+
+@pytest.mark.parametrize("payload, expected", [
+    ({"cmd": "pad.set_speed", "args": {"percent": 400}}, 400),
+    ({"cmd": "pad.set_speed", "args": {"rpm": 4}}, 400),
+    ({"cmd": "pad.set_speed", "args": [40]}, 400),
+    ({"cmd": "pad.locked"}, 409),
+    ({"cmd": "laser.fire"}, 404),
+    ({"args": {}}, 400),
+])
+def test_http_command_errors(api, payload, expected):
+    status, body = run(http_request(api.host, api.port, "POST", "/command", payload))
+    assert status == expected
+    assert body["ok"] is False and body["error"]
+
+
+def test_http_unknown_path_and_method(api):
+    assert run(http_request(api.host, api.port, "GET", "/nope"))[0] == 404
+    assert run(http_request(api.host, api.port, "GET", "/command"))[0] == 405
+
+
+@pytest.mark.parametrize("size", [9000, 70000])
+def test_oversized_header_gets_431(api, size):
+    async def scenario():
+        reader, writer = await asyncio.open_connection(api.host, api.port)
+        writer.write(b"GET /state HTTP/1.1\r\nX-Pad: " + b"a" * size + b"\r\n\r\n")
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+        return data
+
+    assert run(scenario()).startswith(b"HTTP/1.1 431 ")
+    # سرور بعد از آن سالم می‌ماند
+    assert run(http_request(api.host, api.port, "GET", "/state"))[0] == 200
+
+
+def test_websocket_state_reply_and_telemetry(api):
+    async def scenario():
+        ws = await WebSocketClient.connect(api.host, api.port)
+        first = await ws.receive()
+        assert first == {"type": "state", "state": {"pad": {"speed": 0}}}
+
+        cmd_id = await ws.send_command("pad.set_speed", percent=55)
+        reply = telemetry = None
+        while reply is None or telemetry is None:
+            msg = await ws.receive()
+            if msg["type"] == "reply":
+                reply = msg
+            elif msg["type"] == "telemetry" and msg["state"]["pad"]["speed"] == 55:
+                telemetry = msg
+        assert reply["id"] == cmd_id and reply["ok"] and reply["status"] == 200
+
+        await ws.send_command("pad.locked")
+        msg = await ws.receive()
+        while msg["type"] != "reply":
+            msg = await ws.receive()
+        assert msg["status"] == 409 and not msg["ok"]
+        await ws.close()
+
+    run(scenario())
+
+
+@pytest.fixture
+def motor_api():
+    log = []
+    server = RemoteAPI(port=0, rate_hz=50.0, deadman_s=0.3)
+    server.commands.update({
+        "pad.start": lambda speed: log.append(("start", speed)),
+        "pad.stop": lambda: log.append("stop"),
+    })
+    server.deadman["pad.start"] = ("pad.stop", {})
+    server.start()
+    yield server, log
+    server.close()
+
+
+def test_websocket_drop_stops_what_the_client_started(motor_api):
+    api, log = motor_api
+
+    async def scenario():
+        ws = await WebSocketClient.connect(api.host, api.port)
+        await ws.send_command("pad.start", speed=40)
+        while (await ws.receive())["type"] != "reply":
+            pass
+        ws.writer.close()   # قطع ناگهانی، بدون فریم close
+        for _ in range(100):
+            if "stop" in log:
+                break
+            await asyncio.sleep(0.01)
+
+    run(scenario())
+    assert log == [("start", 40), "stop"]
+    assert api.deadman_stops == 1
+
+
+def test_client_that_stopped_itself_is_not_stopped_again(motor_api):
+    api, log = motor_api
+
+    async def scenario():
+        ws = await WebSocketClient.connect(api.host, api.port)
+        for cmd, args in (("pad.start", {"speed": 40}), ("pad.stop", {})):
+            await ws.send_command(cmd, **args)
+            while (await ws.receive())["type"] != "reply":
+                pass
+        await ws.close()
+        await asyncio.sleep(0.1)
+
+    run(scenario())
+    assert log == [("start", 40), "stop"]
+    assert api.deadman_stops == 0
+
+
+def test_silent_client_trips_deadman_but_pings_keep_it_alive(motor_api):
+    api, log = motor_api
+
+    async def scenario():
+        ws = await WebSocketClient.connect(api.host, api.port)
+        await ws.send_command("pad.start", speed=40)
+        while (await ws.receive())["type"] != "reply":
+            pass
+        for _ in range(8):   # 0.8 s با ping هر 0.1 s
+            await ws.ping()
+            await asyncio.sleep(0.1)
+        assert "stop" not in log
+        # سکوت بیشتر از deadman_s
+        for _ in range(100):
+            if "stop" in log:
+                break
+            await asyncio.sleep(0.01)
+        ws.writer.close()
+
+    run(scenario())
+    assert log == [("start", 40), "stop"]
+
+
+def test_token_required_off_loopback():
+    with pytest.raises(RuntimeError):
+        RemoteAPI(host="0.0.0.0", port=0).start()
+
+
+def test_token_checked_on_http_and_websocket():
+    server = RemoteAPI(port=0, token="s3cret")
+    server.snapshot = lambda: {"ok": 1}
+    server.start()
+
+    async def scenario():
+        host, port = server.host, server.port
+        assert (await http_request(host, port, "GET", "/state"))[0] == 401
+        assert (await http_request(host, port, "GET", "/state", token="wrong"))[0] == 401
+        assert await http_request(host, port, "GET", "/state", token="s3cret") == (200, {"ok": 1})
+        assert (await http_request(host, port, "GET", "/state?token=s3cret"))[0] == 200
+        with pytest.raises(ConnectionError):
+            await WebSocketClient.connect(host, port)
+        ws = await WebSocketClient.connect(host, port, token="s3cret")
+        assert (await ws.receive())["type"] == "state"
+        await ws.close()
+
+    try:
+        run(scenario())
+    finally:
+        server.close()
+    assert server.unauthorized == 3
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from model.settings_store import SCHEMA_VERSION, SettingsStore
+
+
+def open_store(path, content):
+    path.write_text(content if isinstance(content, str) else json.dumps(content), encoding="utf-8")
+    return SettingsStore(str(path), batch_delay_s=0.01)
+
+
+@pytest.mark.parametrize("content", [
+    "{not json",
+    "[1, 2, 3]",
+    "null",
+    {"version": 2, "settings": [1, 2], "recipes": {}},
+    {"version": 2, "settings": {}, "recipes": "oops"},
+    {"version": "2", "settings": {}},
+    {"version": 0, "settings": {}},
+])
+def test_corrupt_file_is_moved_aside(tmp_path, content):
+    path = tmp_path / "settings.json"
+    store = open_store(path, content)
+    try:
+        assert store.get("speed") == "10"
+        assert (tmp_path / "settings.json.bad").exists()
+        assert not path.exists()
+    finally:
+        store.close()
+
+
+def test_v1_file_is_migrated(tmp_path):
+    path = tmp_path / "settings.json"
+    store = open_store(path, {"speed": "25", "light": 80})
+    try:
+        assert store.get("speed") == "25" and store.get("light") == 80
+        assert store.recipe_names() == []
+        store.set("step", "5")
+        assert store.flush()
+    finally:
+        store.close()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["version"] == SCHEMA_VERSION
+    assert saved["settings"]["speed"] == "25" and saved["settings"]["step"] == "5"
+
+
+def test_newer_schema_keys_survive_rewrite(tmp_path):
+    path = tmp_path / "settings.json"
+    newer = {
+        "version": SCHEMA_VERSION + 1,
+        "settings": {"speed": "30", "future_option": True},
+        "recipes": {},
+        "calibration": {"pad_gain": 1.07},
+    }
+    store = open_store(path, newer)
+    try:
+        store.set("speed", "35")
+        assert store.flush()
+    finally:
+        store.close()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["version"] == SCHEMA_VERSION + 1
+    assert saved["calibration"] == {"pad_gain": 1.07}
+    assert saved["settings"]["future_option"] is True
+    assert saved["settings"]["speed"] == "35"
@@ -0,0 +1,59 @@
+from model.shadow_pins import PinWriteStats, ShadowPin, track_writes, PIN_STATS
+
+
+class FakeDevice:
+    def __init__(self):
+        self.writes = []
+        self.closed = False
+
+    @property
+    def value(self):
+        return self.writes[-1] if self.writes else 0
+
+    @value.setter
+    def value(self, value):
+        self.writes.append(value)
+
+    def close(self):
+        self.closed = True
+
+
+def test_repeated_writes_are_elided():
+    dev, stats = FakeDevice(), PinWriteStats()
+    pin = ShadowPin(dev, name="led", stats=stats)
+    assert pin.value == 0
+    assert pin.write(0)          # اولین نوشتن همیشه انجام می‌شود
+    assert not pin.off()
+    assert pin.on() and not pin.on()
+    pin.value = 0.5
+    pin.value = 0.5
+    assert dev.writes == [0, 1, 0.5]
+    assert stats.snapshot() == (3, 3)
+    assert stats.per_pin["led"] == [3, 3]
+
+
+def test_invalidate_forces_next_write():
+    dev, stats = FakeDevice(), PinWriteStats()
+    pin = ShadowPin(dev, stats=stats)
+    pin.on()
+    pin.invalidate()
+    assert pin.on()
+    assert dev.writes == [1, 1]
+    pin.close()
+    assert dev.closed
+
+
+def test_track_writes_attributes_traffic_to_action():
+    PIN_STATS.reset()
+    pin = ShadowPin(FakeDevice(), name="pad_cw")
+
+    @track_writes("pad.start")
+    def start():
+        pin.on()
+        pin.on()
+
+    start()
+    start()
+    assert PIN_STATS.actions["pad.start"] == [2, 1, 3]
+    assert "action pad.start: calls=2 issued=1 elided=3" in PIN_STATS.report()
+    PIN_STATS.reset()
@@ -0,0 +1,76 @@
+import pytest
+
+from model.speed_controller import SpeedController
+
+
+class FirstOrderPad:
+    """پد و تاکومتر ساختگی: دور با ثابت زمانی tau به سمت gain·duty می‌رود"""
+
+    def __init__(self, gain_rpm=2400.0, tau_s=0.25):
+        self.gain_rpm = gain_rpm
+        self.tau_s = tau_s
+        self.current_speed = 50
+        self.duty = 0.0
+        self.measured = 0.0
+
+    def apply_duty(self, duty):
+        if self.current_speed == 0:
+            return False
+        self.duty = duty
+        return True
+
+    def rpm(self, now):
+        return self.measured
+
+    def advance(self, dt):
+        self.measured += (self.gain_rpm * self.duty - self.measured) * dt / self.tau_s
+
+
+def run(ctrl, plant, seconds, rate_hz=50):
+    dt = 1.0 / rate_hz
+    for i in range(int(seconds * rate_hz)):
+        ctrl.step(i * dt, dt)
+        plant.advance(dt)
+
+
+def test_converges_despite_feed_forward_mismatch():
+    # max_rpm کنترلر 3000 است ولی موتور فقط 2400 rpm می‌دهد؛ انتگرال‌گیر باید جبران کند
+    plant = FirstOrderPad(gain_rpm=2400.0)
+    ctrl = SpeedController(plant, plant, max_rpm=3000.0)
+    ctrl.set_target(1500)
+    run(ctrl, plant, seconds=10.0)
+    assert plant.measured == pytest.approx(1500, rel=0.01)
+    assert ctrl.measured_rpm == pytest.approx(1500, rel=0.01)
+
+
+def test_recovers_from_load_step():
+    plant = FirstOrderPad(gain_rpm=3000.0)
+    ctrl = SpeedController(plant, plant)
+    ctrl.set_target(1200)
+    run(ctrl, plant, seconds=6.0)
+    plant.gain_rpm *= 0.8   # بار اضافه روی پد
+    run(ctrl, plant, seconds=10.0)
+    assert plant.measured == pytest.approx(1200, rel=0.01)
+    assert ctrl.duty < 1.0
+
+
+def test_unreachable_target_does_not_wind_up():
+    plant = FirstOrderPad(gain_rpm=1000.0)
+    ctrl = SpeedController(plant, plant)
+    ctrl.set_target(2000)
+    run(ctrl, plant, seconds=5.0)
+    assert ctrl.duty == 1.0
+    # بعد از پایین آمدن هدف، خروج از اشباع نباید چند ثانیه طول بکشد
+    ctrl.set_target(500)
+    run(ctrl, plant, seconds=3.0)
+    assert plant.measured == pytest.approx(500, rel=0.02)
+
+
+def test_pad_stopped_elsewhere_clears_target():
+    plant = FirstOrderPad()
+    ctrl = SpeedController(plant, plant)
+    ctrl.set_target(1000)
+    run(ctrl, plant, seconds=1.0)
+    plant.current_speed = 0   # STOP / توقف اضطراری
+    run(ctrl, plant, seconds=0.1)
+    assert ctrl.target_rpm == 0.0
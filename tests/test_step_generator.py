@@ -0,0 +1,115 @@
+import threading
+import time
+
+from model.column_model import ColumnModel
+from model.step_generator import (PULSE_HIGH_S, SoftwarePulses, StepGenerator, capture_on_mock_pin,
+                                  step_schedule, wave_chunks)
+
+
+def test_schedule_is_monotonic_and_symmetric():
+    times = step_schedule(1000, 2000.0, 10000.0)
+    assert len(times) == 1000
+    assert all(b > a for a, b in zip(times, times[1:]))
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    # فاز کاهش آینه فاز شتاب است
+    assert abs(gaps[0] - gaps[-1]) < 1e-9
+    assert min(gaps) >= 1 / 2000.0 - 1e-9
+
+
+def test_pulse_timing_on_mock_pin(pins):
+    count, rate_error, max_gap_ms, min_high_us = capture_on_mock_pin(steps=1000, max_rate=2000.0, accel=10000.0)
+    assert count == 1000
+    assert abs(rate_error) < 5.0
+    # فاصله کندترین گام (start_rate=200) 5 ms است؛ وقفه‌های طولانی یعنی زمان‌بندی خراب شده
+    # (حاشیه برای توقف‌های زمان‌بند سیستم‌عامل روی میزبان شلوغ تست)
+    assert max_gap_ms < 50.0
+    assert min_high_us >= PULSE_HIGH_S * 1e6
+
+
+def test_software_pulses_release_the_cpu(pins):
+    column = ColumnModel(19, 5)
+    gen = StepGenerator(column, max_rate=4000.0, accel=40000.0)
+    assert isinstance(gen.backend, SoftwarePulses)   # کارخانه mock: ارسال نرم‌افزاری
+    finished = threading.Event()
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    ticks = []
+
+    def other_thread():
+        # کار دیگری که باید در طول حرکت هم جلو برود (مثل حلقه Tk)
+        while not finished.is_set():
+            ticks.append(time.perf_counter())
+            time.sleep(0.001)
+
+    worker = threading.Thread(target=other_thread)
+    worker.start()
+    gen.move_by(2000, on_done=lambda err: finished.set())
+    assert finished.wait(5.0)
+    worker.join()
+    wall = time.perf_counter() - t0
+    # حلقه انتظار فعال قبلی در 4000 step/s بیش از نیمی از CPU را می‌گرفت
+    assert (time.process_time() - cpu0) / wall < 0.4
+    # ترد دیگر در طول حرکت منظم اجرا شده است (GIL بین پالس‌ها آزاد است)
+    assert len(ticks) > wall / 0.004
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.05
+    assert gen.jitter.count == 2000
+    assert "software" in gen.report()
+    column.close()
+
+
+def test_wave_chunks_follow_schedule():
+    schedule = step_schedule(3000, 4000.0, 20000.0)
+    chunks = wave_chunks(schedule, high_us=5, chunk_s=0.01)
+    assert [i for i, _ in chunks] == sorted(i for i, _ in chunks)
+    pulses = [p for _, chunk in chunks for p in chunk]
+    assert len(pulses) == 3000
+    assert all(high == 5 and low >= 5 for high, low in pulses)
+    # مجموع زمان‌ها با برنامه مطلق می‌خواند (بدون انباشت خطای گرد کردن)
+    rise = 0
+    for i, (high, low) in enumerate(pulses[:-1]):
+        rise += high + low
+        assert abs(rise - schedule[i + 1] * 1e6) <= 0.5
+    # هر تکه حدود 10 ms
+    starts = [schedule[i] for i, _ in chunks]
+    assert all(0.0099 <= b - a < 0.0115 for a, b in zip(starts, starts[1:]))
+
+
+def test_stop_aborts_before_next_pulse(pins):
+    column = ColumnModel(19, 5)
+    gen = StepGenerator(column, max_rate=6000.0, accel=60000.0)
+    pin = pins.pin(19)
+    finished = threading.Event()
+    result = []
+
+    def done(err):
+        result.append(err)
+        finished.set()
+
+    assert gen.move_by(50000, on_done=done)
+    time.sleep(0.05)
+    column.stop()   # مسیر STOP / توقف اضطراری / watchdog
+    t_stop = time.perf_counter()
+    assert finished.wait(1.0)
+    assert time.perf_counter() - t_stop < 0.05
+
+    assert result == [None]   # حرکت ناتمام
+    assert not gen.busy
+    assert 0 < gen.position_steps < 50000
+    pulses = sum(1 for s in pin.states if s.state)
+    time.sleep(0.02)
+    assert sum(1 for s in pin.states if s.state) == pulses, "no pulses after stop"
+    column.close()
+
+
+def test_abort_and_interlock(pins):
+    column = ColumnModel(19, 5)
+    gen = StepGenerator(column)
+    finished = threading.Event()
+    assert gen.move_by(20000, on_done=lambda err: finished.set())
+    time.sleep(0.02)
+    gen.abort()
+    assert finished.wait(1.0)
+
+    column.interlock = lambda: False
+    assert not gen.move_by(100)
+    assert not gen.busy
+    column.close()
@@ -0,0 +1,51 @@
+import pytest
+
+from model.timer_model import Countdown, Stopwatch, format_hms
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_format_hms():
+    assert format_hms(0) == "00:00:00"
+    assert format_hms(3725.9) == "01:02:05"
+    assert format_hms(-4) == "00:00:00"
+
+
+def test_stopwatch_measures_from_clock_not_ticks():
+    clock = FakeClock()
+    sw = Stopwatch(clock)
+    sw.start()
+    clock.now += 2.25
+    assert sw.displayed() == 2
+    assert sw.seconds_to_next_change() == pytest.approx(0.75)
+    sw.stop()
+    clock.now += 100   # زمان توقف شمرده نمی‌شود
+    sw.start()
+    clock.now += 8 * 3600
+    assert sw.elapsed() == pytest.approx(8 * 3600 + 2.25)
+    sw.reset()
+    assert sw.elapsed() == 0 and not sw.running
+
+
+def test_countdown_rounds_up_and_finishes():
+    clock = FakeClock()
+    cd = Countdown(10, clock)
+    cd.start()
+    clock.now += 0.2
+    assert cd.displayed() == 10   # صفر فقط در پایان دیده می‌شود
+    assert cd.seconds_to_next_change() == pytest.approx(0.8)
+    clock.now += 9.7
+    assert cd.displayed() == 1 and not cd.finished
+    clock.now += 0.2
+    assert cd.displayed() == 0 and cd.finished
+    cd.stop()
+    cd.start()
+    assert not cd.running   # تایمر تمام شده دوباره شروع نمی‌شود
+    cd.set_duration(5)
+    assert cd.remaining() == 5 and not cd.finished
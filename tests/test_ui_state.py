@@ -0,0 +1,71 @@
+from view.ui_state import UIStateStore
+
+
+class FakeRoot:
+    def __init__(self):
+        self.timers = {}
+        self._next = 0
+
+    def after(self, ms, func):
+        self._next += 1
+        self.timers[self._next] = func
+        return self._next
+
+    def after_cancel(self, after_id):
+        self.timers.pop(after_id, None)
+
+    def fire(self):
+        timers, self.timers = self.timers, {}
+        for func in timers.values():
+            func()
+
+
+class FakeWidget:
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **options):
+        self.calls.append(options)
+
+
+def test_writes_are_batched_per_frame_and_diffed():
+    root, widget = FakeRoot(), FakeWidget()
+    store = UIStateStore(root)
+    store.bind("lbl_speed", lambda: widget)
+    for rpm in (10, 20, 30):
+        store.set("lbl_speed", text=f"{rpm} RPM", bootstyle="info")
+    assert widget.calls == [] and len(root.timers) == 1
+    root.fire()
+    assert widget.calls == [{"text": "30 RPM", "bootstyle": "info"}]
+
+    store.set("lbl_speed", text="30 RPM")        # بدون تغییر
+    store.set("lbl_speed", bootstyle="success")  # فقط همین ویژگی
+    root.fire()
+    assert widget.calls[1:] == [{"bootstyle": "success"}]
+    assert store.stats() == {"writes": 5, "configures": 2, "skipped": 1}
+    assert store.get("lbl_speed", "text") == "30 RPM"
+
+
+def test_lazy_panel_gets_state_once_built():
+    root, widget = FakeRoot(), FakeWidget()
+    built = []
+    store = UIStateStore(root)
+    store.bind("btn_start", lambda: widget if built else None)
+    store.set("btn_start", state="disabled")
+    root.fire()
+    assert widget.calls == []
+    built.append(True)
+    store.refresh()
+    root.fire()
+    assert widget.calls == [{"state": "disabled"}]
+
+
+def test_rebind_reapplies_desired_state():
+    root, first, second = FakeRoot(), FakeWidget(), FakeWidget()
+    store = UIStateStore(root)
+    store.bind("lbl_timer", lambda: first)
+    store.set("lbl_timer", text="00:01:00")
+    store.flush()
+    store.bind("lbl_timer", lambda: second)   # پنل دوباره ساخته شده
+    root.fire()
+    assert second.calls == [{"text": "00:01:00"}]
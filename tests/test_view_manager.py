@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("ttkbootstrap")
+
+from view.view_manager import ViewManager
+
+
+def test_pages_are_built_once_and_keep_state(tk_root):
+    import ttkbootstrap as ttk
+
+    builds, bound = [], []
+    manager = ViewManager(tk_root)
+
+    def build_control(parent):
+        builds.append("control")
+        ttk.Label(parent, text="42").pack()
+
+    manager.register("control", build_control, on_built=lambda: bound.append("control"))
+    manager.register("timer", lambda parent: builds.append("timer"))
+
+    first = manager.show("control")
+    manager.show("timer")
+    again = manager.show("control")
+    assert again is first
+    assert builds == ["control", "timer"] and bound == ["control"]
+    assert first.winfo_children()[0].cget("text") == "42"
+    assert manager.current == "control"
+    assert set(manager.build_times) == {"control", "timer"}
+
+
+def test_prebuild_builds_in_idle_time_without_raising(tk_root):
+    manager = ViewManager(tk_root)
+    built = []
+    for name in ("home", "light", "pad"):
+        manager.register(name, lambda parent: None, on_built=lambda name=name: built.append(name))
+    manager.show("home")
+    manager.prebuild(delay_ms=1)
+    for _ in range(100):
+        tk_root.update()
+        if len(built) == 3:
+            break
+    assert built == ["home", "light", "pad"]
+    assert manager.current == "home"
@@ -0,0 +1,73 @@
+from model.watchdog import SafetyWatchdog
+
+
+class FakeActuator:
+    def __init__(self):
+        self.calls = []
+        self.moving_since = None
+
+    def stop_rotation(self):
+        self.calls.append("stop_rotation")
+
+    def stop(self):
+        self.calls.append("stop")
+        self.moving_since = None
+
+    def set_state(self, is_on):
+        self.calls.append(("set_state", is_on))
+
+
+def make_watchdog(**kw):
+    pad, column, lissa = FakeActuator(), FakeActuator(), FakeActuator()
+    dog = SafetyWatchdog(pad=pad, column=column, lissa=lissa, log=lambda msg: None, **kw)
+    return dog, pad, column, lissa
+
+
+def test_ui_stall_stops_everything_once():
+    dog, pad, column, lissa = make_watchdog(timeout_s=1.0)
+    t = dog._last_feed
+
+    dog.check(t + 0.5)
+    assert not dog.trips
+
+    dog.check(t + 1.5)
+    dog.check(t + 2.0)   # همان گیر کردن دوباره توقف نمی‌دهد
+    assert [reason for _, reason, _ in dog.trips] == ["ui-stall"]
+    assert pad.calls == ["stop_rotation"]
+    assert column.calls == ["stop"]
+    assert lissa.calls == [("set_state", False)]
+
+
+def test_recovery_records_total_stall():
+    dog, *_ = make_watchdog(timeout_s=1.0)
+    t = dog._last_feed
+    dog.check(t + 1.5)
+    assert dog.stalled
+    dog._last_feed = t + 3.0
+    dog.check(t + 3.1)
+    assert not dog.stalled
+    reason, total_ms = dog.trips[-1][1:]
+    assert reason == "ui-stall-total" and abs(total_ms - 3000.0) < 1e-6
+
+
+def test_column_hold_limit_stops_only_column():
+    dog, pad, column, lissa = make_watchdog(timeout_s=10.0, max_hold_s=8.0)
+    t = dog._last_feed
+    column.moving_since = t
+    dog.check(t + 7.0)
+    assert column.calls == []
+    dog.check(t + 8.5)
+    assert column.calls == ["stop"]
+    assert pad.calls == [] and lissa.calls == []
+
+
+def test_failing_actuator_does_not_block_others():
+    dog, pad, column, lissa = make_watchdog(timeout_s=1.0)
+
+    def broken():
+        raise OSError("gpio busy")
+
+    pad.stop_rotation = broken
+    dog.check(dog._last_feed + 2.0)
+    assert column.calls == ["stop"]
+    assert lissa.calls == [("set_state", False)]